@@ -0,0 +1,32 @@
+"""
+Measure how fast frames can be drawn, without a sound card.
+The canvas writes to a backends.NullBackend, so nothing waits for an audio device.
+"""
+import time
+from oscdraw.draw import Canvas
+from oscdraw.backends import NullBackend
+from oscdraw.cache import WaveformCache
+
+
+def scene(c: Canvas):
+    c.draw_polygon(((-30000, 30000), (30000, 30000), (30000, -30000), (-30000, -30000)), 1000, 5)
+    c.draw_ellipse((0, 0, 2000, 2000), 440, 3)
+    c.draw_line((-24000, -7500, -24000, 7500), 440, 3)
+    c.draw_line((24000, -7500, 24000, 7500), 440, 3)
+    c.draw_font("12:34:56", -32000, 5000, 5000, 10 / 8, "triangle", 8000, 10000)
+
+
+def measure(name: str, c: Canvas, frames: int = 300):
+    start = time.perf_counter()
+    for _ in range(frames):
+        scene(c)
+        c.write(return_frames=False)
+    elapsed = time.perf_counter() - start
+    realtime = c.audio.frames_written / c.audio.get_rate()
+    print(f"{name}: {frames / elapsed:.1f} frames/s, {realtime / elapsed:.1f}x realtime")
+
+
+if __name__ == '__main__':
+    measure("list storage", Canvas(backend=NullBackend()))
+    measure("array storage", Canvas(storage="array", backend=NullBackend()))
+    measure("array storage + cache", Canvas(storage="array", cache=WaveformCache(), backend=NullBackend()))
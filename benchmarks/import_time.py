@@ -0,0 +1,39 @@
+"""
+Measure how long "import oscdraw" takes in a new interpreter, like in a short-lived worker process.
+Also lists the slowest modules with python -X importtime.
+"""
+import subprocess
+import sys
+import time
+
+
+def measure(statement: str = "import oscdraw", runs: int = 10):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        times.append(time.perf_counter() - start)
+    baseline = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append(time.perf_counter() - start)
+    print(f"{statement}: {(min(times) - min(baseline)) * 1000:.1f} ms (best of {runs}, without interpreter startup)")
+
+
+def slowest_modules(statement: str = "import oscdraw", amount: int = 10):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            check=True, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines()[1:]:
+        _, self_time, cumulative, name = [part.strip() for part in line.replace(":", "|", 1).split("|")]
+        rows.append((int(cumulative), int(self_time), name))
+    print(f"Slowest modules (cumulative / self in ms):")
+    for cumulative, self_time, name in sorted(rows, reverse=True)[:amount]:
+        print(f"    {cumulative / 1000:8.1f} {self_time / 1000:8.1f}  {name}")
+
+
+if __name__ == '__main__':
+    measure()
+    measure("import oscdraw.audioview")
+    slowest_modules()
@@ -29,28 +29,39 @@ Using this package and others you could make a game for the oscilloscope!
 - *keyboard*
 
 And any other dependencies are also required/optional that these need.
+
+Nothing heavy is done when importing the package: pyaudio (and PortAudio) is only initialized when an audio device is first used,
+the default font is only created when it's first used, and the optional dependencies are only imported by the parts that need them.
+Call check_dependencies() to see which dependencies are missing.
 """
 
 from .draw import Canvas
-from .objects import Point, Line, Polygon, Ellipse, ObjectCollection, PointTools
+from .objects import Point, PointArray, Line, Polygon, Polyline, Ellipse, ObjectCollection, CompiledObjectCollection, PointTools
 import logging
 from importlib.machinery import PathFinder
 
-p = PathFinder()
-
-for name in ("numpy", "pyaudio", "wave", "os", "copy", "typing", "collections", "unicodedata"):
-    if p.find_spec(name) is None:
-        raise ModuleNotFoundError(
-            f"dependency not found: '{name}'"
-        )
-
-optionals = {
-    "pygame": "audioview.OscilloscopeView will not work.",
-    "matplotlib": "audioview.AudioPlotView will not work.",
-    "svgpathtools": "the svg module will not work."
-}
-for name, warn in optionals.items():
-    if p.find_spec(name) is None:
-        logging.warning(
-            f"Optional dependency {name} not found: {warn}"
-        )
\ No newline at end of file
+
+def check_dependencies():
+    """
+    Check whether the dependencies can be found (without importing them).
+    Raises ModuleNotFoundError for a missing required dependency, and logs a warning for every missing optional dependency.
+    :return: None
+    """
+    p = PathFinder()
+
+    for name in ("numpy", "pyaudio", "wave", "os", "copy", "typing", "collections", "unicodedata"):
+        if p.find_spec(name) is None:
+            raise ModuleNotFoundError(
+                f"dependency not found: '{name}'"
+            )
+
+    optionals = {
+        "pygame": "audioview.OscilloscopeView will not work.",
+        "matplotlib": "audioview.AudioPlotView will not work.",
+        "svgpathtools": "the svg module will not work."
+    }
+    for name, warn in optionals.items():
+        if p.find_spec(name) is None:
+            logging.warning(
+                f"Optional dependency {name} not found: {warn}"
+            )
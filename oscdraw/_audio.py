@@ -1,10 +1,28 @@
+import importlib
 import logging
-import os
-import wave
+import queue
+from typing import Literal
 import numpy as np
-import pyaudio
 
-pa = pyaudio.PyAudio()
+from .backends import Backend
+from ._recorder import _StreamingRecorder
+
+pyaudio = None
+pa = None
+
+
+def _get_pa():
+    """
+    Get the PyAudio instance. pyaudio is only imported and the instance is only created when it's first needed,
+    since creating it initializes PortAudio, which looks for every device.
+    :return: The PyAudio instance.
+    """
+    global pyaudio, pa
+    if pa is None:
+        pyaudio = importlib.import_module("pyaudio")
+        pa = pyaudio.PyAudio()
+    return pa
+
 
 def get_all_device_info(filter_function=None):
     """
@@ -12,6 +30,7 @@ def get_all_device_info(filter_function=None):
     :param filter_function: The function provided to filter(), if None then there is no filtering.
     :return: All the info in a tuple.
     """
+    pa = _get_pa()
     count = pa.get_device_count()
     info = []
     for i in range(count):
@@ -21,7 +40,7 @@ def get_all_device_info(filter_function=None):
     return tuple(info)
 
 
-class _AudioBackend:
+class _AudioBackend(Backend):
     """
     Universal, simplified audio backend for internal use.
     Supports saving to a wav file, too.
@@ -32,21 +51,57 @@ class _AudioBackend:
     :param rate: Sample rate of the stream. Default is 192000.
     :param record: Whether to store the given frames of audio without saving it to a file.
                    This way you can save the audio frames later. Default is False.
+                   The frames are spooled into a temporary file by a background thread, so the memory used stays the same however long the recording is.
+                   If it's a path to a wav file instead, the frames are streamed directly into that file (and self.save() is not needed).
+    :param record_split_bytes: When streaming into a file, start a new file (file_1.wav, file_2.wav etc.) after this many bytes of frames. Default is None.
+    :param record_split_seconds: When streaming into a file, start a new file after this many seconds of frames. Default is None.
+    :param mode: How the frames are given to an output stream. "blocking" writes them with the blocking stream.write().
+                 "callback" puts them in a small queue, and the stream's callback takes them from there in the audio thread,
+                 so self.write() only blocks if the queue is full. Default is "blocking".
+    :param queue_depth: The maximum number of writes waiting in the queue of the "callback" mode. Default is 4.
+    :param latency: The length of the stream's buffer in milliseconds (the frames requested in one callback). Default is None, chosen by PortAudio.
     :var s: The pyaudio stream.
+    :var underruns: The number of times the callback ran out of frames and had to output silence ("callback" mode).
+    :var frames_written: The number of frames (one value per channel) given to self.write().
+    :var frames_played: The number of frames the stream actually took (after stream.write() returned, or in the callback).
     """
-    def __init__(self, device_index: int = None, output: bool = True, rate: int = 192000, record: bool = False):
+    def __init__(self, device_index: int = None, output: bool = True, rate: int = 192000, record: bool | str = False,
+                 mode: Literal["blocking", "callback"] = "blocking", queue_depth: int = 4, latency: int | float = None,
+                 record_split_bytes: int = None, record_split_seconds: int | float = None):
         # REFERENCE FOR SELF: https://stackoverflow.com/questions/35970282/what-are-chunks-samples-and-frames-when-using-pyaudio
+        pa = _get_pa()
         self.is_output = output
+        if mode not in ("blocking", "callback"):
+            raise ValueError(
+                f"Unknown mode: {mode}"
+            )
+        if mode == "callback" and not output:
+            raise ValueError(
+                "The callback mode is only available for output streams."
+            )
+        self.mode = mode
+        self.underruns = 0
+        self.frames_written = self.frames_played = 0
+        stream_kwargs = {}
+        if latency is not None:
+            stream_kwargs["frames_per_buffer"] = max(int(rate * latency / 1000), 1)
+        if mode == "callback":
+            self._queue = queue.Queue(queue_depth)
+            self._chunk, self._chunk_offset = None, 0
+            stream_kwargs["stream_callback"] = self._callback
         if output:
             self.s = pa.open(rate=rate, channels=2, format=pyaudio.paInt16, output=True,
-                             output_device_index=device_index if device_index else pa.get_default_output_device_info()["index"])
+                             output_device_index=device_index if device_index else pa.get_default_output_device_info()["index"],
+                             **stream_kwargs)
         else:
             self.s = pa.open(rate=rate, channels=2, format=pyaudio.paInt16, input=True,
-                             input_device_index=device_index if device_index else pa.get_default_input_device_info()["index"])
+                             input_device_index=device_index if device_index else pa.get_default_input_device_info()["index"],
+                             **stream_kwargs)
 
-        self.does_record = record
+        self.does_record = bool(record)
         if record:
-            self.record = bytes()
+            self.recorder = _StreamingRecorder(rate, record if isinstance(record, str) else None,
+                                               record_split_bytes, record_split_seconds)
 
         self.rate = rate
 
@@ -54,23 +109,80 @@ class _AudioBackend:
                                                   pa.get_default_output_device_info()["index"] if output else
                                                   pa.get_default_input_device_info()["index"]))
 
-    def get_rate(self):
-        return self.rate
+    def _callback(self, in_data, frame_count, time_info, status):
+        """
+        The stream callback of the "callback" mode. Runs in the audio thread of PortAudio.
+        Takes exactly the requested number of frames from the queue. If the queue is empty, the rest is silence.
+        :return: The frames as bytes, pyaudio.paContinue
+        """
+        size = frame_count * 4  # 2 channels, 2 bytes per frame
+        out = bytearray(size)
+        filled = 0
+        while filled < size:
+            if self._chunk is None:
+                try:
+                    self._chunk, self._chunk_offset = self._queue.get_nowait(), 0
+                except queue.Empty:
+                    self.underruns += 1
+                    break
+            amount = min(size - filled, len(self._chunk) - self._chunk_offset)
+            out[filled:filled + amount] = self._chunk[self._chunk_offset:self._chunk_offset + amount]
+            filled += amount
+            self._chunk_offset += amount
+            if self._chunk_offset == len(self._chunk):
+                self._chunk = None
+                self._queue.task_done()
+        self.frames_played += filled // 4
+        return bytes(out), pyaudio.paContinue
 
     def write(self, frames: tuple | list):
         """
         Write frames of audio to the stream.
-        :param frames: Frames of audio, as numbers in an iterable, not in a buffer.
+        In the "callback" mode, the frames are put in the queue, and this only blocks if the queue is full.
+        :param frames: Frames of audio, as numbers in an iterable, or an int16 NumPy array, which is given to the stream without copying.
         :return: None
         """
         if not self.is_output:
             raise RuntimeError(
                 "Cannot write to input stream."
             )
-        frames = np.asarray(frames, "int16").tobytes()
+        frames = memoryview(np.ascontiguousarray(frames, "int16")).cast("B")
+        if self.does_record:
+            self.recorder.write(frames)
+        self.frames_written += len(frames) // 4
+        if self.mode == "callback":
+            if len(frames):
+                self._queue.put(memoryview(bytes(frames)))  # Copied, because the given frames can be a reused buffer
+        else:
+            self.s.write(frames)
+            self.frames_played += len(frames) // 4
+
+    def is_queue_full(self):
+        """
+        Whether self.write() would block because the queue of the "callback" mode is full. Always False in the "blocking" mode.
+        :return: bool
+        """
+        return self.mode == "callback" and self._queue.full()
+
+    def drain(self):
+        """
+        Wait until every frame in the queue of the "callback" mode is given to the stream. Does nothing in the "blocking" mode.
+        :return: None
+        """
+        if self.mode == "callback":
+            self._queue.join()
+
+    def close(self):
+        """
+        Wait for the written frames to be played (see self.drain()), then stop and close the stream.
+        The recording is also closed, the frames that weren't saved are lost.
+        :return: None
+        """
+        self.drain()
+        self.s.stop_stream()
+        self.s.close()
         if self.does_record:
-            self.record += frames
-        self.s.write(frames)
+            self.recorder.close()
 
     def read(self, frames: int = 192000//60):
         """
@@ -84,13 +196,14 @@ class _AudioBackend:
             )
         frames = self.s.read(frames)
         if self.does_record:
-            self.record += frames
+            self.recorder.write(frames)
         frames = np.frombuffer(frames, "int16").tolist()
         return tuple(frames)
 
     def save(self, file: str = "temp.wav"):
         """
-        Saves the recorded frames in a wave file.
+        Saves the recorded frames in a wave file. If the file exists, the frames are appended to it.
+        When streaming into a file (record is a path), this only waits until every frame is written there.
         :param file: The path to the file. Default is "temp.wav".
         :return: None
         """
@@ -98,18 +211,10 @@ class _AudioBackend:
             raise RuntimeError(
                 "Cannot save, if didn't record."
             )
-        if os.path.exists(file):
-            with wave.open(file, "rb") as wav:
-                prev_record = wav.readframes(wav.getnframes())
-            record = prev_record + self.record
+        if self.recorder.file is not None:
+            self.recorder.flush()
         else:
-            record = self.record
-        with wave.open(file, "wb") as wav:
-            wav.setframerate(self.rate)
-            wav.setsampwidth(pyaudio.get_sample_size(pyaudio.paInt16))
-            wav.setnchannels(2)
-            wav.writeframesraw(record)
-        self.record = bytes()
+            self.recorder.save(file)
 
 
 def test():
@@ -0,0 +1,200 @@
+"""
+Streaming recording of frames of audio for _audio._AudioBackend, for internal use.
+"""
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import wave
+
+_CHUNK_SIZE = 2**20
+_FRAME_SIZE = 4  # 2 channels, 2 bytes per frame
+
+
+def _append_to_wav(file: str, source, rate: int):
+    """
+    Append raw frames to a wav file written by the wave module (the data chunk is the last chunk), without reading the existing frames.
+    Only the header sizes are updated in place. If the file doesn't exist, it is created.
+    :param file: The path to the wav file.
+    :param source: A binary file object with the raw frames, read from its current position to the end.
+    :param rate: The sample rate.
+    :return: None
+    """
+    if not os.path.exists(file):
+        with wave.open(file, "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            while chunk := source.read(_CHUNK_SIZE):
+                wav.writeframes(chunk)
+        return
+    with wave.open(file, "rb") as wav:
+        if (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) != (2, 2, rate):
+            raise ValueError(
+                f"Cannot append to {file}, its format is different\n"
+                f"Expected 2 channels, 16-bit frames with a sample rate of {rate}"
+            )
+    with open(file, "r+b") as f:
+        f.seek(12)
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(
+                    f"Cannot append to {file}, it has no data chunk"
+                )
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"data":
+                break
+            f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+        data_size_position = f.tell() - 4
+        f.seek(0, os.SEEK_END)
+        if f.tell() != data_size_position + 4 + chunk_size:
+            raise ValueError(
+                f"Cannot append to {file}, the data chunk is not the last chunk"
+            )
+        shutil.copyfileobj(source, f, _CHUNK_SIZE)
+        end = f.tell()
+        f.seek(data_size_position)
+        f.write(struct.pack("<I", end - data_size_position - 4))
+        f.seek(4)
+        f.write(struct.pack("<I", end - 8))
+
+
+class _StreamingRecorder:
+    """
+    Records frames of audio with constant memory, by giving the chunks to a background writer thread.
+    Writing a chunk only copies that chunk (O(chunk)), no matter how long the recording is.
+    If file is None, the frames are spooled into a temporary file, and self.save() appends them to a wav file.
+    Otherwise the frames are streamed directly into the wav file, and the recording can be split into multiple files
+    (file.wav, file_1.wav, file_2.wav etc.) by size or time.
+    :param rate: The sample rate.
+    :param file: The wav file to stream into. Default is None, spooling.
+    :param split_bytes: Start a new file after this many bytes of frames. Default is None, no splitting by size.
+    :param split_seconds: Start a new file after this many seconds of frames. Default is None, no splitting by time.
+    :param queue_depth: The maximum number of chunks waiting for the writer thread. Default is 64.
+    :var files: The paths of the files written so far (when streaming into a file).
+    """
+    def __init__(self, rate: int, file: str = None, split_bytes: int = None, split_seconds: int | float = None,
+                 queue_depth: int = 64):
+        self.rate = rate
+        self.file = file
+        limits = [limit for limit in (split_bytes, split_seconds * rate * _FRAME_SIZE if split_seconds else None) if limit]
+        self._split = int(min(limits)) // _FRAME_SIZE * _FRAME_SIZE if limits else None
+        if self._split is not None and self._split <= 0:
+            raise ValueError(
+                f"The recording cannot be split into files shorter than a frame"
+            )
+        self.files = []
+        self._wav = None
+        self._written = 0
+        self._spool = tempfile.TemporaryFile() if file is None else None
+        self._error = None
+        self._queue = queue.Queue(queue_depth)
+        self._thread = threading.Thread(target=self._run, name="oscdraw-recorder", daemon=True)
+        self._thread.start()
+
+    def _next_file(self):
+        """
+        Close the current wav file and open the next one, for internal use.
+        :return: None
+        """
+        if self._wav is not None:
+            self._wav.close()
+        root, ext = os.path.splitext(self.file)
+        path = self.file if not self.files else f"{root}_{len(self.files)}{ext}"
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(2)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(self.rate)
+        self.files.append(path)
+        self._written = 0
+
+    def _write_chunk(self, chunk: memoryview):
+        """
+        Write a chunk in the writer thread, for internal use.
+        :param chunk: The frames as bytes.
+        :return: None
+        """
+        if self._spool is not None:
+            self._spool.write(chunk)
+            return
+        while len(chunk):
+            if self._wav is None or (self._split is not None and self._written >= self._split):
+                self._next_file()
+            amount = len(chunk) if self._split is None else min(len(chunk), self._split - self._written)
+            self._wav.writeframes(chunk[:amount])  # Also updates the header, so the file is valid even if the program stops
+            self._written += amount
+            chunk = chunk[amount:]
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            try:
+                if chunk is None:
+                    return
+                if self._error is None:
+                    self._write_chunk(chunk)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(
+                "The recording could not be written"
+            ) from error
+
+    def write(self, frames):
+        """
+        Give frames to the writer thread. Only blocks if the writer thread is too far behind.
+        :param frames: The frames as a bytes-like object. It's copied, so it can be a reused buffer.
+        :return: None
+        """
+        self._raise_error()
+        if len(frames):
+            self._queue.put(memoryview(bytes(frames)))
+
+    def flush(self):
+        """
+        Wait until the writer thread has written every chunk given so far.
+        :return: None
+        """
+        self._queue.join()
+        self._raise_error()
+
+    def save(self, file: str):
+        """
+        Append the spooled frames to a wav file (or create it), then empty the spool. Only for spooling.
+        The existing frames of the file are not read, only its header is updated.
+        :param file: The path to the wav file.
+        :return: None
+        """
+        if self._spool is None:
+            raise RuntimeError(
+                f"Cannot save, the frames are streamed into {self.file}"
+            )
+        self.flush()
+        self._spool.seek(0)
+        _append_to_wav(file, self._spool, self.rate)
+        self._spool.seek(0)
+        self._spool.truncate()
+
+    def close(self):
+        """
+        Write every chunk, stop the writer thread and close the files. The spooled frames that weren't saved are lost.
+        :return: None
+        """
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join()
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        if self._spool is not None:
+            self._spool.close()
+        self._raise_error()
@@ -0,0 +1,331 @@
+"""
+Storages for the frames of a draw.Canvas, for internal use.
+Every storage stores the left and right channels and the frames of the last action (the "last" frames).
+"""
+from itertools import compress
+import numpy as np
+
+
+class _ListStorage:
+    """
+    Stores the frames in two Python lists, one for the left channel and one for the right channel.
+    This is the original storage of Canvas.
+    :var left: The frames of the left channel.
+    :var right: The frames of the right channel.
+    :var last_left: The last action's frames of the left channel.
+    :var last_right: The last action's frames of the right channel.
+    """
+    def __init__(self):
+        self.left, self.right = [], []
+        self.last_left, self.last_right = [], []
+
+    def __len__(self):
+        return len(self.left)
+
+    @staticmethod
+    def _as_list(values):
+        if isinstance(values, list):
+            return values
+        if isinstance(values, np.ndarray):
+            return values.tolist()
+        return list(values)
+
+    def append(self, left, right):
+        """
+        Append new frames. These become the last frames.
+        :param left: The left channel's new values.
+        :param right: The right channel's new values.
+        :return: None
+        """
+        left, right = self._as_list(left), self._as_list(right)
+        self.left.extend(left)
+        self.right.extend(right)
+        self.last_left, self.last_right = left, right
+
+    def pop(self, last: bool = True):
+        """
+        Remove the last frames (or every frame) and return them.
+        :param last: Whether to remove only the last frames or every frame. Default is True.
+        :return: left, right
+        """
+        if not last:
+            left, right = self.left, self.right
+            self.left, self.right = [], []
+        else:
+            del self.left[len(self.left) - len(self.last_left):]
+            del self.right[len(self.right) - len(self.last_right):]
+            left, right = self.last_left, self.last_right
+        return left, right
+
+    def mark(self):
+        """
+        Get a position, that can later be given to self.set_last() to make every frame stored since then the last frames.
+        :return: The position.
+        """
+        return len(self.left)
+
+    def set_last(self, mark: int):
+        """
+        Make every frame stored since the mark the last frames.
+        :param mark: A position from self.mark().
+        :return: None
+        """
+        self.last_left, self.last_right = self.left[mark:], self.right[mark:]
+
+    def last_mark(self):
+        """
+        Get the position where the last frames start. See self.mark().
+        :return: The position.
+        """
+        return len(self.left) - len(self.last_left)
+
+    def get_frames(self, start: int, end: int):
+        """
+        Get the frames between two positions (see self.mark()) as a copy.
+        :param start: The first position.
+        :param end: The position after the last frame.
+        :return: An array with the shape (2, end - start).
+        """
+        return np.array((self.left[start:end], self.right[start:end]), float)
+
+    def set_frames(self, start: int, end: int, frames):
+        """
+        Overwrite the frames between two positions (see self.mark()).
+        :param start: The first position.
+        :param end: The position after the last frame.
+        :param frames: The new frames with the shape (2, end - start).
+        :return: None
+        """
+        left, right = frames[0].tolist(), frames[1].tolist()
+        self.left[start:end], self.right[start:end] = left, right
+        last_start = self.last_mark()
+        if end > last_start:
+            self.last_left, self.last_right = self.left[last_start:], self.right[last_start:]
+
+    def repeat_last(self, amount: int = 1):
+        """
+        Add the last frames some more times. The repetitions also become part of the last frames.
+        :param amount: The amount of times to add, default is 1.
+        :return: None
+        """
+        self.left.extend(self.last_left * amount)
+        self.last_left.extend(self.last_left * amount)
+        self.right.extend(self.last_right * amount)
+        self.last_right.extend(self.last_right * amount)
+
+    def truncate(self, max_frames: int, beginning: bool = True):
+        """
+        Keep at most max_frames frames.
+        The last frames are the part of the previous last frames that was kept (none if they were all cut off).
+        :param max_frames: The maximum number of frames to keep.
+        :param beginning: Whether to cut from the beginning or the end. Default is True (so beginning).
+        :return: None
+        """
+        if len(self.left) > max_frames:
+            last_start = len(self.left) - len(self.last_left)
+            if beginning:
+                cut = len(self.left) - max_frames
+                del self.left[:cut]
+                del self.right[:cut]
+                self.set_last(max(last_start - cut, 0))
+            else:
+                del self.left[max_frames:]
+                del self.right[max_frames:]
+                self.set_last(min(last_start, max_frames))
+
+    def compress(self, start: int, mask):
+        """
+        Keep only the frames after a position where the mask is True. These become the last frames.
+        :param start: The position (see self.mark()).
+        :param mask: A boolean array, one value for every frame after the position.
+        :return: None
+        """
+        self.left[start:] = compress(self.left[start:], mask)
+        self.right[start:] = compress(self.right[start:], mask)
+        self.set_last(start)
+
+    def clear(self):
+        """
+        Remove every frame.
+        :return: None
+        """
+        self.left.clear()
+        self.right.clear()
+
+
+class _ArrayStorage:
+    """
+    Stores the frames in a preallocated NumPy buffer with the shape (2, capacity), one row per channel.
+    The stored frames are the columns between a start and an end offset, the last frames are between a last-start and the end offset.
+    The buffer only grows (doubles) if the frames don't fit, otherwise storing frames never allocates.
+    Every returned channel is a view into the buffer, so it's only valid until the next change.
+    :param capacity: The number of frames preallocated. Default is 8192.
+    :param dtype: The data type of the buffer, np.float32 or np.float64. Default is np.float64.
+    """
+    def __init__(self, capacity: int = 8192, dtype=np.float64):
+        self._data = np.empty((2, max(int(capacity), 1)), dtype)
+        self._start = self._end = self._last_start = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def capacity(self):
+        return self._data.shape[1]
+
+    @property
+    def left(self):
+        return self._data[0, self._start:self._end]
+
+    @property
+    def right(self):
+        return self._data[1, self._start:self._end]
+
+    @property
+    def last_left(self):
+        return self._data[0, self._last_start:self._end]
+
+    @property
+    def last_right(self):
+        return self._data[1, self._last_start:self._end]
+
+    def _reserve(self, amount: int):
+        """
+        Make sure that amount frames fit after the end offset. Moves the frames to the front, or grows the buffer if needed.
+        :param amount: The number of frames.
+        :return: None
+        """
+        if self._end + amount <= self.capacity:
+            return
+        used = self._end - self._start
+        if used + amount <= self.capacity:
+            self._data[:, :used] = self._data[:, self._start:self._end]
+        else:
+            data = np.empty((2, max(self.capacity * 2, used + amount)), self._data.dtype)
+            data[:, :used] = self._data[:, self._start:self._end]
+            self._data = data
+        self._last_start = max(self._last_start - self._start, 0)
+        self._start, self._end = 0, used
+
+    def append(self, left, right):
+        """
+        Append new frames. These become the last frames.
+        :param left: The left channel's new values.
+        :param right: The right channel's new values.
+        :return: None
+        """
+        if np.may_share_memory(left, self._data): left = np.array(left)
+        if np.may_share_memory(right, self._data): right = np.array(right)
+        amount = len(left)
+        self._reserve(amount)
+        self._data[0, self._end:self._end + amount] = left
+        self._data[1, self._end:self._end + amount] = right
+        self._last_start = self._end
+        self._end += amount
+
+    def pop(self, last: bool = True):
+        """
+        Remove the last frames (or every frame) and return them.
+        The returned views are only valid until the next frames are stored.
+        :param last: Whether to remove only the last frames or every frame. Default is True.
+        :return: left, right
+        """
+        if last:
+            left, right = self.last_left, self.last_right
+            self._end = self._last_start
+        else:
+            left, right = self.left, self.right
+            self._end = self._start
+        self._last_start = self._end
+        return left, right
+
+    def mark(self):
+        """
+        Get a position, that can later be given to self.set_last() to make every frame stored since then the last frames.
+        :return: The position.
+        """
+        return self._end - self._start
+
+    def set_last(self, mark: int):
+        """
+        Make every frame stored since the mark the last frames.
+        :param mark: A position from self.mark().
+        :return: None
+        """
+        self._last_start = self._start + mark
+
+    def last_mark(self):
+        """
+        Get the position where the last frames start. See self.mark().
+        :return: The position.
+        """
+        return self._last_start - self._start
+
+    def get_frames(self, start: int, end: int):
+        """
+        Get the frames between two positions (see self.mark()) as a view.
+        :param start: The first position.
+        :param end: The position after the last frame.
+        :return: An array with the shape (2, end - start).
+        """
+        return self._data[:, self._start + start:self._start + end]
+
+    def set_frames(self, start: int, end: int, frames):
+        """
+        Overwrite the frames between two positions (see self.mark()).
+        :param start: The first position.
+        :param end: The position after the last frame.
+        :param frames: The new frames with the shape (2, end - start).
+        :return: None
+        """
+        self._data[:, self._start + start:self._start + end] = frames
+
+    def repeat_last(self, amount: int = 1):
+        """
+        Add the last frames some more times. The repetitions also become part of the last frames.
+        :param amount: The amount of times to add, default is 1.
+        :return: None
+        """
+        amount = int(amount)
+        length = self._end - self._last_start
+        if amount <= 0 or length == 0:
+            return
+        self._reserve(length * amount)
+        last = self._data[:, self._last_start:self._end]
+        for i in range(1, amount + 1):
+            self._data[:, self._last_start + i * length:self._end + i * length] = last
+        self._end += length * amount
+
+    def truncate(self, max_frames: int, beginning: bool = True):
+        """
+        Keep at most max_frames frames by moving the offsets, without copying.
+        The last frames are the part of the previous last frames that was kept (none if they were all cut off).
+        :param max_frames: The maximum number of frames to keep.
+        :param beginning: Whether to cut from the beginning or the end. Default is True (so beginning).
+        :return: None
+        """
+        if len(self) > max_frames:
+            if beginning:
+                self._start = self._end - max_frames
+            else:
+                self._end = self._start + max_frames
+            self._last_start = min(max(self._last_start, self._start), self._end)
+
+    def compress(self, start: int, mask):
+        """
+        Keep only the frames after a position where the mask is True, by moving them together in place. These become the last frames.
+        :param start: The position (see self.mark()).
+        :param mask: A boolean array, one value for every frame after the position.
+        :return: None
+        """
+        start += self._start
+        kept = self._data[:, start:self._end][:, mask]
+        self._data[:, start:start + kept.shape[1]] = kept
+        self._last_start, self._end = start, start + kept.shape[1]
+
+    def clear(self):
+        """
+        Remove every frame.
+        :return: None
+        """
+        self._start = self._end = self._last_start = 0
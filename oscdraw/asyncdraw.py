@@ -0,0 +1,116 @@
+"""
+An asyncio version of draw.Canvas, so one event loop can drive drawing, frame pacing and other I/O.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .draw import Canvas
+
+
+class AsyncCanvas(Canvas):
+    """
+    A Canvas with awaitable writing and frame pacing.
+    In the "callback" output mode, the frames are put into the queue of the audio thread without blocking the event loop.
+    In the "blocking" output mode, the blocking write is done in a single worker thread of the canvas.
+    Takes the same parameters as Canvas.
+    Usage:
+        async for frame in canvas.frames(60):
+            canvas.draw_line(...)
+            await canvas.write_async()
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._executor = None
+        self._write_future = None
+        self._next_frame_time = None
+
+    async def _wait_for_write(self):
+        """
+        Wait for the previous write to finish, for internal use. Only one write can be in progress, since the combed frames are in a reused buffer.
+        :return: None
+        """
+        if self._write_future is not None:
+            await self._write_future
+            self._write_future = None
+
+    async def write_async(self, clear=True, wait=True):
+        """
+        Write the frames stored to the stream without blocking the event loop. See Canvas.write() for more.
+        :param clear: Whether to remove the stored frames. Default is True.
+        :param wait: Whether to wait until the frames are written. If False, the write continues in the background,
+                     and the next write_async() (or self.drain_async()) waits for it. Default is True.
+        :return: None
+        """
+        await self._wait_for_write()
+        self.flush_transforms()
+        left, right = self._storage.left, self._storage.right
+        frames = self._comb_left_right(left, right, self._get_frame_buffer(len(left) * 2))
+        if clear:
+            self._storage.clear()
+        loop = asyncio.get_running_loop()
+        if self.audio.mode == "callback":
+            if not len(frames):
+                return  # Nothing is put in the queue, so there's nothing to wait for
+            # A quarter of the written frames' duration, but never a busy loop
+            delay = max(len(frames) // 2 / self.audio.get_rate() / 4, 0.001)
+            while self.audio.is_queue_full():
+                await asyncio.sleep(delay)
+            self.audio.write(frames)
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(1, "oscdraw-write")
+            self._write_future = loop.run_in_executor(self._executor, self.audio.write, frames)
+            if wait:
+                await self._wait_for_write()
+
+    async def drain_async(self):
+        """
+        Wait until a write in progress is finished and every frame in the queue of the "callback" mode is played.
+        :return: None
+        """
+        await self._wait_for_write()
+        while self.audio.is_queue_full() or self.audio.frames_written > self.audio.frames_played:
+            await asyncio.sleep(0.001)
+
+    async def next_frame(self, fps: int | float = 60):
+        """
+        Wait for the next frame's slot at a target FPS.
+        First waits until at most one frame's worth of written frames are not played yet (based on the frames actually played by the stream),
+        then until the next slot of the wall clock. If the drawing is late, the slots start again from now instead of trying to catch up.
+        :param fps: The target frames per second. Default is 60.
+        :return: None
+        """
+        period = 1 / fps
+        rate = self.audio.get_rate()
+        while True:
+            queued = (self.audio.frames_written - self.audio.frames_played) / rate
+            if queued <= period:
+                break
+            await asyncio.sleep(queued - period)
+        now = asyncio.get_running_loop().time()
+        if self._next_frame_time is None or now - self._next_frame_time > period:
+            self._next_frame_time = now
+        elif self._next_frame_time > now:
+            await asyncio.sleep(self._next_frame_time - now)
+        self._next_frame_time += period
+
+    async def frames(self, fps: int | float = 60, count: int = None):
+        """
+        An asynchronous iterator, that waits for every frame's slot with self.next_frame().
+        :param fps: The target frames per second. Default is 60.
+        :param count: The number of frames. Default is None, no limit.
+        :return: The index of the frames.
+        """
+        i = 0
+        while count is None or i < count:
+            await self.next_frame(fps)
+            yield i
+            i += 1
+
+    def close(self):
+        """
+        Stop the worker thread of the "blocking" output mode.
+        :return: None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
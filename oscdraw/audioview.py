@@ -1,22 +1,49 @@
 """
 Visualize frames of audio data to-be-written or read from an input.
 """
+import importlib
 import numpy as np
 from typing import Literal
 from .draw import Canvas
 from ._audio import _AudioBackend
-try:
-    import pygame
-    pygame.init()
-    pygame.font.init()
-    pygame_enabled = True
-except ImportError:
-    pygame_enabled = False
-try:
-    import matplotlib.pyplot as plt
-    plt_enabled = True
-except ImportError:
-    plt_enabled = False
+
+pygame = None
+plt = None
+
+
+def _get_pygame():
+    """
+    Import and initialize pygame when it's first needed.
+    :return: The pygame module.
+    """
+    global pygame
+    if pygame is None:
+        try:
+            module = importlib.import_module("pygame")
+        except ImportError:
+            raise ModuleNotFoundError(
+                f"pygame could not be imported"
+            )
+        module.init()
+        module.font.init()
+        pygame = module
+    return pygame
+
+
+def _get_plt():
+    """
+    Import matplotlib.pyplot when it's first needed.
+    :return: The matplotlib.pyplot module.
+    """
+    global plt
+    if plt is None:
+        try:
+            plt = importlib.import_module("matplotlib.pyplot")
+        except ImportError:
+            raise ModuleNotFoundError(
+                f"matplotlib could not be imported"
+            )
+    return plt
 
 
 class _ViewBase:
@@ -76,10 +103,7 @@ class OscilloscopeView(_ViewBase):
     def __init__(self, source: Canvas | _AudioBackend, num_of_read_frames: int = 192000 // 60,
                  window_size: tuple[float, float] = (800, 800), debug_data_in_window: bool = False,
                  params: dict = None):
-        if not pygame_enabled:
-            raise ModuleNotFoundError(
-                f"pygame could not be imported"
-            )
+        _get_pygame()
         super().__init__(source, num_of_read_frames)
         self.size = window_size
         self.debug = debug_data_in_window
@@ -156,6 +180,7 @@ class AudioPlotView(_ViewBase):
 
     def plot(self, include: Literal["lr", "l", "r"] = None):
         if include is None: include = self.include
+        _get_plt()
         self._get_frames()
         left, right = self.left, self.right
         if include in ("l", "lr"):
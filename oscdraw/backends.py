@@ -0,0 +1,142 @@
+"""
+Backends that a draw.Canvas writes its frames to, selected with Canvas(backend=...).
+The default backend is the audio device (_audio._AudioBackend). The others here don't need a sound card,
+and they take the frames as fast as the CPU can create them, so they are useful for offline rendering and benchmarks.
+"""
+import wave
+import numpy as np
+
+
+class Backend:
+    """
+    The interface of every backend. Subclasses should override self._write(), and self.close() if needed.
+    The frames are always 2 channels of 16-bit integers.
+    Can be used in a with statement, which closes the backend at the end.
+    :param rate: The sample rate. Default is 192000.
+    :var mode: How the frames are taken. The headless backends are always "blocking".
+    :var frames_written: The number of frames (one value per channel) given to self.write().
+    :var frames_played: The number of frames taken by the backend. Same as frames_written for the headless backends.
+    """
+    mode = "blocking"
+    is_output = True
+
+    def __init__(self, rate: int = 192000):
+        self.rate = rate
+        self.frames_written = self.frames_played = 0
+
+    def get_rate(self):
+        return self.rate
+
+    def write(self, frames):
+        """
+        Write frames of audio.
+        :param frames: Frames of audio (left and right values after each other), as numbers in an iterable, or an int16 NumPy array.
+        :return: None
+        """
+        frames = np.ascontiguousarray(frames, "int16")
+        self._write(frames)
+        self.frames_written += len(frames) // 2
+        self.frames_played += len(frames) // 2
+
+    def _write(self, frames: np.ndarray):
+        """
+        Take the frames. Override this in subclasses.
+        :param frames: The frames as a 1-dimensional int16 array. It may be a reused buffer, so copy it if it's kept.
+        :return: None
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} doesn't implement _write()"
+        )
+
+    def is_queue_full(self):
+        """
+        Whether self.write() would block. Always False for the headless backends.
+        :return: bool
+        """
+        return False
+
+    def drain(self):
+        """
+        Wait until every written frame is taken. Nothing to do for the headless backends.
+        :return: None
+        """
+
+    def close(self):
+        """
+        Close the backend.
+        :return: None
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class NullBackend(Backend):
+    """
+    A backend that throws away every frame. Useful for measuring how fast the frames are drawn.
+    :param rate: The sample rate. Default is 192000.
+    """
+    def _write(self, frames: np.ndarray):
+        pass
+
+
+class WaveFileBackend(Backend):
+    """
+    A backend that writes the frames to a wav file, as fast as they are drawn.
+    Close it (or use it in a with statement) to finish the file.
+    :param file: The path to the file. It's overwritten if it exists.
+    :param rate: The sample rate. Default is 192000.
+    """
+    def __init__(self, file: str, rate: int = 192000):
+        super().__init__(rate)
+        self.file = file
+        self._wav = wave.open(file, "wb")
+        self._wav.setnchannels(2)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(rate)
+
+    def _write(self, frames: np.ndarray):
+        self._wav.writeframesraw(memoryview(frames).cast("B"))
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+class ArrayBackend(Backend):
+    """
+    A backend that keeps every frame in memory, in a growable int16 NumPy array.
+    :param rate: The sample rate. Default is 192000.
+    :param capacity: The number of frames preallocated. Default is None, so 1 second.
+    """
+    def __init__(self, rate: int = 192000, capacity: int = None):
+        super().__init__(rate)
+        self._data = np.empty((capacity if capacity else rate) * 2, np.int16)
+        self._size = 0
+
+    def _write(self, frames: np.ndarray):
+        if self._size + len(frames) > len(self._data):
+            data = np.empty(max(len(self._data) * 2, self._size + len(frames)), np.int16)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+        self._data[self._size:self._size + len(frames)] = frames
+        self._size += len(frames)
+
+    def get_frames(self):
+        """
+        Get every frame written so far.
+        :return: A view with the shape (number of frames, 2), the columns are the left and right channels.
+                 Only valid until the next write.
+        """
+        return self._data[:self._size].reshape(-1, 2)
+
+    def clear(self):
+        """
+        Remove every frame kept so far.
+        :return: None
+        """
+        self._size = 0
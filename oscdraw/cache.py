@@ -0,0 +1,114 @@
+"""
+Caches for frames that are drawn again and again with the same values, so they don't have to be created every time.
+"""
+from collections import OrderedDict
+from collections.abc import Hashable
+import numpy as np
+
+
+class WaveformCache:
+    """
+    A memoization layer for the frames of draw.Canvas primitives (lines, polygons, ellipses etc.), with LRU (least recently used) eviction.
+    The keys are the normalized parameters of the primitives, including the sample rate, so a cache can be shared between canvases.
+    The cached frames are read-only NumPy arrays.
+    Give it to a draw.Canvas to use it: Canvas(cache=WaveformCache()).
+    With a diskcache.DiskCache, every cached frame is also written to the disk, and frames not found in memory are loaded from it,
+    so they are only created once even between runs of the program. Only use it for frames that are drawn again in later runs
+    (e.g. static pictures), as every new frame is written to the disk.
+    :param max_bytes: The maximum size of every cached frame together, in bytes. Default is 64 MiB.
+    :param disk: A diskcache.DiskCache to use as a second level. Default is None, not used.
+    :var hits: The number of times frames were found in the cache (in memory or on the disk).
+    :var disk_hits: The number of times frames were loaded from the disk.
+    :var misses: The number of times frames were not found in the cache.
+    :var evictions: The number of frames removed from the cache (or not stored) because of the size limit.
+    """
+    def __init__(self, max_bytes: int = 64 * 2**20, disk=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable):
+        """
+        Get the cached frames, and mark them as recently used.
+        :param key: The key.
+        :return: left, right as read-only NumPy arrays. None if not found.
+        """
+        frames = self._entries.get(key)
+        if frames is None:
+            frames = self.disk.get_frames(key) if self.disk is not None else None
+            if frames is None:
+                self.misses += 1
+                return None
+            frames = self._store(key, *frames)
+            self.disk_hits += 1
+        else:
+            self._entries.move_to_end(key)
+        self.hits += 1
+        return frames
+
+    def put(self, key: Hashable, left, right):
+        """
+        Cache frames. Evicts the least recently used frames if the size limit is reached.
+        If the cache has a disk cache, the frames are also written to it.
+        :param key: The key.
+        :param left: The left channel's frames.
+        :param right: The right channel's frames.
+        :return: left, right as read-only NumPy arrays (the cached ones if they could be cached).
+        """
+        left, right = np.array(left), np.array(right)
+        left.flags.writeable = right.flags.writeable = False
+        if self.disk is not None:
+            self.disk.put_frames(key, left, right)
+        return self._store(key, left, right)
+
+    def _store(self, key: Hashable, left: np.ndarray, right: np.ndarray):
+        """
+        Cache read-only frames in memory, for internal use.
+        :param key: The key.
+        :param left: The left channel's frames.
+        :param right: The right channel's frames.
+        :return: left, right
+        """
+        nbytes = left.nbytes + right.nbytes
+        if nbytes > self.max_bytes:
+            self.evictions += 1
+            return left, right
+        if key in self._entries:
+            self._remove(key)
+        while self.size + nbytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        self._entries[key] = left, right
+        self.size += nbytes
+        return left, right
+
+    def _remove(self, key: Hashable):
+        left, right = self._entries.pop(key)
+        self.size -= left.nbytes + right.nbytes
+
+    def clear(self):
+        """
+        Remove every cached frame. The counters are not reset.
+        :return: None
+        """
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Get the counters of the cache.
+        :return: A dict with the hits, misses, evictions, disk hits, entries and bytes.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "disk_hits": self.disk_hits,
+                "entries": len(self._entries), "bytes": self.size}
+
+    def __repr__(self):
+        return f"WaveformCache({len(self._entries)} entries; {self.size}/{self.max_bytes} bytes; {self.hits} hits, {self.misses} misses, {self.evictions} evictions)"
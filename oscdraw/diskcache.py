@@ -0,0 +1,239 @@
+"""
+A persistent cache on the disk, so frames and compiled geometry survive between runs of a program.
+Every entry is a directory of .npy files named by a hash of its key (its content), and it's loaded with
+np.load(mmap_mode="r"): the file is only mapped into memory, so loading is near-instant and only the used pages are read.
+Give it to a cache.WaveformCache (WaveformCache(disk=DiskCache())), a font.Font (Font(..., disk_cache=DiskCache()))
+or an svg.Svg (Svg(..., disk_cache=DiskCache())) to use it.
+"""
+from collections.abc import Hashable, Mapping
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+from .objects import CompiledObjectCollection
+
+CACHE_VERSION = 1  # Entries of other versions are in other directories, so they are never loaded
+
+
+def default_directory():
+    """
+    Get the default directory of the disk cache: $OSCDRAW_CACHE_DIR, or oscdraw in the user's cache directory.
+    :return: The path.
+    """
+    if os.environ.get("OSCDRAW_CACHE_DIR"):
+        return os.environ["OSCDRAW_CACHE_DIR"]
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "oscdraw")
+
+
+def content_hash(*parts):
+    """
+    Hash values by their content. NumPy arrays and CompiledObjectCollection objects are hashed by their data,
+    bytes as they are and everything else by its repr(), so the hash is the same in every run of the program.
+    :param parts: The values.
+    :return: The hash as a hexadecimal string.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, CompiledObjectCollection):
+            part = tuple(part._to_arrays().values())
+        if isinstance(part, tuple) and any(isinstance(item, np.ndarray | CompiledObjectCollection) for item in part):
+            data = b"tuple:" + content_hash(*part).encode()
+        elif isinstance(part, np.ndarray):
+            data = f"array:{part.dtype.str}:{part.shape}:".encode() + np.ascontiguousarray(part).tobytes()
+        elif isinstance(part, bytes):
+            data = b"bytes:" + part
+        else:
+            data = b"repr:" + repr(part).encode()
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    A persistent cache of NumPy arrays on the disk, with a size limit.
+    The entries are written atomically (to a temporary directory first, which is then renamed), so a crashed program
+    or another process using the same directory never leaves a half-written entry behind.
+    When the size limit is reached, the least recently used entries are removed.
+    The loaded arrays are read-only memory-mapped arrays.
+    :param directory: The directory of the cache. Default is None, see default_directory().
+                      The entries are in a subdirectory for the version of the format (CACHE_VERSION).
+    :param max_bytes: The maximum size of every entry together, in bytes. Default is 256 MiB.
+    :var hits: The number of entries found on the disk.
+    :var misses: The number of entries not found on the disk.
+    :var writes: The number of entries written.
+    :var evictions: The number of entries removed (or not written) because of the size limit.
+    """
+    def __init__(self, directory: str = None, max_bytes: int = 256 * 2**20):
+        self.directory = os.path.join(directory or default_directory(), f"v{CACHE_VERSION}")
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._size = None
+        self.hits = self.misses = self.writes = self.evictions = 0
+
+    def _path(self, key: Hashable):
+        return os.path.join(self.directory, content_hash(key))
+
+    def _entries(self):
+        """
+        Get every entry with its last use and size, for internal use.
+        :return: A list of (last use, size, path).
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue  # Temporary directories of unfinished writes
+            try:
+                size = sum(file.stat().st_size for file in os.scandir(entry.path))
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except FileNotFoundError:  # Removed by another process
+                continue
+        return entries
+
+    @property
+    def size(self):
+        """
+        The size of every entry together in bytes. Other processes writing to the same directory are only noticed by self.clear().
+        """
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key: Hashable):
+        return os.path.isdir(self._path(key))
+
+    def get(self, key: Hashable):
+        """
+        Load an entry, and mark it as recently used.
+        :param key: The key. It's hashed with content_hash().
+        :return: A dict of the arrays as read-only memory-mapped NumPy arrays. None if not found.
+        """
+        path = self._path(key)
+        try:
+            names = [name for name in os.listdir(path) if name.endswith(".npy")]
+            arrays = {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r") for name in names}
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):  # Not cached, or removed or damaged by something else
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    def put(self, key: Hashable, arrays: Mapping[str, np.ndarray]):
+        """
+        Write an entry atomically. If the key is already cached, nothing is written.
+        Evicts the least recently used entries if the size limit is reached.
+        :param key: The key. It's hashed with content_hash().
+        :param arrays: The arrays by name. The names must be valid file names.
+        :return: None
+        """
+        path = self._path(key)
+        if os.path.isdir(path):
+            return
+        arrays = {name: np.asarray(array) for name, array in arrays.items()}
+        nbytes = sum(array.nbytes for array in arrays.values())
+        if nbytes > self.max_bytes:
+            self.evictions += 1
+            return
+        if self.size + nbytes > self.max_bytes:
+            self._evict(self.max_bytes - nbytes)
+        temporary = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(temporary, name + ".npy"), array)
+            written = sum(file.stat().st_size for file in os.scandir(temporary))
+            os.rename(temporary, path)
+        except OSError:  # The same entry was written by another process at the same time
+            shutil.rmtree(temporary, ignore_errors=True)
+            return
+        self._size = self.size + written
+        self.writes += 1
+
+    def _evict(self, max_bytes: int):
+        """
+        Remove the least recently used entries until the size is at most max_bytes, for internal use.
+        :param max_bytes: The size to reach.
+        :return: None
+        """
+        entries = sorted(self._entries())
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in entries:
+            if size <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            size -= entry_size
+            self.evictions += 1
+        self._size = size
+
+    def get_frames(self, key: Hashable):
+        """
+        Load cached frames (see self.put_frames()).
+        :param key: The key.
+        :return: left, right as read-only memory-mapped NumPy arrays. None if not found.
+        """
+        arrays = self.get(key)
+        if arrays is None or "frames" not in arrays:
+            return None
+        return arrays["frames"][0], arrays["frames"][1]
+
+    def put_frames(self, key: Hashable, left, right):
+        """
+        Cache frames, both channels in one array.
+        :param key: The key.
+        :param left: The left channel's frames.
+        :param right: The right channel's frames.
+        :return: None
+        """
+        self.put(key, {"frames": np.array((left, right), float)})
+
+    def get_compiled(self, key: Hashable):
+        """
+        Load a cached CompiledObjectCollection (see self.put_compiled()). Its original arrays are the memory-mapped ones.
+        :param key: The key.
+        :return: The CompiledObjectCollection. None if not found.
+        """
+        arrays = self.get(key)
+        if arrays is None:
+            return None
+        try:
+            return CompiledObjectCollection._from_arrays(arrays)
+        except KeyError:  # Not a compiled collection
+            return None
+
+    def put_compiled(self, key: Hashable, compiled: CompiledObjectCollection):
+        """
+        Cache the original values (without shifts, rotations and scalings) of a CompiledObjectCollection.
+        :param key: The key.
+        :param compiled: The CompiledObjectCollection.
+        :return: None
+        """
+        self.put(key, compiled._to_arrays())
+
+    def clear(self):
+        """
+        Remove every entry (of this version). The counters are not reset.
+        :return: None
+        """
+        for _, _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+        self._size = None
+
+    def stats(self):
+        """
+        Get the counters of the cache.
+        :return: A dict with the hits, misses, writes, evictions and bytes.
+        """
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes, "evictions": self.evictions,
+                "bytes": self.size}
+
+    def __repr__(self):
+        return (f"DiskCache({self.directory}; {self.size}/{self.max_bytes} bytes; {self.hits} hits, {self.misses} misses, "
+                f"{self.writes} writes, {self.evictions} evictions)")
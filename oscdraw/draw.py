@@ -1,12 +1,76 @@
 from collections.abc import Collection
+from contextlib import contextmanager
 import math
 from typing import Literal
 from unicodedata import normalize
 from ._audio import _AudioBackend
-from .objects import Point, Line, Polygon, Ellipse, ObjectCollection, degrees_to_radians
-from .font import Font, default_font
+from ._storage import _ListStorage, _ArrayStorage
+from .cache import WaveformCache
+from .backends import Backend
+from .player import Player, Clip
+from .objects import Point, PointArray, Line, Polygon, Polyline, Ellipse, ObjectCollection, CompiledObjectCollection, degrees_to_radians
+from .font import Font, get_default_font
+from . import pathorder
 import numpy as np
 
+_IDENTITY = np.identity(3)
+
+
+def _shift_matrix(x: int | float, y: int | float):
+    """
+    Create a 3x3 affine matrix that shifts.
+    :param x: Amount on the X-axis.
+    :param y: Amount on the Y-axis.
+    :return: The matrix.
+    """
+    return np.array(((1, 0, x), (0, 1, y), (0, 0, 1)), float)
+
+
+def _rotation_matrix(angle: int | float, centre: Point):
+    """
+    Create a 3x3 affine matrix that rotates in the same direction as Canvas.change_rotate().
+    :param angle: The angle to rotate by in degrees.
+    :param centre: The centre of rotation as a Point object.
+    :return: The matrix.
+    """
+    angle = degrees_to_radians(angle)
+    rotate = np.array(((math.cos(angle), math.sin(angle), 0), (-math.sin(angle), math.cos(angle), 0), (0, 0, 1)))
+    return _shift_matrix(centre.x, centre.y) @ rotate @ _shift_matrix(-centre.x, -centre.y)
+
+
+def _scale_matrix(x: int | float, y: int | float, centre: Point):
+    """
+    Create a 3x3 affine matrix that scales.
+    :param x: The amount to scale by on the X-axis.
+    :param y: The amount to scale by on the Y-axis.
+    :param centre: The centre of scaling as a Point object.
+    :return: The matrix.
+    """
+    scale = np.array(((x, 0, 0), (0, y, 0), (0, 0, 1)), float)
+    return _shift_matrix(centre.x, centre.y) @ scale @ _shift_matrix(-centre.x, -centre.y)
+
+
+def _allocate_frames(lengths: np.ndarray, total: int, minimum: int = 1):
+    """
+    Divide a number of frames between pieces in proportion to their lengths. Every piece gets at least minimum frames.
+    The fractions are carried over from piece to piece (the cumulative sum is rounded), so every frame is given to some piece.
+    :param lengths: The lengths of the pieces.
+    :param total: The number of frames.
+    :param minimum: The minimum number of frames of every piece. Default is 1.
+    :return: The number of frames of every piece, as an int array.
+    """
+    rest = total - minimum * len(lengths)
+    if rest < 0:
+        raise ValueError(
+            f"Cannot draw {len(lengths)} objects with at least {minimum} frames each in {total} frames\n"
+            f"Consider increasing the time to draw (or lowering the frame rate) or the sample rate"
+        )
+    length = lengths.sum()
+    weights = lengths / length if length > 0 else np.full(len(lengths), 1 / len(lengths))
+    boundaries = np.floor(np.cumsum(weights * rest) + 0.5).astype(int)
+    boundaries[-1] = rest
+    return np.diff(boundaries, prepend=0) + minimum
+
 
 class Canvas:
     """
@@ -16,43 +80,122 @@ class Canvas:
     The documentation is from an older version that actually had a self.frames variable.
     :param audio_device_index: The output device's index. See audio.get_all_device_info().
     :param rate: The sample rate of the stream. Default is 192000.
-    :param record: Whether to temporarily store the frames, so they can be saved to a file later.
-    :var audio: An instance of _audio._AudioBackend for simple audio outputting.
+    :param record: Whether to temporarily store the frames, so they can be saved to a file later (with self.audio.save()).
+                   It can also be a path to a wav file, then the frames are streamed into that file.
+    :param storage: How to store the frames. "list" stores them in Python lists,
+                    "array" stores them in a preallocated NumPy buffer that only grows if needed (no allocations while drawing frames of similar size).
+                    With "array", the channels are returned as NumPy views into the buffer, which are only valid until the next change. Default is "list".
+    :param dtype: The data type of the "array" storage, np.float32 or np.float64. Default is np.float64.
+    :param capacity: The number of frames preallocated for the "array" storage. Default is None, so 1/30th of a second.
+    :param cache: A cache.WaveformCache for the frames of lines, polygons and ellipses, so drawing the same thing again only copies the cached frames.
+                  Default is None, no caching.
+    :param output_mode: How the frames are given to the audio device. "blocking" writes them in self.write() and waits for the device.
+                        "callback" puts them in a queue that the audio thread consumes, so self.write() only waits if the queue is full
+                        (drawing the next frame happens while the previous one is played). Default is "blocking".
+    :param queue_depth: The maximum number of writes waiting to be played in the "callback" output mode. Default is 4.
+    :param latency: The length of the audio device's buffer in milliseconds. Default is None, chosen automatically.
+    :param backend: A backends.Backend to write the frames to instead of an audio device, e.g. backends.NullBackend, backends.WaveFileBackend or backends.ArrayBackend.
+                    If given, the sample rate of the backend is used, and the audio device parameters are ignored. Default is None, an audio device is opened.
+    :var audio: An instance of _audio._AudioBackend for simple audio outputting (or the given backend).
     :var left: The frames to be written to the audio output, only the left channel.
     :var right: The frames to be written to the audio output, only the right channel.
+
+    The canvas also has a transform stack (see self.push_transform() and self.transform()).
+    Everything drawn is transformed by the 3x3 affine matrix on the top of the stack.
+    The transforms are applied lazily, with one matrix multiplication per drawn part, when the frames are needed (e.g. in self.write()) or in self.flush_transforms().
     """
-    def __init__(self, audio_device_index: int = None, rate: int = 192000, record: bool = False):
-        self.audio = _AudioBackend(audio_device_index, rate=rate, record=record)
-        self.left, self.right = [], []
-        self._last_left, self._last_right = [], []
+    def __init__(self, audio_device_index: int = None, rate: int = 192000, record: bool | str = False,
+                 storage: Literal["list", "array"] = "list", dtype=np.float64, capacity: int = None,
+                 cache: WaveformCache = None, output_mode: Literal["blocking", "callback"] = "blocking",
+                 queue_depth: int = 4, latency: int | float = None, backend: Backend = None):
+        if backend is None:
+            backend = _AudioBackend(audio_device_index, rate=rate, record=record,
+                                    mode=output_mode, queue_depth=queue_depth, latency=latency)
+        self.audio = backend
+        rate = backend.get_rate()
+        if storage == "list":
+            self._storage = _ListStorage()
+        elif storage == "array":
+            self._storage = _ArrayStorage(capacity if capacity else rate // 30, dtype)
+        else:
+            raise ValueError(
+                f"Unknown storage: {storage}"
+            )
+        self.cache = cache
+        self._frame_buffer = np.empty(0, np.int16)
+        self._transforms = [_IDENTITY]
+        self._pending_transforms = []
+        self._frame_carry = 0.0
+        self._player = None
+
+    @property
+    def left(self):
+        self.flush_transforms()
+        return self._storage.left
+
+    @property
+    def right(self):
+        self.flush_transforms()
+        return self._storage.right
 
     @staticmethod
-    def _comb_left_right(left, right):
+    def _comb_left_right(left, right, out: np.ndarray = None):
         """
         Comb the left and right channels into an array with 1 dimension for internal use.
         :param left: The left channel.
         :param right: The right channel.
-        :return: The combed array.
+        :param out: An int16 array to comb into, at least twice as long as a channel. Default is None, a new array is created.
+        :return: The combed array (a view of out, if given).
         """
-        frames = []
-        for i in range(len(left)):
-            frames.append(left[i])
-            frames.append(right[i])
+        if out is None: out = np.empty(len(left) * 2, np.int16)
+        frames = out[:len(left) * 2]
+        frames[0::2] = left
+        frames[1::2] = right
         return frames
 
+    def _get_frame_buffer(self, length: int):
+        """
+        Get the reusable int16 buffer for combing the channels, for internal use. Only grows if it's too short.
+        :param length: The minimum length.
+        :return: The buffer.
+        """
+        if len(self._frame_buffer) < length:
+            self._frame_buffer = np.empty(max(length, len(self._frame_buffer) * 2), np.int16)
+        return self._frame_buffer
+
     def _store_left_right(self, left, right):
         """
         Store the created left and right channel values for internal use.
+        If there is a transform on the transform stack, it is applied later, see self.flush_transforms().
         :param left: The left channel's new values.
         :param right: The right channel's new values.
         :return: None
         """
-        if not (isinstance(left, tuple) or isinstance(left, list)): left = tuple(left)
-        if not (isinstance(right, tuple) or isinstance(right, list)): right = tuple(right)
-        self.left.extend(left)
-        self.right.extend(right)
-        self._last_left = left
-        self._last_right = right
+        start = self._storage.mark()
+        self._storage.append(left, right)
+        matrix = self._transforms[-1]
+        if matrix is not _IDENTITY:
+            end = self._storage.mark()
+            if self._pending_transforms and self._pending_transforms[-1][1] == start and self._pending_transforms[-1][2] is matrix:
+                start = self._pending_transforms.pop()[0]
+            self._pending_transforms.append((start, end, matrix))
+
+    def _cached_samples(self, key: tuple, generate, *args):
+        """
+        Get frames from the cache, or create them with generate(*args) and cache them, for internal use.
+        If the canvas has no cache, the frames are always created.
+        :param key: The normalized parameters of the frames. The sample rate is added to it.
+        :param generate: The function creating the frames, returning left, right.
+        :param args: The arguments of generate.
+        :return: left, right
+        """
+        if self.cache is None:
+            return generate(*args)
+        key += (self.audio.get_rate(),)
+        samples = self.cache.get(key)
+        if samples is None:
+            samples = self.cache.put(key, *generate(*args))
+        return samples
 
     def _handle_supports_last(self, last: bool):
         """
@@ -60,29 +203,132 @@ class Canvas:
         :param last: Value of last
         :return: left, right
         """
-        if not last:
-            left, right = self.left.copy(), self.right.copy()
-            self.left.clear()
-            self.right.clear()
-        else:
-            self.left = self.left[:len(self.left) - len(self._last_left)]  # Remove _last_left with slices
-            self.right = self.right[:len(self.right) - len(self._last_right)]  # Remove _last_right with slices
-            left, right = self._last_left, self._last_right
-        return left, right
+        self.flush_transforms()
+        return self._storage.pop(last)
+
+    def _apply_matrix(self, matrix: np.ndarray, start: int, end: int):
+        """
+        Transform the stored frames between two positions with one matrix multiplication, for internal use.
+        :param matrix: The 3x3 affine matrix.
+        :param start: The first position.
+        :param end: The position after the last frame.
+        :return: None
+        """
+        frames = self._storage.get_frames(start, end)
+        self._storage.set_frames(start, end, matrix[:2, :2] @ frames + matrix[:2, 2:])
+
+    def flush_transforms(self):
+        """
+        Apply the transforms from the transform stack to the frames drawn since the last flush.
+        This is done automatically whenever the frames are needed, so it's only needed to control when the work is done.
+        :return: None
+        """
+        for start, end, matrix in self._pending_transforms:
+            self._apply_matrix(matrix, start, end)
+        self._pending_transforms.clear()
+
+    def push_transform(self, matrix: np.ndarray | Collection[Collection[int | float]] = None):
+        """
+        Push a copy of the current transform onto the transform stack.
+        :param matrix: A 3x3 affine matrix to combine with the copy (see self.transform_matrix()). Default is None, no combining.
+        :return: None
+        """
+        self._transforms.append(self._transforms[-1])
+        if matrix is not None:
+            self.transform_matrix(matrix)
+
+    def pop_transform(self):
+        """
+        Pop the current transform from the transform stack, so the previous one is used again.
+        :return: The popped 3x3 affine matrix.
+        """
+        if len(self._transforms) == 1:
+            raise IndexError(
+                "Cannot pop the base transform of the transform stack."
+            )
+        return self._transforms.pop()
+
+    @contextmanager
+    def transform(self, matrix: np.ndarray | Collection[Collection[int | float]] = None):
+        """
+        Push a transform for a with statement, and pop it at the end.
+        Usage: with canvas.transform(): canvas.transform_rotate(45); canvas.draw_line(...)
+        :param matrix: A 3x3 affine matrix to combine with the pushed transform. Default is None.
+        :return: A context manager, that gives this canvas.
+        """
+        self.push_transform(matrix)
+        try:
+            yield self
+        finally:
+            self.pop_transform()
+
+    def get_transform(self):
+        """
+        Return the current transform.
+        :return: The 3x3 affine matrix on the top of the transform stack.
+        """
+        return self._transforms[-1].copy()
+
+    def transform_matrix(self, matrix: np.ndarray | Collection[Collection[int | float]]):
+        """
+        Combine the current transform with an affine matrix. The matrix is applied to the drawn frames before the previous transform.
+        :param matrix: The 3x3 affine matrix (the last row should be 0, 0, 1).
+        :return: None
+        """
+        matrix = np.asarray(matrix, float)
+        if matrix.shape != (3, 3):
+            raise ValueError(
+                f"The matrix should have the shape (3, 3), not {matrix.shape}"
+            )
+        self._transforms[-1] = self._transforms[-1] @ matrix
+
+    def transform_shift(self, x: int | float, y: int | float):
+        """
+        Combine the current transform with a shift.
+        :param x: Amount on the X-axis.
+        :param y: Amount on the Y-axis.
+        :return: None
+        """
+        self.transform_matrix(_shift_matrix(x, y))
+
+    def transform_rotate(self, angle: int | float, centre: Point | Collection[int | float, int | float] = None):
+        """
+        Combine the current transform with a rotation. The direction is the same as in self.change_rotate().
+        :param angle: The angle to rotate by in degrees.
+        :param centre: The centre of rotation as a Point object or other point representations, see the Point class for more details.
+        :return: None
+        """
+        if centre is None: centre = Point(0, 0)
+        elif not isinstance(centre, Point): centre = Point(centre)
+        self.transform_matrix(_rotation_matrix(angle, centre))
+
+    def transform_scale(self, x: int | float, y: int | float, centre: Point | Collection[int | float, int | float] = None):
+        """
+        Combine the current transform with a scaling.
+        :param x: The amount to scale by on the X-axis.
+        :param y: The amount to scale by on the Y-axis.
+        :param centre: The centre of scaling as a Point object or other point representations, see the Point class for more details.
+        :return: None
+        """
+        if centre is None: centre = Point(0, 0)
+        elif not isinstance(centre, Point): centre = Point(centre)
+        self.transform_matrix(_scale_matrix(x, y, centre))
 
     def get_left_right(self):
         """
         Return the frames by the two channels.
         :return: Left, right.
         """
-        return self.left, self.right
+        self.flush_transforms()
+        return self._storage.left, self._storage.right
 
     def get_last(self):
         """
         Return the last frames by the two channels.
         :return: Left, right.
         """
-        return self._last_left, self._last_right
+        self.flush_transforms()
+        return self._storage.last_left, self._storage.last_right
 
     def repeat(self, amount: int = 1):
         """
@@ -90,17 +336,18 @@ class Canvas:
         :param amount: The amount of times to add, default is 1.
         :return: None
         """
-        self.left.extend(self._last_left * amount)
-        self._last_left.extend(self._last_left * amount)
-        self.right.extend(self._last_right * amount)
-        self._last_right.extend(self._last_right * amount)
+        self.flush_transforms()
+        self._storage.repeat_last(amount)
 
-    def draw_point(self, point: Point | Collection[int, int]):
+    def draw_point(self, point: Point | Collection[int, int] | PointArray):
         """
         Draws a point on the oscilloscope.
-        :param point: The point. See the Point class for more details.
+        :param point: The point. See the Point class for more details. A PointArray draws every point in it, one frame each.
         :return: None
         """
+        if isinstance(point, PointArray):
+            self._store_left_right(point.x, point.y)
+            return
         if not isinstance(point, Point): point = Point(point)
         left, right = [], []
         left.append(point.x)
@@ -118,94 +365,261 @@ class Canvas:
         :return: None
         """
         if not isinstance(line, Line): line = Line(line)
-        left, right = [], []
+        key = ("line", line.p1.x, line.p1.y, line.p2.x, line.p2.y, frequency, time, mode)
+        left, right = self._cached_samples(key, self._line_samples, line, frequency, time, mode)
+        self._store_left_right(left, right)
+
+    def _line_samples(self, line: Line, frequency: int | float, time: int | float,
+                      mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of a line, for internal use.
+        :param line: The line as a Line object.
+        :param frequency: The frequency of the wave.
+        :param time: The length of drawing the line, in milliseconds.
+        :param mode: The type of waves to draw the line with. See self.draw_line() for more.
+        :return: left, right as NumPy arrays.
+        """
+        left, right = self._lines_frames(np.array(((line.p1.x, line.p1.y),)), np.array(((line.p2.x, line.p2.y),)),
+                                         frequency, time, mode)
+        return left[0], right[0]
+
+    def _lines_frames(self, p1: np.ndarray, p2: np.ndarray, frequency: int | float, time: int | float,
+                      mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of many lines with the same length of drawing at once,
+        with array math over the frame indices, for internal use.
+        :param p1: The first points of the lines, with the shape (number of lines, 2).
+        :param p2: The second points of the lines, with the shape (number of lines, 2).
+        :param frequency: The frequency of the wave.
+        :param time: The length of drawing each line, in milliseconds.
+        :param mode: The type of waves to draw the lines with. See self.draw_line() for more.
+        :return: left, right as NumPy arrays with the shape (number of lines, number of frames per line).
+        """
         num_frames = int(self.audio.get_rate() * time / 1000)
         if num_frames == 0:
             raise ValueError(
                 f"With the given values, the line cannot be drawn\n"
                 f"Consider increasing the time to draw or the sample rate"
             )
+        return self._lines_waves(p1, p2, frequency, num_frames, mode)
+
+    def _lines_waves(self, p1: np.ndarray, p2: np.ndarray, frequency: int | float, num_frames: int,
+                     mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of many lines with the same number of frames at once, for internal use.
+        :param p1: The first points of the lines, with the shape (number of lines, 2).
+        :param p2: The second points of the lines, with the shape (number of lines, 2).
+        :param frequency: The frequency of the wave.
+        :param num_frames: The number of frames of each line.
+        :param mode: The type of waves to draw the lines with. See self.draw_line() for more.
+        :return: left, right as NumPy arrays with the shape (number of lines, num_frames).
+        """
         frames_per_cycle = self.audio.get_rate() / frequency
+        period = frames_per_cycle + 1/frames_per_cycle
+        i = np.arange(num_frames)
+        x1, y1, x2, y2 = p1[:, :1], p1[:, 1:], p2[:, :1], p2[:, 1:]
         if mode == "square":
-            for i in range(num_frames):
-                if i % frames_per_cycle / frames_per_cycle < 0.5:
-                    left.append(line.p1.x)
-                    right.append(line.p1.y)
-                else:
-                    left.append(line.p2.x)
-                    right.append(line.p2.y)
+            second_half = i % frames_per_cycle / frames_per_cycle >= 0.5
+            return np.where(second_half, x2, x1), np.where(second_half, y2, y1)
         elif mode == "sawtooth":
-            for i in range(num_frames):
-                percent = i % (frames_per_cycle + 1/frames_per_cycle) / (frames_per_cycle + 1/frames_per_cycle)
-                current_point = Point(
-                    (line.p2.x - line.p1.x) * percent + line.p1.x,
-                    (line.p2.y - line.p1.y) * percent + line.p1.y
-                )
-                left.append(current_point.x)
-                right.append(current_point.y)
+            percent = i % period / period
         elif mode == "triangle":
-            for i in range(num_frames):
-                percent = i*2 % (frames_per_cycle + 1/frames_per_cycle) / (frames_per_cycle + 1/frames_per_cycle)
-                if i % frames_per_cycle / frames_per_cycle < 0.5:
-                    current_point = Point(
-                        (line.p2.x - line.p1.x) * percent + line.p1.x,
-                        (line.p2.y - line.p1.y) * percent + line.p1.y
-                    )
-                else:
-                    current_point = Point(
-                        (line.p2.x - line.p1.x) * (1-percent) + line.p1.x,
-                        (line.p2.y - line.p1.y) * (1-percent) + line.p1.y
-                    )
-                left.append(current_point.x)
-                right.append(current_point.y)
+            percent = i*2 % period / period
+            second_half = i % frames_per_cycle / frames_per_cycle >= 0.5
+            percent[second_half] = 1 - percent[second_half]
         else:
             raise ValueError(
                 f"Unknown line drawing mode: {mode}"
             )
-        self._store_left_right(left, right)
+        return (x2 - x1) * percent + x1, (y2 - y1) * percent + y1
 
-    def draw_lines(self, lines: Collection[Line, ...] | Collection[...],
-                   frequency: int | float, time: int | float, mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+    def draw_lines(self, lines: Collection[Line, ...] | Collection[...] | PointArray | np.ndarray,
+                   frequency: int | float, time: int | float, mode: Literal["square", "sawtooth", "triangle"] = "sawtooth",
+                   allocation: Literal["even", "length"] = "even"):
         """
         Draw multiple lines.
         :param lines: The lines in a collection. See the Line class for line representations.
+                      A PointArray or a NumPy array (with the shape (number of lines, 2, 2) or (number of lines, 4)) is
+                      taken as the endpoints of the lines, two points per line, without creating Line objects.
         :param frequency: The frequency of each line.
         :param time: The total time to draw every line one after the other.
         :param mode: The type of waves to draw the lines with (may not be perfect waves).
+        :param allocation: How to divide the time between the lines. "even" gives every line the same time,
+                           "length" divides the frames in proportion to the lengths of the lines, so every line is equally bright. Default is "even".
         :return: None
         """
+        if allocation == "length":
+            if isinstance(lines, PointArray | np.ndarray):
+                endpoints = PointArray(lines).array
+            else:
+                lines = [line if isinstance(line, Line) else Line(line) for line in lines]
+                endpoints = np.array([(line.p1.x, line.p1.y, line.p2.x, line.p2.y) for line in lines], float)
+            pieces = endpoints.reshape(-1, 4)
+            num_frames = int(self.audio.get_rate() * time / 1000)
+            key = ("lines", pieces.tobytes(), frequency, time, mode, "length")
+            left, right = self._cached_samples(key, self._allocated_samples, pieces, np.zeros(len(pieces), bool), {},
+                                               frequency, num_frames, mode)
+            self._store_left_right(left, right)
+            return
+        elif allocation != "even":
+            raise ValueError(
+                f"Unknown time allocation: {allocation}"
+            )
+        if isinstance(lines, PointArray | np.ndarray):
+            endpoints = PointArray(lines).array
+            if len(endpoints) % 2:
+                raise ValueError(
+                    f"Cannot draw lines from an odd number of endpoints ({len(endpoints)})"
+                )
+            key = ("lines", endpoints.tobytes(), frequency, time, mode)
+            left, right = self._cached_samples(key, self._endpoints_samples, endpoints, frequency, time, mode)
+            self._store_left_right(left, right)
+            return
         lines = list(lines)
         for i, line in enumerate(lines):
             if not isinstance(line, Line):
                 lines[i] = Line(line)
-        left, right = [], []
+        key = ("lines", tuple((line.p1.x, line.p1.y, line.p2.x, line.p2.y) for line in lines), frequency, time, mode)
+        left, right = self._cached_samples(key, self._lines_samples, lines, frequency, time, mode)
+        self._store_left_right(left, right)
+
+    def _lines_samples(self, lines: Collection[Line, ...], frequency: int | float, time: int | float,
+                       mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of multiple lines one after the other, for internal use.
+        :param lines: The lines as Line objects.
+        :param frequency: The frequency of each line.
+        :param time: The total time to draw every line one after the other.
+        :param mode: The type of waves to draw the lines with. See self.draw_line() for more.
+        :return: left, right as NumPy arrays.
+        """
         time_per_line = time / len(lines)
-        for line in lines:
-            self.draw_line(line, frequency, time_per_line, mode)
-            left.extend(self._last_left)
-            right.extend(self._last_right)
-        self._last_left = left
-        self._last_right = right
+        p1 = np.array([(line.p1.x, line.p1.y) for line in lines])
+        p2 = np.array([(line.p2.x, line.p2.y) for line in lines])
+        left, right = self._lines_frames(p1, p2, frequency, time_per_line, mode)
+        return left.ravel(), right.ravel()
+
+    def _endpoints_samples(self, endpoints: np.ndarray, frequency: int | float, time: int | float,
+                           mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of multiple lines one after the other from their endpoints, for internal use.
+        :param endpoints: The endpoints with the shape (2 * number of lines, 2), two rows for every line.
+        :param frequency: The frequency of each line.
+        :param time: The total time to draw every line one after the other.
+        :param mode: The type of waves to draw the lines with. See self.draw_line() for more.
+        :return: left, right as NumPy arrays.
+        """
+        left, right = self._lines_frames(endpoints[0::2], endpoints[1::2], frequency, time / (len(endpoints) // 2), mode)
+        return left.ravel(), right.ravel()
 
-    def draw_polygon(self, polygon: Polygon | Collection[Point, ...] | Collection[...],
-                     frequency: int | float, time: int | float, mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+    def _polygon_samples(self, points: np.ndarray, frequency: int | float, time: int | float,
+                         mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of a polygon (each side one after the other), for internal use.
+        :param points: The points of the polygon with the shape (number of points, 2).
+        :param frequency: The frequency of each side.
+        :param time: The total time to draw the polygon.
+        :param mode: The type of waves to draw the sides with. See self.draw_line() for more.
+        :return: left, right as NumPy arrays.
+        """
+        left, right = self._lines_frames(points, np.roll(points, -1, 0), frequency, time / len(points), mode)
+        return left.ravel(), right.ravel()
+
+    def draw_polygon(self, polygon: Polygon | Collection[Point, ...] | Collection[...] | PointArray,
+                     frequency: int | float, time: int | float, mode: Literal["square", "sawtooth", "triangle"] = "sawtooth",
+                     continuous: bool = False):
         """
         Draw a polygon.
-        :param polygon: The polygon. A Polygon object, a list of Point objects, or a list with point representations. See the Point class for more details.
-        :param frequency: The frequency of each line (side) of the polygon.
+        :param polygon: The polygon. A Polygon object, a PointArray, a list of Point objects, or a list with point representations. See the Point class for more details.
+        :param frequency: The frequency of each line (side) of the polygon. If continuous, the frequency of going around the whole polygon.
         :param time: The total time to draw the polygon (each side one after the other).
         :param mode: The type of waves to draw the lines (sides) with (may not be perfect waves).
+                     If continuous, "sawtooth" goes around the polygon, "triangle" goes around and back.
+        :param continuous: Whether to draw the polygon as one continuous path at a constant speed (see self.draw_polyline()),
+                           instead of drawing every side as a separate line. Default is False.
         :return: None
         """
-        if not isinstance(polygon, Polygon):
-            polygon = list(polygon)
-            for i, point in enumerate(polygon):
-                if not isinstance(point, Point):
-                    polygon[i] = Point(point)
-            polygon = Polygon(*polygon)
-        lines = polygon.get_lines()
-        self.draw_lines(lines, frequency, time, mode)
-        # No need to set _last_left and _last_right, since we only call self.draw_lines() once and that already sets it
+        points = polygon.points.array if isinstance(polygon, Polygon) else PointArray(polygon).array
+        if continuous:
+            key = ("polygon path", points.tobytes(), frequency, time, mode)
+            left, right = self._cached_samples(key, self._path_samples, points, frequency, time, mode, True)
+        else:
+            key = ("polygon", points.tobytes(), frequency, time, mode)
+            left, right = self._cached_samples(key, self._polygon_samples, points, frequency, time, mode)
+        self._store_left_right(left, right)
+
+    def draw_polyline(self, polyline: Polyline | Collection[Point, ...] | Collection[...] | PointArray,
+                      frequency: int | float, time: int | float, mode: Literal["sawtooth", "triangle"] = "sawtooth"):
+        """
+        Draw an open path (line strip) as one continuous path.
+        The beam moves along the path at a constant speed, so every part of it is equally bright, and the sides don't have separate waves.
+        :param polyline: The path. A Polyline object, a PointArray, a list of Point objects, or a list with point representations. See the Point class for more details.
+        :param frequency: The frequency of going along the whole path.
+        :param time: The time to draw the path, in milliseconds.
+        :param mode: "sawtooth" goes from the first point to the last point, then jumps back. "triangle" goes to the last point and back. Default is "sawtooth".
+        :return: None
+        """
+        if mode not in ("sawtooth", "triangle"):
+            raise ValueError(
+                f"Unknown path drawing mode: {mode}\n"
+                f"Path drawing modes: \"sawtooth\", \"triangle\""
+            )
+        points = polyline.points.array if isinstance(polyline, Polyline) else PointArray(polyline).array
+        key = ("polyline", points.tobytes(), frequency, time, mode)
+        left, right = self._cached_samples(key, self._path_samples, points, frequency, time, mode)
+        self._store_left_right(left, right)
+
+    def _path_samples(self, points: np.ndarray, frequency: int | float, time: int | float,
+                      mode: Literal["square", "sawtooth", "triangle"] = "sawtooth", closed: bool = False):
+        """
+        Create the frames of a continuous path, for internal use. See self._path_waves().
+        :param points: The points of the path with the shape (number of points, 2).
+        :param frequency: The frequency of going along the whole path.
+        :param time: The time to draw the path, in milliseconds.
+        :param mode: The type of the wave. See self.draw_polyline() for more.
+        :param closed: Whether the last point is connected to the first. Default is False.
+        :return: left, right as NumPy arrays.
+        """
+        num_frames = int(self.audio.get_rate() * time / 1000)
+        if num_frames == 0:
+            raise ValueError(
+                f"With the given values, the path cannot be drawn\n"
+                f"Consider increasing the time to draw or the sample rate"
+            )
+        return self._path_waves(points, frequency, num_frames, mode, closed)
+
+    def _path_waves(self, points: np.ndarray, frequency: int | float, num_frames: int,
+                    mode: Literal["square", "sawtooth", "triangle"] = "sawtooth", closed: bool = False):
+        """
+        Create the frames of a continuous path, parametrized by the distance along it (arc length), for internal use.
+        Every frame is the same distance further along the path, so the beam moves at a constant speed. It's one np.interp() for each channel.
+        :param points: The points of the path with the shape (number of points, 2).
+        :param frequency: The frequency of going along the whole path.
+        :param num_frames: The number of frames.
+        :param mode: "sawtooth" goes along the path and jumps back (no jump if closed), "triangle" goes along the path and back.
+                     "square" is the same as "sawtooth" here.
+        :param closed: Whether the last point is connected to the first. Default is False.
+        :return: left, right as NumPy arrays.
+        """
+        if mode not in ("square", "sawtooth", "triangle"):
+            raise ValueError(
+                f"Unknown line drawing mode: {mode}"
+            )
+        if not len(points):
+            raise ValueError(
+                f"Cannot draw a path without points\n"
+                f"Give at least one point"
+            )
+        if closed:
+            points = np.concatenate((points, points[:1]))
+        distances = np.concatenate(([0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))))
+        phase = np.arange(num_frames) * (frequency / self.audio.get_rate()) % 1
+        if mode == "triangle":
+            phase = 1 - np.abs(2*phase - 1)
+        if distances[-1] == 0:
+            return np.full(num_frames, points[0, 0]), np.full(num_frames, points[0, 1])
+        position = phase * distances[-1]
+        return np.interp(position, distances, points[:, 0]), np.interp(position, distances, points[:, 1])
 
     def draw_ellipse(self, ellipse: Ellipse | Collection[Point, int | float, int | float] | Collection[[int | float, int | float], int | float, int | float] | Collection[int | float, int | float, int | float, int | float],
                      frequency: int | float, time: int | float, distort_rotate: int | float = None):
@@ -218,6 +632,19 @@ class Canvas:
         :return: None
         """
         if not isinstance(ellipse, Ellipse): ellipse = Ellipse(ellipse)
+        key = ("ellipse", ellipse.centre.x, ellipse.centre.y, ellipse.width, ellipse.height, frequency, time, distort_rotate)
+        left, right = self._cached_samples(key, self._ellipse_samples, ellipse, frequency, time, distort_rotate)
+        self._store_left_right(left, right)
+
+    def _ellipse_samples(self, ellipse: Ellipse, frequency: int | float, time: int | float, distort_rotate: int | float = None):
+        """
+        Create the frames of an ellipse, for internal use.
+        :param ellipse: The ellipse as an Ellipse object.
+        :param frequency: The frequency of the sine and cosine waves.
+        :param time: The total time to draw the ellipse for.
+        :param distort_rotate: Rotate the sine wave of the left channel by some degrees. Default is 0, no rotation.
+        :return: left, right as NumPy arrays.
+        """
         tau = np.pi*2
         frames_per_cycle = self.audio.get_rate() / frequency
         frequency_list = np.arange(0, self.audio.get_rate() * (time / 1000) / frames_per_cycle * tau, tau/frames_per_cycle)  # TODO: Rethink how this works (it does maybe)
@@ -230,38 +657,268 @@ class Canvas:
         right = np.multiply(sine_list, ellipse.height/2)
         left = np.add(left, ellipse.centre.x)
         right = np.add(right, ellipse.centre.y)
-        self._store_left_right(left, right)
+        return left, right
 
-    def draw_object_collection(self, obj: ObjectCollection, frequency: int | float, time: int | float,
-                               line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+    def draw_object_collection(self, obj: ObjectCollection | CompiledObjectCollection, frequency: int | float, time: int | float,
+                               line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth", optimize_path: bool = False,
+                               allocation: Literal["even", "length"] = "even"):
         """
         Draw an ObjectCollection object.
-        :param obj: The ObjectCollection object.
+        A CompiledObjectCollection (see ObjectCollection.compile()) is drawn the same way, but the frames of its objects
+        are created in batches from its arrays, which is faster for large collections. It doesn't use the cache of the canvas.
+        :param obj: The ObjectCollection or CompiledObjectCollection object.
         :param frequency: The frequency passed to every object.
         :param time: The total time to draw everything in milliseconds.
         :param line_mode: The line drawing mode. See self.draw_line() for more.
+        :param optimize_path: Whether to draw the objects in an order that makes the beam jump less between them (see pathorder.optimize_path()).
+                              The order is cached for the collection. Only for an ObjectCollection (compile the optimized collection instead). Default is False.
+        :param allocation: How to divide the time between the objects. "even" divides it evenly between the objects of every collection,
+                           "length" divides the frames between every object (including the nested ones) in proportion to their lengths,
+                           so everything is equally bright. Points get one frame in the "length" allocation. Default is "even".
+        :return: None
+        """
+        if optimize_path:
+            if isinstance(obj, CompiledObjectCollection):
+                raise ValueError(
+                    f"Cannot optimize the path of a CompiledObjectCollection\n"
+                    f"Compile the result of pathorder.optimize_path() instead"
+                )
+            obj = pathorder.optimize_path(obj, line_mode)
+        if allocation == "length":
+            if not isinstance(obj, CompiledObjectCollection):
+                obj = obj.compile()
+            left, right = self._allocated_samples(*self._collection_pieces(obj), frequency,
+                                                  int(self.audio.get_rate() * time / 1000), line_mode)
+        elif allocation != "even":
+            raise ValueError(
+                f"Unknown time allocation: {allocation}"
+            )
+        elif isinstance(obj, CompiledObjectCollection):
+            left, right = self._compiled_collection_samples(obj, frequency, time, line_mode)
+        else:
+            left, right = self._object_collection_samples(obj, frequency, time, line_mode)
+        self._store_left_right(left, right)
+
+    def draw_frame(self, objects: ObjectCollection | CompiledObjectCollection | Collection, frequency: int | float,
+                   fps: int | float = None, samples: int = None,
+                   line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth", min_samples: int = 1):
+        """
+        Draw a whole frame with a fixed number of frames (samples), divided between the objects in proportion to their lengths.
+        So the frame rate stays the same and everything is equally bright, no matter how many objects there are.
+        With fps, the fraction of a frame that doesn't fit (e.g. 192000 / 144 = 1333.33...) is carried over to the next call,
+        so the frame rate doesn't drift.
+        :param objects: The objects. An ObjectCollection, a CompiledObjectCollection or a collection of objects (Point, PointArray, Line, Polygon, Polyline, Ellipse, ObjectCollection).
+        :param frequency: The frequency passed to every object.
+        :param fps: The frame rate to draw at. Either this or samples is needed.
+        :param samples: The number of frames to draw. Either this or fps is needed.
+        :param line_mode: The line drawing mode. See self.draw_line() for more.
+        :param min_samples: The minimum number of frames of every point, line, side of a polygon, polyline and ellipse. Default is 1.
         :return: None
         """
+        if (fps is None) == (samples is None):
+            raise ValueError(
+                f"Give either the frame rate (fps) or the number of samples of the frame"
+            )
+        if samples is None:
+            budget = self.audio.get_rate() / fps + self._frame_carry
+            samples = int(budget)
+            self._frame_carry = budget - samples
+        if not isinstance(objects, CompiledObjectCollection):
+            if not isinstance(objects, ObjectCollection):
+                objects = ObjectCollection(*objects)
+            objects = objects.compile()
+        left, right = self._allocated_samples(*self._collection_pieces(objects), frequency, samples, line_mode, min_samples)
+        self._store_left_right(left, right)
+
+    @staticmethod
+    def _collection_pieces(obj: CompiledObjectCollection):
+        """
+        Split a compiled collection into pieces that get their own number of frames: points, lines, sides of polygons, polylines and ellipses, for internal use.
+        :param obj: The CompiledObjectCollection.
+        :return: The pieces with the shape (number of pieces, 4), a boolean array that is True for ellipses,
+                 and a dict with the points of the polylines by the index of their pieces.
+                 The columns are x1, y1, x2, y2 for the others (x2, y2 is the same as x1, y1 for points, the ends for polylines),
+                 centre x, centre y, width, height for ellipses.
+        """
+        pieces, ellipse, paths = [], [], {}
+        for kind, index in obj.order.tolist():
+            if kind == obj.POINT:
+                pieces.append(np.tile(obj.points[index], 2)[None])
+            elif kind == obj.LINE:
+                pieces.append(obj.segments[index].reshape(1, 4))
+            elif kind == obj.POLYGON:
+                points = obj.polygon_points[obj.polygon_offsets[index]:obj.polygon_offsets[index + 1]]
+                pieces.append(np.hstack((points, np.roll(points, -1, 0))))
+            elif kind == obj.ELLIPSE:
+                pieces.append(obj.ellipses[index].reshape(1, 4))
+            elif kind == obj.POLYLINE:
+                points = obj.polyline_points[obj.polyline_offsets[index]:obj.polyline_offsets[index + 1]]
+                paths[len(ellipse)] = points
+                pieces.append(np.concatenate((points[0], points[-1]))[None])
+            ellipse.extend([kind == obj.ELLIPSE] * len(pieces[-1]))
+        return (np.concatenate(pieces) if pieces else np.zeros((0, 4))), np.array(ellipse, bool), paths
+
+    def _allocated_samples(self, pieces: np.ndarray, ellipse: np.ndarray, paths: dict, frequency: int | float, num_frames: int,
+                           line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth", min_samples: int = 1):
+        """
+        Create the frames of pieces (see self._collection_pieces()) with the frames divided in proportion to their lengths, for internal use.
+        The pieces with the same number of frames are created together.
+        :param pieces: The pieces with the shape (number of pieces, 4).
+        :param ellipse: A boolean array that is True for the ellipses.
+        :param paths: The points of the polylines by the index of their pieces.
+        :param frequency: The frequency passed to every piece.
+        :param num_frames: The number of frames of all the pieces together.
+        :param line_mode: The line drawing mode. See self.draw_line() for more.
+        :param min_samples: The minimum number of frames of every piece. Default is 1.
+        :return: left, right as NumPy arrays.
+        """
+        if not len(pieces):
+            return np.zeros(0), np.zeros(0)
+        lengths = np.hypot(pieces[:, 2] - pieces[:, 0], pieces[:, 3] - pieces[:, 1])
+        a, b = np.abs(pieces[ellipse, 2]) / 2, np.abs(pieces[ellipse, 3]) / 2
+        lengths[ellipse] = np.pi * (3 * (a + b) - np.sqrt((3*a + b) * (a + 3*b)))  # Ramanujan's approximation
+        path = np.zeros(len(pieces), bool)
+        for index, points in paths.items():
+            lengths[index] = np.hypot(*np.diff(points, axis=0).T).sum()
+            path[index] = True
+        counts = _allocate_frames(lengths, num_frames, min_samples)
+        offsets = np.cumsum(counts) - counts
+        samples = np.empty((2, num_frames))
+        for index, points in paths.items():
+            samples[:, offsets[index]:offsets[index] + counts[index]] = self._path_waves(points, frequency, counts[index], line_mode)
+        tau = np.pi*2
+        for count in np.unique(counts).tolist():
+            if count == 0:
+                continue
+            positions = np.arange(count)
+            lines = (counts == count) & ~ellipse & ~path
+            if lines.any():
+                left, right = self._lines_waves(pieces[lines, :2], pieces[lines, 2:], frequency, count, line_mode)
+                columns = offsets[lines][:, None] + positions
+                samples[0, columns], samples[1, columns] = left, right
+            ellipses = (counts == count) & ellipse
+            if ellipses.any():
+                angles = positions * (tau * frequency / self.audio.get_rate())
+                columns = offsets[ellipses][:, None] + positions
+                samples[0, columns] = np.multiply.outer(pieces[ellipses, 2] / 2, np.cos(angles)) + pieces[ellipses, :1]
+                samples[1, columns] = np.multiply.outer(pieces[ellipses, 3] / 2, np.sin(angles)) + pieces[ellipses, 1:2]
+        return samples[0], samples[1]
+
+    def _compiled_collection_samples(self, obj: CompiledObjectCollection, frequency: int | float, time: int | float,
+                                     line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of a CompiledObjectCollection object, for internal use.
+        The objects of the same kind with the same time of drawing are created together, then put in order into one buffer.
+        :param obj: The CompiledObjectCollection object.
+        :param frequency: The frequency passed to every object.
+        :param time: The total time to draw everything in milliseconds.
+        :param line_mode: The line drawing mode. See self.draw_line() for more.
+        :return: left, right as NumPy arrays.
+        """
+        times = []
+        for divisors in obj.time_divisors:
+            object_time = time
+            for divisor in divisors:
+                object_time = object_time / divisor  # Divided one by one, like in self._object_collection_samples()
+            times.append(object_time)
+        groups = {}
+        for i, (kind, index) in enumerate(obj.order.tolist()):
+            groups.setdefault((kind, times[i]), []).append((i, index))
+        frames = [None] * len(obj.order)
+        for (kind, object_time), members in groups.items():
+            objects, indices = zip(*members)
+            indices = list(indices)
+            if kind == obj.POINT:
+                num_frames = 1 + int(self.audio.get_rate()*(object_time/1000))
+                for i, (x, y) in zip(objects, obj.points[indices]):
+                    frames[i] = (np.full(num_frames, x), np.full(num_frames, y))
+            elif kind == obj.LINE:
+                segments = obj.segments[indices]
+                left, right = self._lines_frames(segments[:, 0], segments[:, 1], frequency, object_time, line_mode)
+                for row, i in enumerate(objects):
+                    frames[i] = (left[row], right[row])
+            elif kind == obj.POLYGON:
+                for i, index in members:
+                    points = obj.polygon_points[obj.polygon_offsets[index]:obj.polygon_offsets[index + 1]]
+                    frames[i] = self._polygon_samples(points, frequency, object_time, line_mode)
+            elif kind == obj.ELLIPSE:
+                ellipses = obj.ellipses[indices]
+                unit_left, unit_right = self._ellipse_samples(Ellipse(Point(0, 0), 2, 2), frequency, object_time)
+                left = np.multiply.outer(ellipses[:, 2] / 2, unit_left) + ellipses[:, :1]
+                right = np.multiply.outer(ellipses[:, 3] / 2, unit_right) + ellipses[:, 1:2]
+                for row, i in enumerate(objects):
+                    frames[i] = (left[row], right[row])
+            elif kind == obj.POLYLINE:
+                for i, index in members:
+                    points = obj.polyline_points[obj.polyline_offsets[index]:obj.polyline_offsets[index + 1]]
+                    frames[i] = self._path_samples(points, frequency, object_time, line_mode)
+        lengths = [len(left) for left, _ in frames]
+        samples = np.empty((2, sum(lengths)))
+        position = 0
+        for (left, right), length in zip(frames, lengths):
+            samples[0, position:position + length] = left
+            samples[1, position:position + length] = right
+            position += length
+        return samples[0], samples[1]
+
+    def _object_collection_samples(self, obj: ObjectCollection, frequency: int | float, time: int | float,
+                                   line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of an ObjectCollection object, for internal use.
+        The objects use the cache of the canvas, the same way as if they were drawn one by one.
+        :param obj: The ObjectCollection object.
+        :param frequency: The frequency passed to every object.
+        :param time: The total time to draw everything in milliseconds.
+        :param line_mode: The line drawing mode. See self.draw_line() for more.
+        :return: left, right as NumPy arrays.
+        """
         time_per_object = time / len(obj.modified_objects)
-        left, right = [], []
+        samples = []
         for object in obj.modified_objects:
-            if isinstance(object, Point):
-                self.draw_point(object)
-                self.repeat(self.audio.get_rate()*(time_per_object/1000))
-            elif isinstance(object, Line):
-                self.draw_line(object, frequency, time_per_object, line_mode)
-            elif isinstance(object, Polygon):
-                self.draw_polygon(object, frequency, time, line_mode)
-            elif isinstance(object, Ellipse):
-                self.draw_ellipse(object, frequency, time_per_object)
-            elif isinstance(object, ObjectCollection):
-                self.draw_object_collection(object, frequency, time_per_object, line_mode)
-            left.extend(self._last_left)
-            right.extend(self._last_right)
-        self._last_left, self._last_right = left, right
+            samples.append(self._object_samples(object, frequency, time_per_object, line_mode))
+        samples = [sample for sample in samples if sample is not None]
+        return np.concatenate([left for left, _ in samples]), np.concatenate([right for _, right in samples])
+
+    def _object_samples(self, object, frequency: int | float, time: int | float,
+                        line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Create the frames of any object the same way as in an ObjectCollection, for internal use.
+        The objects use the cache of the canvas, the same way as if they were drawn one by one.
+        :param object: A Point, PointArray, Line, Polygon, Polyline, Ellipse, ObjectCollection or CompiledObjectCollection object.
+        :param frequency: The frequency passed to the object.
+        :param time: The time to draw the object in milliseconds.
+        :param line_mode: The line drawing mode. See self.draw_line() for more.
+        :return: left, right as NumPy arrays. None if the object is not supported.
+        """
+        if isinstance(object, Point):
+            num_frames = 1 + int(self.audio.get_rate()*(time/1000))
+            return np.full(num_frames, object.x), np.full(num_frames, object.y)
+        elif isinstance(object, PointArray):
+            num_frames = 1 + int(self.audio.get_rate()*(time/len(object)/1000))
+            return np.repeat(object.x, num_frames), np.repeat(object.y, num_frames)
+        elif isinstance(object, Line):
+            key = ("line", object.p1.x, object.p1.y, object.p2.x, object.p2.y, frequency, time, line_mode)
+            return self._cached_samples(key, self._line_samples, object, frequency, time, line_mode)
+        elif isinstance(object, Polygon):
+            points = object.points.array
+            key = ("polygon", points.tobytes(), frequency, time, line_mode)
+            return self._cached_samples(key, self._polygon_samples, points, frequency, time, line_mode)
+        elif isinstance(object, Polyline):
+            points = object.points.array
+            key = ("polyline", points.tobytes(), frequency, time, line_mode)
+            return self._cached_samples(key, self._path_samples, points, frequency, time, line_mode)
+        elif isinstance(object, Ellipse):
+            key = ("ellipse", object.centre.x, object.centre.y, object.width, object.height, frequency, time, None)
+            return self._cached_samples(key, self._ellipse_samples, object, frequency, time)
+        elif isinstance(object, ObjectCollection):
+            return self._object_collection_samples(object, frequency, time, line_mode)
+        elif isinstance(object, CompiledObjectCollection):
+            return self._compiled_collection_samples(object, frequency, time, line_mode)
+        return None
 
     def draw_font(self, text: str, x: int | float, y: int | float, frequency: int | float, time: int | float, line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth",
-                  character_width=5000, character_height=5000, character_spacing=0, line_spacing=2500, font: Font = None):
+                  character_width=5000, character_height=5000, character_spacing=0, line_spacing=2500, font: Font = None,
+                  optimize_path: bool = False):
         """
         Draws a text with a font (specialized for this purpose).
         :param text: The string to draw.
@@ -275,13 +932,15 @@ class Canvas:
         :param character_spacing: The spacing of the characters, default is 0.
         :param line_spacing: The spacing of the lines, default is 2500.
         :param font: Defines a custom, specialized-to-be-used-in-this-function font. Default is None, a built-in font is used.
+        :param optimize_path: Whether to draw the strokes of every character in an order that makes the beam jump less between them
+                              (see pathorder.optimize_path()). Default is False.
         :return: None
         """
-        if font is None: font = default_font
+        if font is None: font = get_default_font()
         text = normalize("NFD", text)
         start_x = x
         x, y = x, y
-        left, right = [], []
+        mark = self._storage.mark()
         for char in text:
             if char == "\n":
                 y -= character_height + line_spacing
@@ -289,14 +948,51 @@ class Canvas:
             elif char == "\t":
                 x += 2 * (character_width + character_spacing)
             else:
-                obj = font._get_character(char, x, y, character_width, character_height)
-                if obj:
-                    self.draw_object_collection(obj, frequency, time, line_mode)
-                    left.extend(self._last_left)
-                    right.extend(self._last_right)
+                samples = self._glyph_samples(font, char, frequency, time, line_mode, optimize_path)
+                if samples:
+                    left, right = samples
+                    self._store_left_right(left * (character_width/1000) + x, right * (character_height/1000) + y)
                 x += character_width + character_spacing
-        self._last_left = left
-        self._last_right = right
+        self._storage.set_last(mark)
+
+    def _glyph_samples(self, font: Font, char: str, frequency: int | float, time: int | float,
+                       line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth", optimize_path: bool = False):
+        """
+        Get the frames of a character at the size of the font (1000 x 1000, top left corner at the origin) from the glyph cache of the font.
+        If they are not cached yet, they are created and cached. Scaling and shifting the frames gives the same result as drawing the scaled and shifted character.
+        :param font: The font.
+        :param char: The character. Not parsed in this function.
+        :param frequency: The frequency of every drawn object.
+        :param time: The time to draw the character in milliseconds.
+        :param line_mode: The line drawing mode. See self.draw_line() for more.
+        :param optimize_path: Whether to reorder the strokes of the character, see pathorder.optimize_path(). Default is False.
+        :return: left, right as read-only NumPy arrays. None if character is not found.
+        """
+        if char not in font.font:
+            return None
+        key = (char, frequency, time, line_mode, self.audio.get_rate())
+        if optimize_path:
+            key += ("optimized",)
+        if font.glyph_cache.disk is not None:
+            key += (font._glyph_hash(char),)
+        samples = font.glyph_cache.get(key)
+        if samples is None:
+            glyph = pathorder.optimize_path(font.font[char], line_mode) if optimize_path else font.font[char]
+            samples = font.glyph_cache.put(key, *self._object_collection_samples(glyph, frequency, time, line_mode))
+        return samples
+
+    def _change_matrix(self, matrix: np.ndarray, last: bool):
+        """
+        Transform all the frames or only the last action's frames in place, for internal use.
+        :param matrix: The 3x3 affine matrix.
+        :param last: Whether to change only the last action's frames or to change all the frames stored so far.
+        :return: None
+        """
+        self.flush_transforms()
+        start = self._storage.last_mark() if last else 0
+        self._apply_matrix(matrix, start, self._storage.mark())
+        if not last:
+            self._storage.set_last(0)
 
     def change_shift(self, x, y, last: bool = True):
         """
@@ -306,15 +1002,12 @@ class Canvas:
         :param last: Whether to change only the last action's frames or to change all the frames stored so far. Default is True (so first option).
         :return: None
         """
-        left, right = self._handle_supports_last(last)
-        left = np.add(left, x)
-        right = np.add(right, y)
-        self._store_left_right(left, right)
+        self._change_matrix(_shift_matrix(x, y), last)
 
     def change_rotate(self, angle: int | float, centre: Point | Collection[int | float, int | float] = None,
                       last: bool = True):
         """
-        Rotate all the frames or only the last action's frames.
+        Rotate all the frames or only the last action's frames clockwise.
         :param angle: The angle to rotate by in degrees.
         :param centre: The centre of rotation as a Point object or other point representations, see the Point class for more details.
         :param last: Whether to change only the last action's frames or to change all the frames stored so far. Default is True (so first option).
@@ -322,17 +1015,7 @@ class Canvas:
         """
         if centre is None: centre = Point(0, 0)
         elif not isinstance(centre, Point): centre = Point(centre)
-        angle = degrees_to_radians(angle)
-
-        left, right = self._handle_supports_last(last)
-        left = list(np.subtract(left, centre.x))
-        right = list(np.subtract(right, centre.y))
-        for i in range(len(left)):
-            left[i], right[i] = np.dot([left[i], right[i]],
-                          [[math.cos(angle), -math.sin(angle)], [math.sin(angle), math.cos(angle)]])
-        left = np.add(left, centre.x)
-        right = np.add(right, centre.y)
-        self._store_left_right(left, right)
+        self._change_matrix(_rotation_matrix(angle, centre), last)
 
     def change_scale(self, x: int | float, y: int | float,
                      centre: Point | Collection[int | float, int | float] = None, last: bool = True):
@@ -346,15 +1029,7 @@ class Canvas:
         """
         if centre is None: centre = Point(0, 0)
         elif not isinstance(centre, Point): centre = Point(centre)
-
-        left, right = self._handle_supports_last(last)
-        left = np.subtract(left, centre.x)
-        right = np.subtract(right, centre.y)
-        left = np.multiply(left, x)
-        right = np.multiply(right, y)
-        left = np.add(left, centre.x)
-        right = np.add(right, centre.y)
-        self._store_left_right(left, right)
+        self._change_matrix(_scale_matrix(x, y, centre), last)
 
     def change_clip(self, clip_left: int | float = math.inf, clip_right: int | float = math.inf,
                     clip_top: int | float = math.inf, clip_bottom: int | float = math.inf, last: bool = True):
@@ -367,10 +1042,12 @@ class Canvas:
         :param last: Whether to change only the last action's frames or to change all the frames stored so far. Default is True (so first option).
         :return: None
         """
-        left, right = self._handle_supports_last(last)
-        left = np.clip(left, clip_left, clip_right)
-        right = np.clip(right, clip_bottom, clip_top)
-        self._store_left_right(left, right)
+        self.flush_transforms()
+        start, end = self._storage.last_mark() if last else 0, self._storage.mark()
+        frames = self._storage.get_frames(start, end)
+        self._storage.set_frames(start, end, (np.clip(frames[0], clip_left, clip_right), np.clip(frames[1], clip_bottom, clip_top)))
+        if not last:
+            self._storage.set_last(0)
 
     def change_cut_out_of_limits(self, limit_left: int | float = math.inf, limit_right: int | float = math.inf,
                                  limit_top: int | float = math.inf, limit_bottom: int | float = math.inf, last: bool = True):
@@ -383,58 +1060,72 @@ class Canvas:
         :param last: Whether to change only the last action's frames or to change all the frames stored so far. Default is True (so first option).
         :return: None
         """
-        left, right = self._handle_supports_last(last)
-        i = 0
-        while i < len(left):
-            if (left[i] < limit_left or limit_right < left[i]) or (right[i] < limit_bottom or limit_top < right[i]):
-                left.pop(i)
-                right.pop(i)
-            else:
-                i += 1
-        self._store_left_right(left, right)
+        self.flush_transforms()
+        start = self._storage.last_mark() if last else 0
+        left, right = self._storage.get_frames(start, self._storage.mark())
+        out_of_limits = (left < limit_left) | (limit_right < left) | (right < limit_bottom) | (limit_top < right)
+        self._storage.compress(start, ~out_of_limits)
 
     def change_cut_to_length(self, max_draw_time, beginning: bool = True):
         """
         Cut off from the total frames that will be drawn, so it could be drawn under some set time.
+        Afterwards, the last action's frames are only the part of them that was kept (none if they were all cut off).
         :param max_draw_time: The maximum allowed time to draw in milliseconds.
         :param beginning: Whether to cut from the beginning or the end. Default is True (so beginning).
         :return: None
         """
-        left, right = self.left.copy(), self.right.copy()
-        self.left.clear()
-        self.right.clear()
+        self.flush_transforms()
         max_frame_num = int(max_draw_time / 1000 * self.audio.get_rate())
-        if len(left) > max_frame_num:
-            if beginning:
-                left_cut = left[:max_frame_num - 1]
-                right_cut = right[:max_frame_num - 1]
-                left = left[-max_frame_num:]
-                right = right[-max_frame_num:]
-            else:
-                left_cut = left[-max_frame_num + 1:]
-                right_cut = right[-max_frame_num + 1:]
-                left = left[:max_frame_num]
-                right = right[:max_frame_num]
-            self._store_left_right(left, right)
-            self._last_left, self._last_right = left_cut, right_cut
+        self._storage.truncate(max_frame_num, beginning)
 
-    def write(self, clear=True):
+    @property
+    def player(self):
+        """
+        The player.Player of the canvas that self.play_file() uses, writing to the same backend. Created when it's first used.
+        """
+        if self._player is None:
+            self._player = Player(self.audio)
+        return self._player
+
+    def play_file(self, file: str | Clip, loop: bool = False, duration: int | float = None, start: int | float = 0,
+                  crossfade: int | float = 0):
+        """
+        Play pre-rendered frames from a wav file or an int16 .npy file, without loading the file into memory (see the player module).
+        Blocks until the file ends, or for the duration. The frames stored in the canvas are not written.
+        If a looping file is still being played (because of the duration), the new file can be crossfaded into it.
+        :param file: The path to the file, or a player.Clip.
+        :param loop: Whether to start again at the end of the file. Then the duration should be given. Default is False.
+        :param duration: The time to play for in seconds. Default is None, until the file ends.
+        :param start: Where to start in the file in seconds. Default is 0.
+        :param crossfade: The length of the crossfade from the file being played in milliseconds. Default is 0, no crossfade.
+        :return: The player.Clip, to play it again without opening the file again.
+        """
+        clip = self.player.play(file, loop, start, crossfade)
+        self.player.run(duration)
+        return clip
+
+    def write(self, clear=True, return_frames=True):
         """
         Write the frames stored to the stream.
+        The channels are combed into a reusable int16 buffer, which is given to the stream without any more conversions.
         :param clear: Whether to remove the stored frames. Default is True.
-        :return: The written frames.
+        :param return_frames: Whether to return the written frames. Default is True.
+        :return: The written frames as an int16 NumPy array, which is a view of the reusable buffer, so it is only valid until the next write.
+                 None if return_frames is False.
         """
-        frames = self._comb_left_right(self.left, self.right)
+        self.flush_transforms()
+        left, right = self._storage.left, self._storage.right
+        frames = self._comb_left_right(left, right, self._get_frame_buffer(len(left) * 2))
         self.audio.write(frames)
         if clear:
-            self.left.clear()
-            self.right.clear()
-        return frames
+            self._storage.clear()
+        if return_frames:
+            return frames
 
     def clear(self):
         """
         Clear the frames stored without writing.
         :return: None
         """
-        self.left.clear()
-        self.right.clear()
+        self._pending_transforms.clear()
+        self._storage.clear()
@@ -1,6 +1,9 @@
 from math import *
+from typing import Literal
 import numpy as np
 from .draw import Canvas
+from .cache import WaveformCache
+from .backends import Backend
 
 
 class ExtraCanvas(Canvas):
@@ -14,11 +17,24 @@ class ExtraCanvas(Canvas):
     :param audio_device_index: The output device's index. See audio.get_all_device_info().
     :param rate: The sample rate of the stream. Default is 192000.
     :param record: Whether to temporarily store the frames, so they can be saved to a file later.
+                   It can also be a path to a wav file. See Canvas for more details.
+    :param storage: How to store the frames, "list" or "array". See Canvas for more details.
+    :param dtype: The data type of the "array" storage. See Canvas for more details.
+    :param capacity: The number of frames preallocated for the "array" storage. See Canvas for more details.
+    :param cache: A cache.WaveformCache for the frames of lines, polygons and ellipses. See Canvas for more details.
+    :param output_mode: "blocking" or "callback". See Canvas for more details.
+    :param queue_depth: The queue depth of the "callback" output mode. See Canvas for more details.
+    :param latency: The length of the stream's buffer in milliseconds. See Canvas for more details.
+    :param backend: Where to write the frames instead of an audio device. See Canvas for more details.
     :var audio: An instance of _audio._AudioBackend for simple audio outputting.
     :var frames: The frames to be written to the audio output.
     """
-    def __init__(self, audio_device_index: int, rate: int = 192000, record: bool = False):
-        super().__init__(audio_device_index, rate, record)
+    def __init__(self, audio_device_index: int = None, rate: int = 192000, record: bool | str = False,
+                 storage: Literal["list", "array"] = "list", dtype=np.float64, capacity: int = None,
+                 cache: WaveformCache = None, output_mode: Literal["blocking", "callback"] = "blocking",
+                 queue_depth: int = 4, latency: int | float = None, backend: Backend = None):
+        super().__init__(audio_device_index, rate, record, storage, dtype, capacity, cache,
+                         output_mode, queue_depth, latency, backend)
 
     def draw_butterfly(self, shift_x: int | float, shift_y: int | float,
                        scale_x: int | float = 2500, scale_y: int | float = 2500,
@@ -118,12 +134,25 @@ class _DevCanvas(Canvas):
     :param audio_device_index: The output device's index. See audio.get_all_device_info().
     :param rate: The sample rate of the stream. Default is 192000.
     :param record: Whether to temporarily store the frames, so they can be saved to a file later.
+                   It can also be a path to a wav file. See Canvas for more details.
+    :param storage: How to store the frames, "list" or "array". See Canvas for more details.
+    :param dtype: The data type of the "array" storage. See Canvas for more details.
+    :param capacity: The number of frames preallocated for the "array" storage. See Canvas for more details.
+    :param cache: A cache.WaveformCache for the frames of lines, polygons and ellipses. See Canvas for more details.
+    :param output_mode: "blocking" or "callback". See Canvas for more details.
+    :param queue_depth: The queue depth of the "callback" output mode. See Canvas for more details.
+    :param latency: The length of the stream's buffer in milliseconds. See Canvas for more details.
+    :param backend: Where to write the frames instead of an audio device. See Canvas for more details.
     :var audio: An instance of _audio._AudioBackend for simple audio outputting.
     :var frames: The frames to be written to the audio output.
     """
 
-    def __init__(self, audio_device_index: int, rate: int = 192000, record: bool = False):
-        super().__init__(audio_device_index, rate, record)
+    def __init__(self, audio_device_index: int = None, rate: int = 192000, record: bool | str = False,
+                 storage: Literal["list", "array"] = "list", dtype=np.float64, capacity: int = None,
+                 cache: WaveformCache = None, output_mode: Literal["blocking", "callback"] = "blocking",
+                 queue_depth: int = 4, latency: int | float = None, backend: Backend = None):
+        super().__init__(audio_device_index, rate, record, storage, dtype, capacity, cache,
+                         output_mode, queue_depth, latency, backend)
 
     def draw_spiral(self):
         """
@@ -4,6 +4,8 @@ A Font class and a built-in default font for usage in Canvas.draw_font().
 from collections.abc import Mapping
 import copy
 from .objects import Point, Line, Polygon, Ellipse, ObjectCollection
+from .cache import WaveformCache
+from .diskcache import content_hash
 
 
 class Font:
@@ -16,10 +18,38 @@ class Font:
     If an unknown character is encountered, it is skipped.
 
     *The line spacing is only controlled in code.
+
+    Canvas.draw_font() caches the frames of every drawn character at the size of the font in self.glyph_cache, and only scales and shifts them afterwards.
+    If a character of the font is changed, call self.clear_cache().
+    With a diskcache.DiskCache, the frames of the characters are also kept on the disk, so they are only created once even between runs of the program.
+    The keys on the disk include a hash of the character's objects, so a changed character is never loaded from the disk.
     :param font: The font in a dict. Read the above description for more info.
+    :param glyph_cache_bytes: The maximum size of the glyph cache in bytes. Default is 16 MiB.
+    :param disk_cache: A diskcache.DiskCache for the frames of the characters. Default is None, not used.
+    :var glyph_cache: A cache.WaveformCache with the frames of the characters.
     """
-    def __init__(self, font: Mapping[str, ObjectCollection]):
+    def __init__(self, font: Mapping[str, ObjectCollection], glyph_cache_bytes: int = 16 * 2**20, disk_cache=None):
         self.font = font
+        self.glyph_cache = WaveformCache(glyph_cache_bytes, disk_cache)
+        self._hashes = {}
+
+    def clear_cache(self):
+        """
+        Remove the cached frames of every character (only from memory, the frames on the disk are kept for the unchanged characters).
+        :return: None
+        """
+        self.glyph_cache.clear()
+        self._hashes.clear()
+
+    def _glyph_hash(self, char: str):
+        """
+        Get the hash of a character's objects (see diskcache.content_hash()), for internal use. It's kept until self.clear_cache().
+        :param char: The character.
+        :return: The hash as a hexadecimal string.
+        """
+        if char not in self._hashes:
+            self._hashes[char] = content_hash(self.font[char].compile())
+        return self._hashes[char]
 
     def _get_character(self, char: str, x: int | float, y: int | float, width: int | float = 1000, height: int | float = 1000):
         """
@@ -46,47 +76,74 @@ class Font:
         text += "}"
         return text
 
-default_font = Font({
-    "A": ObjectCollection(Line((0, -1000, 400, 0)), Line((400, 0, 800, -1000)), Line((200, -500, 600, -500))),
-    "B": ObjectCollection(Polygon((0, -500), (0, 0), (700, 0), (800, -250), (700, -500), (0, -500), (0, -1000), (700, -1000), (800, -750), (700, -500))),
-    "C": ObjectCollection(Line((800, -250, 400, 0)), Line((400, 0, 0, -250)), Line((0, -250, 0, -750)), Line((0, -750, 400, -1000)), Line((400, -1000, 800, -750))),
-    "D": ObjectCollection(Polygon((0, 0), (0, -1000), (700, -1000), (800, -750), (800, -250), (700, 0))),
-    "E": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, 0, 800, 0)), Line((0, -500, 600, -500)), Line((0, -1000, 800, -1000))),
-    "F": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, 0, 800, 0)), Line((0, -500, 600, -500))),
-    "G": ObjectCollection(Line((800, -250, 400, 0)), Line((400, 0, 0, -250)), Line((0, -250, 0, -750)), Line((0, -750, 400, -1000)), Line((400, -1000, 800, -750)), Line((800, -750, 400, -750))),
-    "H": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, -500, 800, -500)), Line((800, 0, 800, -1000))),
-    "I": ObjectCollection(Line((400, 0, 400, -1000))),
-    "J": ObjectCollection(Line((400, 0, 400, -800)), Line((400, -800, 200, -1000)), Line((200, -1000, 0, -800))),
-    "K": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, -500, 800, 0)), Line((0, -500, 800, -1000))),
-    "L": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, -1000, 800, -1000))),
-    "M": ObjectCollection(Line((0, -1000, 0, 0)), Line((0, 0, 400, -400)), Line((400, -400, 800, 0)), Line((800, 0, 800, -1000))),
-    "N": ObjectCollection(Line((0, -1000, 0, 0)), Line((0, 0, 800, -1000)), Line((800, -1000, 800, 0))),
-    "O": ObjectCollection(Ellipse((400, -500, 800, 1000))),
-    "P": ObjectCollection(Line((0, 0, 0, -1000)), Ellipse((400, -250, 800, 500))),
-    "Q": ObjectCollection(Ellipse((400, -500, 800, 1000)), Line((600, -600, 800, -1000))),
-    "R": ObjectCollection(Line((0, 0, 0, -1000)), Ellipse((400, -250, 800, 500)), Line((400, -500, 800, -1000))),
-    "S": ObjectCollection(Line((800, -250, 400, 0)), Line((400, 0, 0, -250)), Line((0, -250, 800, -750)), Line((800, -750, 400, -1000)), Line((400, -1000, 0, -750))),
-    "T": ObjectCollection(Line((0, 0, 800, 0)), Line((400, 0, 400, -1000))),
-    "U": ObjectCollection(Line((0, 0, 0, -800)), Line((0, -800, 400, -1000)), Line((400, -1000, 800, -800)), Line((800, -800, 800, 0))),
-    "V": ObjectCollection(Line((0, 0, 400, -1000)), Line((400, -1000, 800, 0))),
-    "W": ObjectCollection(Line((0, 0, 200, -1000)), Line((200, -1000, 400, -200)), Line((400, -200, 600, -1000)), Line((600, -1000, 800, 0))),
-    "X": ObjectCollection(Line((0, 0, 800, -1000)), Line((0, -1000, 800, 0))),
-    "Y": ObjectCollection(Line((0, 0, 400, -500)), Line((400, -500, 800, 0)), Line((400, -500, 400, -1000))),
-    "Z": ObjectCollection(Line((0, 0, 800, 0)), Line((800, 0, 0, -1000)), Line((0, -1000, 800, -1000))),
-    "1": ObjectCollection(Line((0, -500, 400, 0)), Line((400, 0, 400, -1000))),
-    "2": ObjectCollection(Line((0, -400, 400, 0)), Line((400, 0, 800, -400)), Line((800, -400, 0, -1000)), Line((0, -1000, 800, -1000))),
-    "3": ObjectCollection(Line((0, 0, 800, 0)), Line((800, 0, 400, -500)), Line((400, -500, 800, -400)), Line((800, -400, 800, -800)), Line((800, -800, 400, -1000)), Line((400, -1000, 0, -800))),
-    "4": ObjectCollection(Line((400, 0, 0, -750)), Line((0, -750, 800, -750)), Line((400, -500, 400, -1000))),
-    "5": ObjectCollection(Line((800, 0, 0, 0)), Line((0, 0, 0, -500)), Line((0, -500, 700, -500)), Line((700, -500, 800, -750)), Line((800, -750, 700, -1000)), Line((700, -1000, 0, -1000))),
-    "6": ObjectCollection(Line((400, 0, 0, -750)), Ellipse((400, -750, 800, 500))),
-    "7": ObjectCollection(Line((0, 0, 800, 0)), Line((800, 0, 0, -1000))),
-    "8": ObjectCollection(Ellipse((400, -250, 700, 500)), Ellipse((400, -750, 800, 500))),
-    "9": ObjectCollection(Ellipse((400, -250, 800, 500)), Line((800, -250, 400, -1000))),
-    "0": ObjectCollection(Ellipse((400, -500, 700, 1000)), Line((100, -850, 700, -150))),
-    ".": ObjectCollection(Ellipse((50, -950, 100, 100))),
-    ":": ObjectCollection(Ellipse((50, -950, 100, 100)), Ellipse((50, -450, 100, 100))),
-    ",": ObjectCollection(Line((100, -800, -100, -1100))),
-    "!": ObjectCollection(Line((50, 0, 50, -800)), Ellipse((50, -950, 100, 100))),
-    "?": ObjectCollection(Line((0, -250, 300, 0)), Line((300, 0, 600, -250)), Line((600, -250, 300, -500)), Line((300, -500, 300, -800)), Ellipse((300, -950, 100, 100)))
-})
-"""The default font in this package."""
+def _create_default_font():
+    """
+    Create the default font in this package. Use get_default_font() (or default_font) instead.
+    :return: The default font.
+    """
+    return Font({
+        "A": ObjectCollection(Line((0, -1000, 400, 0)), Line((400, 0, 800, -1000)), Line((200, -500, 600, -500))),
+        "B": ObjectCollection(Polygon((0, -500), (0, 0), (700, 0), (800, -250), (700, -500), (0, -500), (0, -1000), (700, -1000), (800, -750), (700, -500))),
+        "C": ObjectCollection(Line((800, -250, 400, 0)), Line((400, 0, 0, -250)), Line((0, -250, 0, -750)), Line((0, -750, 400, -1000)), Line((400, -1000, 800, -750))),
+        "D": ObjectCollection(Polygon((0, 0), (0, -1000), (700, -1000), (800, -750), (800, -250), (700, 0))),
+        "E": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, 0, 800, 0)), Line((0, -500, 600, -500)), Line((0, -1000, 800, -1000))),
+        "F": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, 0, 800, 0)), Line((0, -500, 600, -500))),
+        "G": ObjectCollection(Line((800, -250, 400, 0)), Line((400, 0, 0, -250)), Line((0, -250, 0, -750)), Line((0, -750, 400, -1000)), Line((400, -1000, 800, -750)), Line((800, -750, 400, -750))),
+        "H": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, -500, 800, -500)), Line((800, 0, 800, -1000))),
+        "I": ObjectCollection(Line((400, 0, 400, -1000))),
+        "J": ObjectCollection(Line((400, 0, 400, -800)), Line((400, -800, 200, -1000)), Line((200, -1000, 0, -800))),
+        "K": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, -500, 800, 0)), Line((0, -500, 800, -1000))),
+        "L": ObjectCollection(Line((0, 0, 0, -1000)), Line((0, -1000, 800, -1000))),
+        "M": ObjectCollection(Line((0, -1000, 0, 0)), Line((0, 0, 400, -400)), Line((400, -400, 800, 0)), Line((800, 0, 800, -1000))),
+        "N": ObjectCollection(Line((0, -1000, 0, 0)), Line((0, 0, 800, -1000)), Line((800, -1000, 800, 0))),
+        "O": ObjectCollection(Ellipse((400, -500, 800, 1000))),
+        "P": ObjectCollection(Line((0, 0, 0, -1000)), Ellipse((400, -250, 800, 500))),
+        "Q": ObjectCollection(Ellipse((400, -500, 800, 1000)), Line((600, -600, 800, -1000))),
+        "R": ObjectCollection(Line((0, 0, 0, -1000)), Ellipse((400, -250, 800, 500)), Line((400, -500, 800, -1000))),
+        "S": ObjectCollection(Line((800, -250, 400, 0)), Line((400, 0, 0, -250)), Line((0, -250, 800, -750)), Line((800, -750, 400, -1000)), Line((400, -1000, 0, -750))),
+        "T": ObjectCollection(Line((0, 0, 800, 0)), Line((400, 0, 400, -1000))),
+        "U": ObjectCollection(Line((0, 0, 0, -800)), Line((0, -800, 400, -1000)), Line((400, -1000, 800, -800)), Line((800, -800, 800, 0))),
+        "V": ObjectCollection(Line((0, 0, 400, -1000)), Line((400, -1000, 800, 0))),
+        "W": ObjectCollection(Line((0, 0, 200, -1000)), Line((200, -1000, 400, -200)), Line((400, -200, 600, -1000)), Line((600, -1000, 800, 0))),
+        "X": ObjectCollection(Line((0, 0, 800, -1000)), Line((0, -1000, 800, 0))),
+        "Y": ObjectCollection(Line((0, 0, 400, -500)), Line((400, -500, 800, 0)), Line((400, -500, 400, -1000))),
+        "Z": ObjectCollection(Line((0, 0, 800, 0)), Line((800, 0, 0, -1000)), Line((0, -1000, 800, -1000))),
+        "1": ObjectCollection(Line((0, -500, 400, 0)), Line((400, 0, 400, -1000))),
+        "2": ObjectCollection(Line((0, -400, 400, 0)), Line((400, 0, 800, -400)), Line((800, -400, 0, -1000)), Line((0, -1000, 800, -1000))),
+        "3": ObjectCollection(Line((0, 0, 800, 0)), Line((800, 0, 400, -500)), Line((400, -500, 800, -400)), Line((800, -400, 800, -800)), Line((800, -800, 400, -1000)), Line((400, -1000, 0, -800))),
+        "4": ObjectCollection(Line((400, 0, 0, -750)), Line((0, -750, 800, -750)), Line((400, -500, 400, -1000))),
+        "5": ObjectCollection(Line((800, 0, 0, 0)), Line((0, 0, 0, -500)), Line((0, -500, 700, -500)), Line((700, -500, 800, -750)), Line((800, -750, 700, -1000)), Line((700, -1000, 0, -1000))),
+        "6": ObjectCollection(Line((400, 0, 0, -750)), Ellipse((400, -750, 800, 500))),
+        "7": ObjectCollection(Line((0, 0, 800, 0)), Line((800, 0, 0, -1000))),
+        "8": ObjectCollection(Ellipse((400, -250, 700, 500)), Ellipse((400, -750, 800, 500))),
+        "9": ObjectCollection(Ellipse((400, -250, 800, 500)), Line((800, -250, 400, -1000))),
+        "0": ObjectCollection(Ellipse((400, -500, 700, 1000)), Line((100, -850, 700, -150))),
+        ".": ObjectCollection(Ellipse((50, -950, 100, 100))),
+        ":": ObjectCollection(Ellipse((50, -950, 100, 100)), Ellipse((50, -450, 100, 100))),
+        ",": ObjectCollection(Line((100, -800, -100, -1100))),
+        "!": ObjectCollection(Line((50, 0, 50, -800)), Ellipse((50, -950, 100, 100))),
+        "?": ObjectCollection(Line((0, -250, 300, 0)), Line((300, 0, 600, -250)), Line((600, -250, 300, -500)), Line((300, -500, 300, -800)), Ellipse((300, -950, 100, 100)))
+    })
+
+
+_default_font = None
+
+
+def get_default_font():
+    """
+    Get the default font in this package. It's only created when it's first needed.
+    :return: The default font.
+    """
+    global _default_font
+    if _default_font is None:
+        _default_font = _create_default_font()
+    return _default_font
+
+
+def __getattr__(name):
+    # default_font is created when it's first accessed (PEP 562)
+    if name == "default_font":
+        return get_default_font()
+    raise AttributeError(
+        f"module {__name__!r} has no attribute {name!r}"
+    )
@@ -27,15 +27,17 @@ class Point:
     :param x: X-coordinate
     :param y: Y-coordinate
     """
+    __slots__ = ("x", "y")
+
     def __init__(self, x: int | float, y: int | float = None):
         if y is not None:
             self.x, self.y = x, y
-        elif isinstance(x, tuple) or isinstance(x, list):
+        elif isinstance(x, (tuple, list, np.ndarray)):
             self.x, self.y = x
         else:
             raise ValueError(
                 f"Cannot parse alternative point input format of {x}\n"
-                f"Alternative point input formats: tuple(x, y), list[x, y]"
+                f"Alternative point input formats: tuple(x, y), list[x, y], NumPy array[x, y]"
             )
 
     def set(self, x: int | float, y: int | float):
@@ -71,7 +73,7 @@ class Point:
                 f"Cannot add {type(other)} to {type(Point(0, 0))}"
             )
 
-    def __div__(self, other):
+    def __truediv__(self, other):
         if isinstance(other, Point):
             return Point(self.x / other.x, self.y / other.y)
         else:
@@ -92,6 +94,143 @@ class Point:
         return f"Point({self.x}; {self.y})"
 
 
+class _PointView(Point):
+    """
+    A Point that reads and writes one row of a PointArray's array, for internal use.
+    :param row: The row, a view with the shape (2,).
+    """
+    __slots__ = ("_row",)
+
+    def __init__(self, row: np.ndarray):
+        self._row = row
+
+    @property
+    def x(self):
+        return self._row[0].item()
+
+    @x.setter
+    def x(self, value: int | float):
+        self._row[0] = value
+
+    @property
+    def y(self):
+        return self._row[1].item()
+
+    @y.setter
+    def y(self, value: int | float):
+        self._row[1] = value
+
+    def __reduce__(self):
+        return Point, (self.x, self.y)  # Copies and pickles are independent points
+
+
+class PointArray:
+    """
+    Represents many points in 2D space, stored in one NumPy array with the shape (number of points, 2).
+    It takes a lot less memory than a list of Point objects, and it can be changed with array math, e.g. points.array += (10, 0).
+    Indexing with an integer (and iterating) gives Point objects that are views into the array, so changing them changes the array,
+    e.g. points[0].x += 10. Use to_points() for independent copies. Indexing with a slice gives a PointArray view.
+    Appending points (see self.append()) replaces the array, so earlier views don't change it anymore.
+    In other parts of the package, it can be used wherever multiple points are expected, e.g. Polygon(PointArray(...)).
+    :param points: The points. A NumPy array with the shape (N, 2) (or any shape with N*2 values), a PointArray,
+                   or a collection of Point objects and other point representations. See the Point class for more details.
+                   Arrays and PointArrays are not copied if they are already float64.
+    :var array: The array of the points, with the shape (number of points, 2). The columns are the X and Y coordinates.
+    """
+    __slots__ = ("array",)
+
+    def __init__(self, points=()):
+        self.array = self._parse(points)
+
+    @staticmethod
+    def _parse(points):
+        """
+        Convert points in any supported format to an array, for internal use.
+        Points without Point objects are converted by NumPy at once, without parsing them one by one.
+        :param points: The points. See PointArray for more details.
+        :return: A float64 array with the shape (number of points, 2).
+        """
+        if isinstance(points, PointArray):
+            return points.array
+        if isinstance(points, np.ndarray):
+            array = np.asarray(points, float)
+        else:
+            points = points if isinstance(points, (list, tuple)) else list(points)
+            if any(isinstance(point, Point) for point in points):
+                array = np.array([(point.x, point.y) if isinstance(point, Point) else tuple(point) for point in points], float)
+            else:
+                array = np.array(points, float)
+        if array.size % 2:
+            raise ValueError(
+                f"Cannot parse alternative point array input format with the shape {array.shape}\n"
+                f"Alternative point array input formats: NumPy arrays with the shape (N, 2), collections of points"
+            )
+        return array.reshape(-1, 2)
+
+    @property
+    def x(self):
+        return self.array[:, 0]
+
+    @property
+    def y(self):
+        return self.array[:, 1]
+
+    def copy(self):
+        return PointArray(self.array.copy())
+
+    def to_points(self):
+        """
+        Convert to Point objects.
+        :return: A list of new Point objects.
+        """
+        return [Point(x, y) for x, y in self.array.tolist()]
+
+    def __len__(self):
+        return len(self.array)
+
+    def append(self, point: Point | Collection[int | float, int | float]):
+        """
+        Add a point to the end. This replaces the array with a new, longer one.
+        :param point: The point. See the Point class for more details.
+        :return: None
+        """
+        self.extend((point,))
+
+    def extend(self, points):
+        """
+        Add points to the end. This replaces the array with a new, longer one.
+        :param points: The points. See PointArray for more details.
+        :return: None
+        """
+        self.array = np.concatenate((self.array, self._parse(points)))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return PointArray(self.array[item])
+        return _PointView(self.array[item])
+
+    def __setitem__(self, item, value):
+        self.array[item] = (value.x, value.y) if isinstance(value, Point) else value
+
+    def __iter__(self):
+        return map(_PointView, self.array)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.array if dtype is None else self.array.astype(dtype, copy=False)
+        return array.copy() if copy and array is self.array else array
+
+    def __eq__(self, other):
+        if isinstance(other, PointArray):
+            return np.array_equal(self.array, other.array)
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return f"PointArray({len(self.array)} points)"
+
+
 class Line:
     """
     Represents a line segment in 2D space.
@@ -99,6 +238,8 @@ class Line:
     :param p1: The first point.
     :param p2: The second point.
     """
+    __slots__ = ("p1", "p2")
+
     def __init__(self, p1: Point | Collection[int | float, int | float],
                        p2: Point | Collection[int | float, int | float] = None):
         if p2 is not None:
@@ -122,36 +263,81 @@ class Line:
 class Polygon:
     """
     Represents a polygon in 2D space. The first and the last points are also connected.
-    In other parts of the package, you can also use (Point, ...) and the same thing with other point representations instead of this class.
-    :param points: The points of the polygon.
+    In other parts of the package, you can also use (Point, ...), the same thing with other point representations or a PointArray instead of this class.
+    The points are stored in a PointArray. polygon.points[i] (and iterating over polygon.points) gives Point views into it,
+    so polygon.points[i].x = ... changes the polygon. Many points can be changed at once with array math on polygon.points.array.
+    :param points: The points of the polygon, or one PointArray or NumPy array with all the points.
     """
-    def __init__(self, *points: Collection[Point] or Collection[Collection[int | float, int | float]]):
-        self.points = list(points)
-        for i, point in enumerate(points):
-            if not isinstance(point, Point):
-                self.points[i] = Point(point)
+    __slots__ = ("points",)
+
+    def __init__(self, *points: Collection[Point] or Collection[Collection[int | float, int | float]] or PointArray):
+        if len(points) == 1 and isinstance(points[0], (PointArray, np.ndarray)):
+            points = points[0]
+        self.points = PointArray(points)
 
     def get_points(self):
         """
         Get the points.
-        :return: points
+        :return: points as a list of Point objects
         """
-        return self.points
+        return self.points.to_points()
 
     def get_lines(self):
         """
         Get the lines of the polygon based on its points.
         :return: A tuple of Line objects.
         """
+        points = self.get_points()
         lines = []
-        for i in range(len(self.points)):
-            current = self.points[i]
-            next = self.points[(i+1)%len(self.points)]
+        for i in range(len(points)):
+            current = points[i]
+            next = points[(i+1)%len(points)]
             lines.append(Line(current, next))
         return tuple(lines)
 
     def __repr__(self):
-        return "Polygon(" + " -> ".join(self.get_points()) + ")"
+        return "Polygon(" + " -> ".join(map(str, self.get_points())) + ")"
+
+
+class Polyline:
+    """
+    Represents an open path (line strip) in 2D space: the points are connected one after the other, but the last point isn't connected to the first.
+    It's drawn as one continuous path (see draw.Canvas.draw_polyline()), not as separate lines.
+    In other parts of the package, you can also use (Point, ...), the same thing with other point representations or a PointArray instead of this class.
+    The points are stored in a PointArray, like in Polygon.
+    :param points: The points of the path, or one PointArray or NumPy array with all the points.
+    """
+    __slots__ = ("points",)
+
+    def __init__(self, *points: Collection[Point] or Collection[Collection[int | float, int | float]] or PointArray):
+        if len(points) == 1 and isinstance(points[0], (PointArray, np.ndarray)):
+            points = points[0]
+        self.points = PointArray(points)
+
+    def get_points(self):
+        """
+        Get the points.
+        :return: points as a list of Point objects
+        """
+        return self.points.to_points()
+
+    def get_lines(self):
+        """
+        Get the lines of the path based on its points.
+        :return: A tuple of Line objects.
+        """
+        points = self.get_points()
+        return tuple(Line(points[i], points[i + 1]) for i in range(len(points) - 1))
+
+    def get_length(self):
+        """
+        Get the length of the path.
+        :return: The length.
+        """
+        return float(np.hypot(*np.diff(self.points.array, axis=0).T).sum())
+
+    def __repr__(self):
+        return "Polyline(" + " -> ".join(map(str, self.get_points())) + ")"
 
 
 class Ellipse:
@@ -163,6 +349,8 @@ class Ellipse:
     :param width: The width.
     :param height: The height.
     """
+    __slots__ = ("centre", "width", "height")
+
     def __init__(self, centre: Point | Collection[int | float, int | float], width: int | float = None, height: int | float = None):
         if width is not None and height is not None:
             if not isinstance(centre, Point):
@@ -190,88 +378,135 @@ class Ellipse:
 
 
 class PointTools:
+    """
+    Shift, rotate and scale many points at once. Every function converts the points to one (N, 2) array
+    and changes all of them with one NumPy operation.
+    The result has the same type as the input: an array for a NumPy array, a PointArray for a PointArray,
+    and a list of new Point objects for other collections.
+    Give out to write the result into an existing (N, 2) float64 array or PointArray (it can be the input itself, to change it in place).
+    """
+    @staticmethod
+    def _parse_points(points: Collection[Point | Collection[int | float, int | float]] | PointArray | np.ndarray):
+        """
+        Convert the points to an array.
+        For internal use.
+        :param points: The input points.
+        :return: A float64 array with the shape (number of points, 2).
+        """
+        return PointArray._parse(points)
+
     @staticmethod
-    def _parse_points(points: [Point | Collection[int | float, int | float]]):
+    def _parse_centre(centre: Point | Collection[int | float, int | float] | None):
         """
-        Make sure all points in the collection are Point objects.
+        Convert a centre point to a pair of floats, 0, 0 if it's None.
+        For internal use.
+        :param centre: The input centre.
+        :return: (x, y)
+        """
+        if centre is None: return 0.0, 0.0
+        if not isinstance(centre, Point): centre = Point(centre)
+        return float(centre.x), float(centre.y)
+
+    @staticmethod
+    def _result(points, array: np.ndarray, out):
+        """
+        Give back the result in the type of the input (or out).
         For internal use.
         :param points: The input points.
-        :return: [Point, ...]
+        :param array: The result array.
+        :param out: The out parameter of the function.
+        :return: The result.
+        """
+        if out is not None:
+            return out
+        if isinstance(points, np.ndarray):
+            return array
+        if isinstance(points, PointArray):
+            return PointArray(array)
+        return [Point(x, y) for x, y in array.tolist()]
+
+    @staticmethod
+    def _out_array(out: np.ndarray | PointArray | None, length: int):
+        """
+        Get the array to write the result into, for internal use.
+        :param out: The out parameter of the function.
+        :param length: The number of points.
+        :return: An array with the shape (length, 2).
         """
-        points = list(points)
-        for i, point in enumerate(points):
-            if not isinstance(point, Point):
-                points[i] = Point(point)
-        return points
+        if out is None:
+            return np.empty((length, 2))
+        array = out.array if isinstance(out, PointArray) else out
+        if array.shape != (length, 2):
+            raise ValueError(
+                f"The out array has the shape {array.shape}, expected ({length}, 2)"
+            )
+        return array
 
     @staticmethod
-    def shift_points(points: [Point | Collection[int | float, int | float]], x: int | float, y: int | float):
+    def shift_points(points: Collection[Point | Collection[int | float, int | float]] | PointArray | np.ndarray, x: int | float, y: int | float,
+                     out: np.ndarray | PointArray = None):
         """
         Shift points.
-        :param points: The points in a collection. See draw.Point for more details.
+        :param points: The points in a collection, a PointArray or an array with the shape (N, 2). See draw.Point for more details.
         :param x: The shifting along the X-axis.
         :param y: The shifting along the Y-axis.
+        :param out: An array or PointArray to write the shifted points into. Default is None, a new one is created.
         :return: The shifted points.
         """
-        points = PointTools._parse_points(points)
-        for point in points:
-            point.x += x
-            point.y += y
-        return points
+        array = PointTools._parse_points(points)
+        result = PointTools._out_array(out, len(array))
+        np.add(array, (x, y), out=result)
+        return PointTools._result(points, result, out)
 
     @staticmethod
-    def rotate_points(points: [Point | Collection[int | float, int | float]], angle: int | float,
-                      centre: Point | Collection[int | float, int | float] = None):
+    def rotate_points(points: Collection[Point | Collection[int | float, int | float]] | PointArray | np.ndarray, angle: int | float,
+                      centre: Point | Collection[int | float, int | float] = None, out: np.ndarray | PointArray = None):
         """
-        Rotate points by some angle in degrees
-        :param points: The points in a collection. See draw.Point for more details.
+        Rotate points clockwise by some angle in degrees, in the same direction as draw.Canvas.change_rotate().
+        :param points: The points in a collection, a PointArray or an array with the shape (N, 2). See draw.Point for more details.
         :param angle: The angle in degrees.
         :param centre: The centre of rotation, a Point (or see draw.Point for more options). Default is None, centre is at 0, 0.
+        :param out: An array or PointArray to write the rotated points into. Default is None, a new one is created.
         :return: The rotated points.
         """
-        points = PointTools._parse_points(points)
-        centre = PointTools._parse_points([centre])[0]
+        array = PointTools._parse_points(points)
+        centre = PointTools._parse_centre(centre)
+        result = PointTools._out_array(out, len(array))
         angle = degrees_to_radians(angle)
-        if centre:
-            points = PointTools.shift_points(points, -centre.x, -centre.y)
-        for point in points:
-            x, y = np.dot([[point.x], [point.y]],
-                          [[cos(angle), -sin(angle)], [sin(angle), cos(angle)]])
-            point.x, point.y = x[0], y[0]
-        if centre:
-            points = PointTools.shift_points(points, centre.x, centre.y)
-        return points
+        rotation = np.array(((cos(angle), -sin(angle)), (sin(angle), cos(angle))))  # Transposed, for row vectors
+        np.matmul(array - centre, rotation, out=result)
+        result += centre
+        return PointTools._result(points, result, out)
 
     @staticmethod
-    def scale_points(points: [Point | Collection[int | float, int | float]], x: int | float, y: int | float,
-                     centre: Point | Collection[int | float, int | float] = None):
+    def scale_points(points: Collection[Point | Collection[int | float, int | float]] | PointArray | np.ndarray, x: int | float, y: int | float,
+                     centre: Point | Collection[int | float, int | float] = None, out: np.ndarray | PointArray = None):
         """
         Scale points apart or closer together with a given centre.
-        :param points: The points in a collection. See draw.Point for more details.
+        :param points: The points in a collection, a PointArray or an array with the shape (N, 2). See draw.Point for more details.
         :param x: The scaling along the X-axis.
         :param y: The scaling along the Y-axis.
         :param centre: The centre of scaling, a Point (or see draw.Point for more options). Default is None, centre is at 0, 0.
+        :param out: An array or PointArray to write the scaled points into. Default is None, a new one is created.
         :return: The scaled points.
         """
-        points = PointTools._parse_points(points)
-        centre = PointTools._parse_points([centre])[0]
-        if centre:
-            points = PointTools.shift_points(points, -centre.x, -centre.y)
-        for point in points:
-            point.x *= x
-            point.y *= y
-        if centre:
-            points = PointTools.shift_points(points, centre.x, centre.y)
-        return points
+        array = PointTools._parse_points(points)
+        centre = PointTools._parse_centre(centre)
+        result = PointTools._out_array(out, len(array))
+        np.subtract(array, centre, out=result)
+        result *= (x, y)
+        result += centre
+        return PointTools._result(points, result, out)
 
 
 class ObjectCollection:
     """
     An object collection contains other objects (points, lines, polygons and ellipses, and even other object collections).
     Every object, of course, has its own position, but the whole of the collection can be shifted, scaled and rotated at once.
-    :param objects: The objects. Point, Line, Polygon, Ellipse, ObjectCollection
+    A PointArray in the collection is one object, its points are drawn one after the other in the time of that object.
+    :param objects: The objects. Point, PointArray, Line, Polygon, Polyline, Ellipse, ObjectCollection
     :param modified_objects: A deep copy of objects. This is the list that gets modified.
-    :type objects: Point | Line | Polygon | Ellipse | ObjectCollection
+    :type objects: Point | PointArray | Line | Polygon | Polyline | Ellipse | ObjectCollection
     """
     def __init__(self, *objects):  # Because I can't type ObjectCollection in here, :type is used in the docstring.
         self.objects = objects
@@ -301,57 +536,69 @@ class ObjectCollection:
         pop2 = self.modified_objects.pop()
         return pop1, pop2
 
-    def shift(self, shift_x: int | float, shift_y: int | float):
+    def _gather(self, points: list, arrays: list, ellipses: list):
         """
-        Shift all the objects in the collection.
-        Restore all changes with self.restore().
-        :param shift_x: Amount along the X-axis.
-        :param shift_y: Amount along the Y-axis.
+        Collect every point of the collection and the nested collections, for internal use.
+        :param points: The list to append the Point objects to (the points, the endpoints of the lines and the centres of the ellipses).
+        :param arrays: The list to append the arrays of the polygons and PointArrays to.
+        :param ellipses: The list to append the Ellipse objects to.
         :return: None
         """
-        shift_point = Point(shift_x, shift_y)
         for object in self.modified_objects:
             if isinstance(object, Point):
-                object += shift_point
+                points.append(object)
             elif isinstance(object, Line):
-                object.p1 += shift_point
-                object.p2 += shift_point
-            elif isinstance(object, Polygon):
-                for i in range(len(object.points)):
-                    object.points[i] += shift_point
+                points.extend((object.p1, object.p2))
+            elif isinstance(object, Polygon | Polyline):
+                arrays.append(object.points.array)
+            elif isinstance(object, PointArray):
+                arrays.append(object.array)
             elif isinstance(object, Ellipse):
-                object.centre += shift_point
+                points.append(object.centre)
+                ellipses.append(object)
             elif isinstance(object, ObjectCollection):
-                object.shift(shift_x, shift_y)
+                object._gather(points, arrays, ellipses)
+
+    def _transform_points(self, function, *args):
+        """
+        Change every point of the collection with one call of a PointTools function, for internal use.
+        :param function: PointTools.shift_points, rotate_points or scale_points.
+        :param args: The arguments of the function after the points.
+        :return: The Ellipse objects of the collection.
+        """
+        points, arrays, ellipses = [], [], []
+        self._gather(points, arrays, ellipses)
+        single = np.array([(point.x, point.y) for point in points], float).reshape(-1, 2)
+        batch = np.concatenate([single] + arrays)
+        function(batch, *args, out=batch)
+        for point, (x, y) in zip(points, batch[:len(points)].tolist()):
+            point.set(x, y)
+        position = len(points)
+        for array in arrays:
+            array[:] = batch[position:position + len(array)]
+            position += len(array)
+        return ellipses
+
+    def shift(self, shift_x: int | float, shift_y: int | float):
+        """
+        Shift all the objects in the collection.
+        Restore all changes with self.restore().
+        :param shift_x: Amount along the X-axis.
+        :param shift_y: Amount along the Y-axis.
+        :return: None
+        """
+        self._transform_points(PointTools.shift_points, shift_x, shift_y)
 
     def rotate(self, angle: int | float, centre: Point | Collection[int | float, int | float] = None):
         """
-        Rotate all the objects in the collection.
+        Rotate all the objects in the collection clockwise, in the same direction as draw.Canvas.change_rotate().
         Restore all changes with self.restore().
         WARNING: The Ellipse object cannot be rotated if it's not a circle. Only the centre point of the ellipse is rotated.
         :param angle: The angle of rotation in degrees.
         :param centre: The centre of rotation, a Point (or see draw.Point for more options). Default is None, centre is at 0, 0.
         :return: None
         """
-        if centre is None: centre = Point(0, 0)
-        elif not isinstance(centre, Point): centre = Point(centre)
-        for object in self.modified_objects:
-            if isinstance(object, Point):
-                new = PointTools.rotate_points([object], angle, centre)[0]
-                object.set(new.x, new.y)
-            elif isinstance(object, Line):
-                new_p1, new_p2 = PointTools.rotate_points([object.p1, object.p2], angle, centre)
-                object.p1 = new_p1
-                object.p2 = new_p2
-            elif isinstance(object, Polygon):
-                for i in range(len(object.points)):
-                    new = PointTools.rotate_points([object.points[i]], angle, centre)[0]
-                    object.points[i].set(new.x, new.y)
-            elif isinstance(object, Ellipse):
-                new = PointTools.rotate_points([object.centre], angle, centre)[0]
-                object.centre.set(new.x, new.y)
-            elif isinstance(object, ObjectCollection):
-                object.rotate(angle, centre)
+        self._transform_points(PointTools.rotate_points, angle, centre)
 
     def scale(self, scale_x: int | float, scale_y: int | float,
               centre: Point | Collection[int | float, int | float] = None):
@@ -363,34 +610,9 @@ class ObjectCollection:
         :param centre: The centre of rotation, a Point (or see draw.Point for more options). Default is None, centre is at 0, 0.
         :return: None
         """
-        if centre is None: centre = Point(0, 0)
-        elif not isinstance(centre, Point): centre = Point(centre)
-        scale_point = Point(scale_x, scale_y)  # for easier and shorter code, so I can use some_point *= scale_point
-        for object in self.modified_objects:
-            if isinstance(object, Point):
-                object -= centre
-                object *= scale_point
-                object += centre
-            elif isinstance(object, Line):
-                object.p1 -= centre
-                object.p2 -= centre
-                object.p1 *= scale_point
-                object.p2 *= scale_point
-                object.p1 += centre
-                object.p2 += centre
-            elif isinstance(object, Polygon):
-                for i in range(len(object.points)):
-                    object.points[i] -= centre
-                    object.points[i] *= scale_point
-                    object.points[i] += centre
-            elif isinstance(object, Ellipse):
-                object.centre -= centre
-                object.centre *= scale_point
-                object.centre += centre
-                object.width *= scale_x
-                object.height *= scale_y
-            elif isinstance(object, ObjectCollection):
-                object.scale(scale_x, scale_y, centre)
+        for ellipse in self._transform_points(PointTools.scale_points, scale_x, scale_y, centre):
+            ellipse.width *= scale_x
+            ellipse.height *= scale_y
 
     def restore(self):
         """
@@ -399,7 +621,224 @@ class ObjectCollection:
         """
         self.modified_objects = copy.deepcopy(self.objects)
 
+    def compile(self):
+        """
+        Compile the collection (as it is now, with its modifications) into contiguous NumPy arrays. See CompiledObjectCollection.
+        :return: A CompiledObjectCollection.
+        """
+        return CompiledObjectCollection(self)
+
     def __repr__(self):
         orig = "; ".join([str(a) for a in self.objects])
         mod = "; ".join([str(a) for a in self.modified_objects])
-        return "ObjectCollection Modified: [" + mod + "]" + " / Original: [" + orig + "]"
\ No newline at end of file
+        return "ObjectCollection Modified: [" + mod + "]" + " / Original: [" + orig + "]"
+
+
+class CompiledObjectCollection:
+    """
+    An ObjectCollection flattened into contiguous NumPy arrays (struct of arrays), with nested collections included.
+    Shifting, rotating and scaling are a few vectorized operations on the arrays instead of walking the objects,
+    and restoring the original values is O(1). Canvas.draw_object_collection() draws it the same way as the ObjectCollection it was compiled from.
+    Create it with ObjectCollection.compile().
+    The arrays shouldn't be changed directly, the original values are read-only.
+    WARNING: Like in ObjectCollection, an ellipse cannot be rotated if it's not a circle. Only the centre point of the ellipse is rotated.
+    :param collection: The ObjectCollection to compile. Its modified_objects are used.
+    :var points: The points, with the shape (number of points, 2).
+    :var segments: The endpoints of the lines, with the shape (number of lines, 2, 2), so segments[i, 0] is the first point of the i-th line.
+    :var polygon_points: The points of every polygon after each other, with the shape (number of points, 2).
+    :var polygon_offsets: Where the points of each polygon start in polygon_points, and an extra value for the end of the last polygon.
+    :var polyline_points: The points of every polyline after each other, with the shape (number of points, 2).
+    :var polyline_offsets: Where the points of each polyline start in polyline_points, and an extra value for the end of the last polyline.
+    :var ellipses: The ellipses, with the shape (number of ellipses, 4), the columns are centre X, centre Y, width, height.
+    :var order: The objects in drawing order with the shape (number of objects, 2), the columns are the kind
+                (CompiledObjectCollection.POINT, LINE, POLYGON, ELLIPSE or POLYLINE) and the index in the array of that kind.
+    :var paths: The index of every object in the original structure, e.g. (2, 0) is modified_objects[2].modified_objects[0].
+                The points of a PointArray are separate objects here, their last index is the index in the PointArray.
+    :var time_divisors: How many objects share the time of drawing at every level above each object. See Canvas.draw_object_collection().
+    """
+    POINT, LINE, POLYGON, ELLIPSE, POLYLINE = range(5)
+
+    def __init__(self, collection: ObjectCollection):
+        points, segments, polygon_points, polygon_offsets, ellipses = [], [], [], [0], []
+        polyline_points, polyline_offsets = [], [0]
+        order, self.paths, self.time_divisors = [], [], []
+
+        def flatten(objects, path, divisors):
+            for i, object in enumerate(objects):
+                object_divisors = divisors + (len(objects),)
+                if isinstance(object, Point):
+                    order.append((self.POINT, len(points)))
+                    points.append((object.x, object.y))
+                elif isinstance(object, Line):
+                    order.append((self.LINE, len(segments)))
+                    segments.append(((object.p1.x, object.p1.y), (object.p2.x, object.p2.y)))
+                elif isinstance(object, Polygon):
+                    order.append((self.POLYGON, len(polygon_offsets) - 1))
+                    polygon_points.extend(object.points.array.tolist())
+                    polygon_offsets.append(len(polygon_points))
+                elif isinstance(object, Polyline):
+                    order.append((self.POLYLINE, len(polyline_offsets) - 1))
+                    polyline_points.extend(object.points.array.tolist())
+                    polyline_offsets.append(len(polyline_points))
+                elif isinstance(object, Ellipse):
+                    order.append((self.ELLIPSE, len(ellipses)))
+                    ellipses.append((object.centre.x, object.centre.y, object.width, object.height))
+                elif isinstance(object, PointArray):
+                    for j, point in enumerate(object.array.tolist()):
+                        order.append((self.POINT, len(points)))
+                        points.append(point)
+                        self.paths.append(path + (i, j))
+                        self.time_divisors.append(object_divisors + (len(object),))
+                    continue
+                elif isinstance(object, ObjectCollection):
+                    flatten(object.modified_objects, path + (i,), object_divisors)
+                    continue
+                else:
+                    continue
+                self.paths.append(path + (i,))
+                self.time_divisors.append(object_divisors)
+
+        flatten(collection.modified_objects, (), ())
+        self._original = {
+            "points": np.array(points, float).reshape(-1, 2),
+            "segments": np.array(segments, float).reshape(-1, 2, 2),
+            "polygon_points": np.array(polygon_points, float).reshape(-1, 2),
+            "ellipses": np.array(ellipses, float).reshape(-1, 4),
+            "polyline_points": np.array(polyline_points, float).reshape(-1, 2)
+        }
+        for array in self._original.values():
+            array.flags.writeable = False
+        self._modified = None
+        self.polygon_offsets = np.array(polygon_offsets)
+        self.polyline_offsets = np.array(polyline_offsets)
+        self.order = np.array(order, int).reshape(-1, 2)
+
+    def _to_arrays(self):
+        """
+        Get the original values as a dict of arrays (paths and time_divisors as flat arrays with their lengths), for internal use.
+        :return: The dict. See self._from_arrays().
+        """
+        return {
+            **self._original,
+            "polygon_offsets": self.polygon_offsets,
+            "polyline_offsets": self.polyline_offsets,
+            "order": self.order,
+            "path_lengths": np.array([len(path) for path in self.paths], int),
+            "path_values": np.array([i for path in self.paths for i in path], int),
+            "divisor_lengths": np.array([len(divisors) for divisors in self.time_divisors], int),
+            "divisor_values": np.array([d for divisors in self.time_divisors for d in divisors], int)
+        }
+
+    @classmethod
+    def _from_arrays(cls, arrays):
+        """
+        Create a CompiledObjectCollection from the arrays of self._to_arrays(), without copying them (e.g. memory-mapped arrays), for internal use.
+        :param arrays: The dict of arrays.
+        :return: The CompiledObjectCollection.
+        """
+        compiled = cls.__new__(cls)
+        compiled._original = {name: arrays[name] for name in ("points", "segments", "polygon_points", "ellipses", "polyline_points")}
+        for array in compiled._original.values():
+            array.flags.writeable = False
+        compiled._modified = None
+        compiled.polygon_offsets, compiled.polyline_offsets = arrays["polygon_offsets"], arrays["polyline_offsets"]
+        compiled.order = arrays["order"]
+        paths = arrays["path_values"].tolist()
+        ends = np.cumsum(arrays["path_lengths"]).tolist()
+        compiled.paths = [tuple(paths[end - length:end]) for end, length in zip(ends, arrays["path_lengths"].tolist())]
+        divisors = arrays["divisor_values"].tolist()
+        ends = np.cumsum(arrays["divisor_lengths"]).tolist()
+        compiled.time_divisors = [tuple(divisors[end - length:end]) for end, length in zip(ends, arrays["divisor_lengths"].tolist())]
+        return compiled
+
+    def _arrays(self):
+        return self._original if self._modified is None else self._modified
+
+    def _modify(self):
+        """
+        Get the arrays that can be modified. They are copied from the original values after creation or self.restore(), for internal use.
+        :return: The dict of the arrays.
+        """
+        if self._modified is None:
+            self._modified = {name: array.copy() for name, array in self._original.items()}
+        return self._modified
+
+    def _coordinates(self):
+        """
+        Get every coordinate array that is modified by transformations, with the shape (-1, 2), for internal use.
+        :return: The arrays (views).
+        """
+        arrays = self._modify()
+        return (arrays["points"], arrays["segments"].reshape(-1, 2), arrays["polygon_points"], arrays["ellipses"][:, :2],
+                arrays["polyline_points"])
+
+    @property
+    def points(self):
+        return self._arrays()["points"]
+
+    @property
+    def segments(self):
+        return self._arrays()["segments"]
+
+    @property
+    def polygon_points(self):
+        return self._arrays()["polygon_points"]
+
+    @property
+    def ellipses(self):
+        return self._arrays()["ellipses"]
+
+    @property
+    def polyline_points(self):
+        return self._arrays()["polyline_points"]
+
+    def __len__(self):
+        return len(self.order)
+
+    def shift(self, shift_x: int | float, shift_y: int | float):
+        """
+        Shift all the objects in the collection.
+        Restore all changes with self.restore().
+        :param shift_x: Amount along the X-axis.
+        :param shift_y: Amount along the Y-axis.
+        :return: None
+        """
+        for coordinates in self._coordinates():
+            coordinates += (shift_x, shift_y)
+
+    def rotate(self, angle: int | float, centre: Point | Collection[int | float, int | float] = None):
+        """
+        Rotate all the objects in the collection clockwise, in the same direction as draw.Canvas.change_rotate().
+        Restore all changes with self.restore().
+        WARNING: The Ellipse object cannot be rotated if it's not a circle. Only the centre point of the ellipse is rotated.
+        :param angle: The angle of rotation in degrees.
+        :param centre: The centre of rotation, a Point (or see draw.Point for more options). Default is None, centre is at 0, 0.
+        :return: None
+        """
+        for coordinates in self._coordinates():
+            PointTools.rotate_points(coordinates, angle, centre, out=coordinates)
+
+    def scale(self, scale_x: int | float, scale_y: int | float,
+              centre: Point | Collection[int | float, int | float] = None):
+        """
+        Scale all objects in the collection.
+        Restore all changes with self.restore().
+        :param scale_x: The scaling along the X-axis.
+        :param scale_y: The scaling along the Y-axis.
+        :param centre: The centre of scaling, a Point (or see draw.Point for more options). Default is None, centre is at 0, 0.
+        :return: None
+        """
+        for coordinates in self._coordinates():
+            PointTools.scale_points(coordinates, scale_x, scale_y, centre, out=coordinates)
+        self._modify()["ellipses"][:, 2:] *= (scale_x, scale_y)
+
+    def restore(self):
+        """
+        Restore any shifts, rotations and scalings to the original values. O(1), the original arrays are kept separately.
+        :return: None
+        """
+        self._modified = None
+
+    def __repr__(self):
+        return (f"CompiledObjectCollection({len(self.points)} points; {len(self.segments)} lines; "
+                f"{len(self.polygon_offsets) - 1} polygons; {len(self.ellipses)} ellipses; {len(self.polyline_offsets) - 1} polylines)")
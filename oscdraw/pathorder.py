@@ -0,0 +1,222 @@
+"""
+Reordering the objects of an ObjectCollection, so the beam jumps less between them.
+The objects are drawn one after the other, and between two objects the beam jumps from where the first one ends
+to where the next one starts. These jumps can be seen as retrace lines, and they waste frames.
+optimize_path() finds an order (and direction) of the objects with short jumps: a greedy nearest neighbour order,
+improved with 2-opt moves until a time limit.
+"""
+import copy
+import time as _time
+import weakref
+from typing import Literal
+import numpy as np
+from .objects import Point, PointArray, Line, Polygon, Polyline, Ellipse, ObjectCollection
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def _options(object, line_mode: str, deadline: float):
+    """
+    Get the ways an object can be drawn: where the beam enters and leaves it, for internal use.
+    :param object: The object.
+    :param line_mode: The line drawing mode. See draw.Canvas.draw_line() for more.
+    :param deadline: The time (time.perf_counter()) to stop optimizing nested collections at.
+    :return: A list of (entry x, entry y, exit x, exit y, variant), the variant is given to _apply(). None if the object isn't drawn.
+    """
+    if isinstance(object, Point):
+        return [(object.x, object.y, object.x, object.y, 0)]
+    if isinstance(object, Line):
+        p1, p2 = (object.p1.x, object.p1.y), (object.p2.x, object.p2.y)
+        if line_mode == "triangle":  # The beam goes back to where the line started
+            return [(*p1, *p1, 0), (*p2, *p2, 1)]
+        return [(*p1, *p2, 0), (*p2, *p1, 1)]
+    if isinstance(object, PointArray | Polyline):
+        array = object.array if isinstance(object, PointArray) else object.points.array
+        if not len(array):
+            return None
+        first, last = array[0].tolist(), array[-1].tolist()
+        if isinstance(object, Polyline) and line_mode == "triangle":  # The beam goes back along the path
+            return [(*first, *first, 0), (*last, *last, 1)]
+        return [(*first, *last, 0), (*last, *first, 1)]
+    if isinstance(object, Polygon):
+        points = object.points.array.tolist()
+        if line_mode == "triangle":  # The last side goes back to the last point
+            return [(*points[k], *points[k - 1], k) for k in range(len(points))]
+        return [(*points[k], *points[k], k) for k in range(len(points))]
+    if isinstance(object, Ellipse):
+        x, y = object.centre.x + object.width / 2, object.centre.y
+        return [(x, y, x, y, 0)]
+    if isinstance(object, ObjectCollection):
+        optimized, entry, exit = _optimize(object, line_mode, deadline)
+        if optimized is None:
+            return None
+        return [(*entry, *exit, optimized)]
+    return None
+
+
+def _apply(object, variant):
+    """
+    Create the object drawn in the chosen way, for internal use.
+    :param object: The object.
+    :param variant: The variant from _options().
+    :return: The new object.
+    """
+    if isinstance(variant, ObjectCollection):
+        return variant
+    if isinstance(object, Line) and variant:
+        return Line(copy.copy(object.p2), copy.copy(object.p1))
+    if isinstance(object, PointArray) and variant:
+        return PointArray(object.array[::-1].copy())
+    if isinstance(object, Polyline) and variant:
+        return Polyline(object.points.array[::-1].copy())
+    if isinstance(object, Polygon):
+        return Polygon(np.roll(object.points.array, -variant, 0))
+    return copy.deepcopy(object)
+
+
+def _distances(from_points: np.ndarray, to_points: np.ndarray):
+    return np.hypot(*(to_points - from_points).T)
+
+
+def _optimize(collection: ObjectCollection, line_mode: str, deadline: float):
+    """
+    Optimize the order of a collection, for internal use. Nested collections are optimized on their own first,
+    since reordering objects between collections would change how the time is divided.
+    :param collection: The collection.
+    :param line_mode: The line drawing mode. See draw.Canvas.draw_line() for more.
+    :param deadline: The time (time.perf_counter()) to stop the 2-opt moves at.
+    :return: The optimized collection, and the entry and exit point of it. None, None, None if nothing in it is drawn.
+    """
+    objects, options = [], []
+    for object in collection.modified_objects:
+        object_options = _options(object, line_mode, deadline)
+        if object_options is not None:
+            objects.append(object)
+            options.append(object_options)
+    if not objects:
+        return None, None, None
+    # Every option of every object in one array: entry x, entry y, exit x, exit y
+    flat = np.array([option[:4] for object_options in options for option in object_options], float)
+    owner = np.repeat(np.arange(len(objects)), [len(object_options) for object_options in options])
+    first = np.concatenate(([0], np.cumsum([len(object_options) for object_options in options])[:-1]))
+
+    # Greedy nearest neighbour, from the first object as it is
+    order, chosen = [0], [0]
+    visited = np.zeros(len(objects), bool)
+    visited[0] = True
+    position = flat[0, 2:]
+    for _ in range(len(objects) - 1):
+        distances = _distances(position, flat[:, :2])
+        distances[visited[owner]] = np.inf
+        best = int(np.argmin(distances))
+        order.append(int(owner[best]))
+        chosen.append(best - int(first[owner[best]]))
+        visited[owner[best]] = True
+        position = flat[best, 2:]
+
+    # 2-opt on the closed tour (the next frame starts where this one started)
+    entries = np.array([options[o][c][:2] for o, c in zip(order, chosen)], float)
+    exits = np.array([options[o][c][2:4] for o, c in zip(order, chosen)], float)
+    reverse = []  # The option of each object that is drawn the other way, None if it cannot be reversed
+    for o, c in zip(order, chosen):
+        entry, exit = options[o][c][:2], options[o][c][2:4]
+        reverse.append(next((k for k, option in enumerate(options[o]) if option[:2] == exit and option[2:4] == entry), None))
+    count = len(order)
+    improved = True
+    while improved and count > 3 and _time.perf_counter() < deadline:
+        improved = False
+        for a in range(1, count - 1):
+            if _time.perf_counter() >= deadline:
+                break
+            if reverse[a] is None:
+                continue
+            end = a
+            while end + 1 < count and reverse[end + 1] is not None:
+                end += 1
+            b = np.arange(a, end + 1)
+            after = (b + 1) % count
+            delta = (_distances(exits[a - 1], exits[b]) + _distances(entries[a], entries[after])
+                     - _distances(exits[a - 1], entries[a]) - _distances(exits[b], entries[after]))
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                b = a + best
+                entries[a:b + 1], exits[a:b + 1] = exits[a:b + 1][::-1].copy(), entries[a:b + 1][::-1].copy()
+                order[a:b + 1] = order[a:b + 1][::-1]
+                chosen[a:b + 1], reverse[a:b + 1] = reverse[a:b + 1][::-1], chosen[a:b + 1][::-1]
+                improved = True
+
+    # Choose the best option of every object between its neighbours (e.g. the first point of a polygon)
+    for k, o in enumerate(order):
+        if len(options[o]) > 1:
+            candidates = flat[first[o]:first[o] + len(options[o])]
+            cost = (_distances(exits[k - 1], candidates[:, :2]) + _distances(candidates[:, 2:], entries[(k + 1) % count]))
+            chosen[k] = int(np.argmin(cost))
+            entries[k], exits[k] = candidates[chosen[k], :2], candidates[chosen[k], 2:]
+
+    optimized = ObjectCollection(*(_apply(objects[o], options[o][c][4]) for o, c in zip(order, chosen)))
+    return optimized, tuple(entries[0].tolist()), tuple(exits[-1].tolist())
+
+
+def _signature(collection: ObjectCollection):
+    """
+    Get the geometry of a collection as bytes, to know whether a cached result is still valid, for internal use.
+    :param collection: The collection.
+    :return: bytes
+    """
+    compiled = collection.compile()
+    return b"".join(array.tobytes() for array in (compiled.points, compiled.segments, compiled.polygon_points,
+                                                   compiled.polygon_offsets, compiled.ellipses, compiled.polyline_points,
+                                                   compiled.polyline_offsets, compiled.order))
+
+
+def optimize_path(collection: ObjectCollection, line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth",
+                  time_limit: int | float = 0.05, cache: bool = True):
+    """
+    Reorder the objects of a collection (and draw lines and polylines in the other direction, start polygons at another point)
+    so the beam jumps as little as possible between them. The first object stays first.
+    Nested collections are optimized on their own and stay one object, so the time of drawing is divided the same way.
+    The result is cached for the collection, and it's only optimized again if the objects (modified_objects) change.
+    :param collection: The ObjectCollection.
+    :param line_mode: The line drawing mode the collection will be drawn with, since it changes where a line ends.
+                      See draw.Canvas.draw_line() for more. Default is "sawtooth".
+    :param time_limit: The maximum time of the 2-opt improvements in seconds. Default is 0.05.
+    :param cache: Whether to use (and store) the cached result. Default is True.
+    :return: A new ObjectCollection with the objects in the optimized order.
+    """
+    signature = _signature(collection) if cache else None
+    if cache:
+        cached = _cache.get(collection, {}).get(line_mode)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    optimized, _, _ = _optimize(collection, line_mode, _time.perf_counter() + time_limit)
+    if optimized is None:
+        optimized = ObjectCollection(*collection.modified_objects)
+    if cache:
+        _cache.setdefault(collection, {})[line_mode] = signature, optimized
+    return optimized
+
+
+def _flatten(collection: ObjectCollection):
+    """
+    Get every drawn object of a collection and the nested collections in drawing order, for internal use.
+    :param collection: The collection.
+    :return: A generator of objects.
+    """
+    for object in collection.modified_objects:
+        if isinstance(object, ObjectCollection):
+            yield from _flatten(object)
+        elif isinstance(object, (Point, PointArray, Line, Polygon, Polyline, Ellipse)):
+            yield object
+
+
+def jump_distance(collection: ObjectCollection, line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+    """
+    Measure the total distance the beam jumps between the objects of a collection, as they are drawn now
+    (including the jump from the last object back to the first, for the next frame).
+    :param collection: The ObjectCollection.
+    :param line_mode: The line drawing mode. See draw.Canvas.draw_line() for more. Default is "sawtooth".
+    :return: The distance.
+    """
+    ends = [options[0][:4] for options in (_options(object, line_mode, 0) for object in _flatten(collection)) if options]
+    ends = np.array(ends, float).reshape(-1, 4)
+    return float(_distances(ends[:, 2:], np.roll(ends[:, :2], -1, 0)).sum())
@@ -1,26 +1,103 @@
-from .draw import Canvas
+from typing import Literal
+import numpy as np
+from .draw import Canvas, _allocate_frames
 
 class BWDisplay:
     """
     A black and white "pixel display". Only black and white.
+    The pixels are kept in a 2D bool NumPy array, and they are drawn with NumPy at once, as one action.
+    They can be drawn as points (one frame for every lit pixel), or as runs: every horizontal run of lit pixels is swept by the beam
+    like a short line, which makes the brightness even and the frames can be limited to a budget (see self.draw()).
+    :var pixels: The pixels as a bool array with the shape (height, width), or smaller after downscaling.
+    :var downscale: The downscale amount of the last update (1 if not downscaled).
     """
     def __init__(self, canvas: Canvas, size: tuple[int, int]):
         self.c = canvas
         self.width, self.height = size
-        self.pixels = []
+        self.pixels = np.zeros((self.height, self.width), bool)
+        self.downscale = 1
 
-    def update(self, pixels: list[bool], downscale: int = None):
+    def update(self, pixels, downscale: int = None):
         """
         Update the display with new pixel data.
-        :param pixels:
+        :param pixels: The pixels, lit if not 0 (or True). A 2D array (or nested lists) with the shape (height, width),
+                       or the rows after each other in 1 dimension (a list or a NumPy array of bools, uint8 values etc.).
         :param downscale: Downscale amount (how long is the side of the square that contains the pixels to be merged).
+                          A merged pixel is lit if at least half of its pixels are lit. Default is None, not downscaled.
         :return: None
         """
-        self.pixels = pixels.copy()
+        pixels = np.asarray(pixels)
+        if pixels.size != self.width * self.height:
+            raise ValueError(
+                f"The display has {self.width}x{self.height} pixels, not {pixels.size}"
+            )
+        pixels = pixels.reshape(self.height, self.width) != 0
+        if downscale is not None and downscale > 1:
+            rows, columns = -(-self.height // downscale), -(-self.width // downscale)
+            padded = np.zeros((rows * downscale, columns * downscale), bool)
+            padded[:self.height, :self.width] = pixels
+            counts = padded.reshape(rows, downscale, columns, downscale).sum(axis=(1, 3))
+            pixels = counts * 2 >= downscale * downscale
+            self.downscale = downscale
+        else:
+            self.downscale = 1
+        self.pixels = pixels
 
-    def draw(self, shift_x=0, shift_y=0, scale_x=1, scale_y=1, skip_pixels: int = 0, skip_lines: int = 0, canvas: Canvas = None):
+    @staticmethod
+    def _runs(pixels: np.ndarray, serpentine: bool):
         """
-        Draw the pixels to the canvas.
+        Find the horizontal runs of lit pixels, for internal use.
+        :param pixels: The pixels as a 2D bool array.
+        :param serpentine: Whether every second row with runs is drawn from right to left (rows without runs are not counted).
+        :return: The row, the first column and the length of every run in drawing order, and whether each run is drawn from right to left.
+        """
+        edges = np.diff(np.pad(pixels, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+        rows, starts = np.nonzero(edges == 1)
+        lengths = np.nonzero(edges == -1)[1] - starts  # The ends are in the same order as the starts
+        if serpentine:  # Alternate between the visited rows, so the empty rows don't break the alternation
+            reverse = np.unique(rows, return_inverse=True)[1].reshape(-1) % 2 == 1
+        else:
+            reverse = np.zeros(len(rows), bool)
+        order = np.lexsort((np.where(reverse, -starts, starts), rows))
+        return rows[order], starts[order], lengths[order], reverse[order]
+
+    def get_coordinates(self, shift_x=0, shift_y=0, scale_x=1, scale_y=1, skip_pixels: int = 0, skip_lines: int = 0,
+                        mode: Literal["points", "runs"] = "points", sample_budget: int = None, serpentine: bool = True):
+        """
+        Get the coordinates of the frames of the lit pixels, row by row. See self.draw() for the parameters.
+        A downscaled pixel is at the position of its top left pixel.
+        :return: X, Y as NumPy arrays.
+        """
+        step_x, step_y = (skip_pixels + 1) * self.downscale, (skip_lines + 1) * self.downscale
+        pixels = self.pixels[::skip_lines + 1, ::skip_pixels + 1]
+        if mode == "points":
+            rows, columns = np.nonzero(pixels)
+        elif mode == "runs":
+            rows, starts, lengths, reverse = self._runs(pixels, serpentine)
+            if not len(rows):
+                return np.empty(0), np.empty(0)
+            if sample_budget is not None and sample_budget < len(rows):
+                raise ValueError(
+                    f"The sample budget ({sample_budget}) is smaller than the number of runs ({len(rows)})"
+                )
+            counts = lengths if sample_budget is None else _allocate_frames(lengths, sample_budget)
+            # Every frame of a run is at the centre of its part of the run, so the beam moves at a constant speed along it
+            owner = np.repeat(np.arange(len(rows)), counts)
+            position = (np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts) + 0.5) / counts[owner]
+            position = np.where(reverse[owner], 1 - position, position)
+            rows, columns = rows[owner], starts[owner] - 0.5 + position * lengths[owner]
+        else:
+            raise ValueError(
+                f"Unknown mode: {mode}"
+            )
+        x = columns * step_x - self.width // 2
+        y = self.height // 2 - rows * step_y
+        return (x + shift_x) * scale_x, (y + shift_y) * scale_y
+
+    def draw(self, shift_x=0, shift_y=0, scale_x=1, scale_y=1, skip_pixels: int = 0, skip_lines: int = 0, canvas: Canvas = None,
+             mode: Literal["points", "runs"] = "points", sample_budget: int = None, serpentine: bool = True):
+        """
+        Draw the pixels to the canvas, as one action.
         :param shift_x: How much to shift the center on the X axis.
         :param shift_y: How much to shift the center on the Y axis.
         :param scale_x: How much to scale on the X axis.
@@ -28,16 +105,18 @@ class BWDisplay:
         :param skip_pixels: How many pixels to skip in each line. Default is 0.
         :param skip_lines: How many lines to skip every line. Default is 0.
         :param canvas: The canvas to draw onto. If None, the default is used.
+        :param mode: "points" draws every lit pixel as a point (one frame each), in the order of the rows.
+                     "runs" draws every horizontal run of lit pixels as a short line, with frames in proportion to its length,
+                     so every part of the picture is equally bright. Default is "points".
+        :param sample_budget: The number of frames of the whole picture in the "runs" mode. The frames are divided between the runs
+                              in proportion to their lengths (every run gets at least one). Default is None, one frame for every lit pixel.
+        :param serpentine: Whether every second row (of the rows with lit pixels) is drawn from right to left in the "runs" mode,
+                           so the beam jumps less between the rows.
+                           Default is True.
         :return: None
         """
         c = canvas if canvas else self.c
-        width, height = self.width, self.height
-        for i, pixel in enumerate(self.pixels):
-            if (i // self.width) % (skip_lines + 1) != 0:
-                continue
-            elif (i % self.width) % (skip_pixels + 1) != 0:
-                continue
-            if pixel:
-                x, y = i % width - width // 2, height // 2 - i // width
-                x, y = (x + shift_x) * scale_x, (y + shift_y) * scale_y
-                c.draw_point((x, y))
+        left, right = self.get_coordinates(shift_x, shift_y, scale_x, scale_y, skip_pixels, skip_lines,
+                                           mode, sample_budget, serpentine)
+        if len(left):
+            c._store_left_right(left, right)
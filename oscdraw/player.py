@@ -0,0 +1,332 @@
+"""
+Playing pre-rendered frames (wav files or int16 .npy files) without loading them into memory.
+The files are memory-mapped, and fixed-size chunks are copied from them straight into a reusable buffer that is given to the backend,
+so even multi-gigabyte files play with the same memory use. The pages that were already played are given back to the system.
+Usage:
+    player = Player(canvas.audio)
+    player.play(Clip("intro.wav"))
+    player.run(5)
+    player.play(Clip("loop.npy"), loop=True, crossfade=200)
+    player.run()
+Or just canvas.play_file("loop.wav", loop=True).
+"""
+import mmap
+import os
+import struct
+import numpy as np
+from .backends import Backend
+
+
+class Clip:
+    """
+    A memory-mapped file of frames: a 16-bit PCM stereo wav file, or a .npy file of int16 values
+    with the shape (number of frames, 2) or (number of frames * 2,) (left and right values after each other).
+    Nothing is read from the file until the frames are used. Close it (or use it in a with statement) when it's not needed anymore.
+    :param file: The path to the file.
+    :var frames: The frames as a read-only int16 array with the shape (number of frames, 2), backed by the file.
+    :var rate: The sample rate of a wav file. None for .npy files.
+    """
+    def __init__(self, file: str):
+        self.file = file
+        with open(file, "rb") as f:
+            if f.read(4) == b"RIFF":
+                offset, count, self.rate = self._wav_header(f)
+            else:
+                f.seek(0)
+                offset, count = self._npy_header(f)
+                self.rate = None
+            if count == 0:
+                raise ValueError(
+                    f"No frames in {file}"
+                )
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.frames = np.frombuffer(self._mmap, np.int16, count * 2, offset).reshape(-1, 2)
+        self._offset = offset
+        self._released = 0
+
+    @staticmethod
+    def _wav_header(f):
+        """
+        Find the frames in a wav file, for internal use.
+        :param f: The file, after "RIFF".
+        :return: The offset of the frames in bytes, the number of frames, the sample rate.
+        """
+        size = os.fstat(f.fileno()).st_size
+        f.seek(8)
+        if f.read(4) != b"WAVE":
+            raise ValueError(
+                "Not a wav file"
+            )
+        rate = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(
+                    "No data chunk in the wav file"
+                )
+            name, length = struct.unpack("<4sI", header)
+            if name == b"fmt ":
+                audio_format, channels, rate, _, _, bits = struct.unpack("<HHIIHH", f.read(16))
+                if audio_format not in (1, 0xFFFE) or channels != 2 or bits != 16:
+                    raise ValueError(
+                        f"Only 16-bit PCM stereo wav files can be played, not {channels} channels of {bits} bits (format {audio_format})"
+                    )
+                f.seek(length - 16 + length % 2, os.SEEK_CUR)
+            elif name == b"data":
+                if rate is None:
+                    raise ValueError(
+                        "No fmt chunk before the data chunk in the wav file"
+                    )
+                offset = f.tell()
+                return offset, min(length, size - offset) // 4, rate  # The length is wrong in unfinished files
+            else:
+                f.seek(length + length % 2, os.SEEK_CUR)
+
+    @staticmethod
+    def _npy_header(f):
+        """
+        Find the frames in a .npy file, for internal use.
+        :param f: The file, at the start.
+        :return: The offset of the frames in bytes, the number of frames.
+        """
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        pairs = len(shape) == 2 and shape[1] == 2 and not fortran_order
+        interleaved = len(shape) == 1 and shape[0] % 2 == 0
+        if dtype != np.dtype(np.int16) or not (pairs or interleaved):
+            raise ValueError(
+                f"Only int16 arrays with the shape (frames, 2) or (frames * 2,) can be played, not {dtype} with the shape {shape}"
+            )
+        return f.tell(), int(np.prod(shape)) // 2
+
+    def __len__(self):
+        return len(self.frames)
+
+    def _release(self, end: int):
+        """
+        Give the memory of the frames before end back to the system (the pages are read from the file again if needed), for internal use.
+        :param end: The index of the frame.
+        :return: None
+        """
+        if not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        end = (self._offset + end * 4) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > self._released:
+            self._mmap.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+            self._released = end
+
+    def close(self):
+        """
+        Close the file. The frames cannot be used afterwards.
+        :return: None
+        """
+        if self._mmap is not None:
+            self.frames = None
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"Clip({self.file}; {len(self.frames)} frames; {self.rate} Hz)"
+
+
+class _Voice:
+    """
+    A clip being played, for internal use.
+    :param clip: The clip.
+    :param loop: Whether to start again at the end.
+    :param position: The index of the next frame.
+    """
+    def __init__(self, clip: Clip, loop: bool, position: int):
+        self.clip, self.loop, self.position = clip, loop, position
+
+    def read(self, out: np.ndarray):
+        """
+        Copy the next frames into out, starting again at the start of the clip if it loops.
+        :param out: An int16 array with the shape (number of frames, 2).
+        :return: The number of frames copied. Less than len(out) if the clip ended.
+        """
+        frames, filled = self.clip.frames, 0
+        while filled < len(out) and self.position < len(frames):
+            amount = min(len(out) - filled, len(frames) - self.position)
+            out[filled:filled + amount] = frames[self.position:self.position + amount]
+            filled += amount
+            self.position += amount
+            if self.position == len(frames):
+                self.clip._release(self.position)
+                if self.loop:
+                    self.position = self.clip._released = 0
+        self.clip._release(self.position)
+        return filled
+
+
+class Player:
+    """
+    Plays clips into a backend (e.g. canvas.audio) in chunks of a fixed size, with seamless looping, seeking and crossfading between clips.
+    Only one chunk is in memory at once, the frames are copied from the memory-mapped file into a reusable buffer.
+    Call self.write() to write one chunk, or self.run() to write chunks until the clip ends or for a while.
+    :param backend: The backend to write the frames to.
+    :param chunk_frames: The number of frames written at once. Default is 4096.
+    :var clip: The clip being played. None if nothing is played.
+    :var loop: Whether the clip starts again at its end.
+    """
+    def __init__(self, backend: Backend, chunk_frames: int = 4096):
+        if chunk_frames <= 0:
+            raise ValueError(
+                f"The chunk size must be positive, not {chunk_frames}"
+            )
+        self.backend = backend
+        self.chunk_frames = chunk_frames
+        self._buffer = np.zeros((chunk_frames, 2), np.int16)
+        self._fade_buffer = np.zeros((chunk_frames, 2), np.int16)
+        self._voice = None
+        self._fading = None  # The voice faded out, the length of the crossfade and the frames of it done so far
+        self.frames_written = 0
+
+    @property
+    def clip(self):
+        return self._voice.clip if self._voice is not None else None
+
+    @property
+    def loop(self):
+        return self._voice is not None and self._voice.loop
+
+    @loop.setter
+    def loop(self, loop: bool):
+        if self._voice is not None:
+            self._voice.loop = loop
+
+    @property
+    def playing(self):
+        """
+        Whether a clip is being played.
+        """
+        return self._voice is not None
+
+    @property
+    def position(self):
+        """
+        The position in the clip being played in seconds. None if nothing is played.
+        """
+        if self._voice is None:
+            return None
+        return self._voice.position / self._rate(self._voice.clip)
+
+    def _rate(self, clip: Clip):
+        """
+        Get the sample rate of a clip, checking that it's the same as the backend's, for internal use.
+        :param clip: The clip.
+        :return: The sample rate.
+        """
+        rate = self.backend.get_rate()
+        if clip.rate is not None and clip.rate != rate:
+            raise ValueError(
+                f"The sample rate of the clip ({clip.rate}) is not the same as the backend's ({rate})"
+            )
+        return rate
+
+    def play(self, clip: Clip | str, loop: bool = False, start: int | float = 0, crossfade: int | float = 0):
+        """
+        Start playing a clip, instead of the clip being played.
+        :param clip: The clip, or the path to a file (see Clip).
+        :param loop: Whether to start again at the end of the clip. Default is False.
+        :param start: Where to start in the clip in seconds. Default is 0.
+        :param crossfade: The length of the crossfade from the clip being played in milliseconds. Default is 0, no crossfade.
+                          The frames of the two clips are mixed linearly, so the pictures morph into each other.
+                          If the clip being played ends during the crossfade, the rest of it is only the new clip.
+        :return: The Clip.
+        """
+        if not isinstance(clip, Clip):
+            clip = Clip(clip)
+        rate = self._rate(clip)
+        voice = _Voice(clip, loop, min(max(int(start * rate), 0), len(clip)))
+        fade = int(crossfade * rate / 1000)
+        self._fading = (self._voice, fade, 0) if self._voice is not None and fade > 0 else None
+        self._voice = voice
+        return clip
+
+    def seek(self, position: int | float):
+        """
+        Continue playing the clip from another position.
+        :param position: The position in seconds. If the clip loops, it's wrapped around its length.
+        :return: None
+        """
+        if self._voice is None:
+            raise RuntimeError(
+                "Cannot seek, nothing is played."
+            )
+        frame, length = int(position * self._rate(self._voice.clip)), len(self._voice.clip)
+        self._voice.position = frame % length if self._voice.loop else min(max(frame, 0), length)
+        self._voice.clip._released = 0
+
+    def stop(self):
+        """
+        Stop playing. The clips are not closed.
+        :return: None
+        """
+        self._voice = self._fading = None
+
+    def read(self):
+        """
+        Get the next chunk of frames without writing them.
+        :return: The frames as an int16 array with the shape (number of frames, 2), a view of the reusable buffer,
+                 so it's only valid until the next call. Shorter than chunk_frames if the clip ended, empty if nothing is played.
+        """
+        if self._voice is None:
+            return self._buffer[:0]
+        filled = self._voice.read(self._buffer)
+        if self._fading is not None:
+            voice, length, done = self._fading
+            amount = min(filled, length - done)
+            faded = voice.read(self._fade_buffer[:amount])
+            gain = ((np.arange(faded) + done + 1) / (length + 1))[:, None]
+            mixed = self._fade_buffer[:faded] * (1 - gain) + self._buffer[:faded] * gain
+            np.rint(mixed, out=mixed)
+            self._buffer[:faded] = mixed
+            done += amount
+            self._fading = (voice, length, done) if done < length and faded == amount else None
+        if filled < len(self._buffer):
+            self._voice = None
+        return self._buffer[:filled]
+
+    def write(self):
+        """
+        Write the next chunk of frames to the backend.
+        :return: The number of frames written. 0 if nothing is played.
+        """
+        frames = self.read()
+        if len(frames):
+            self.backend.write(frames.reshape(-1))
+            self.frames_written += len(frames)
+        return len(frames)
+
+    def run(self, duration: int | float = None):
+        """
+        Write chunks to the backend until the clip ends (a looping clip never ends) or for a while.
+        :param duration: The time to play for in seconds. Default is None, until the clip ends.
+        :return: None
+        """
+        remaining = None if duration is None else int(duration * self.backend.get_rate())
+        while self._voice is not None and (remaining is None or remaining > 0):
+            if remaining is not None and remaining < self.chunk_frames:
+                buffer = self._buffer
+                self._buffer = buffer[:remaining]
+                try:
+                    written = self.write()
+                finally:
+                    self._buffer = buffer
+            else:
+                written = self.write()
+            if remaining is not None:
+                remaining -= written
+
+    def __repr__(self):
+        return f"Player({self.clip}; loop: {self.loop}; {self.frames_written} frames written)"
@@ -0,0 +1,174 @@
+"""
+Rendering frames in parallel for offline renders (e.g. into a wav file), with worker processes instead of threads,
+so the pure Python parts of drawing are not limited by the GIL.
+Every worker process has its own headless draw.Canvas. The frames come back through shared memory (multiprocessing.shared_memory),
+and they are written to the output in order.
+The render function and the items are sent to the worker processes, so they must be picklable (e.g. a function defined at the top level of a module),
+and the program must be started under if __name__ == "__main__": on the systems where the worker processes are spawned (Windows and macOS).
+"""
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+import os
+import numpy as np
+from .draw import Canvas
+from .backends import Backend, NullBackend
+from .cache import WaveformCache
+
+_worker = {}  # The state of a worker process
+
+
+def _init_worker(name: str, slot_frames: int, rate: int, render: Callable, cache_bytes: int):
+    """
+    Set up a worker process: attach to the shared memory and create its canvas, for internal use.
+    :return: None
+    """
+    memory = shared_memory.SharedMemory(name)
+    _worker["memory"] = memory
+    _worker["slots"] = np.ndarray((len(memory.buf) // (slot_frames * 4), slot_frames * 2), np.int16, memory.buf)
+    _worker["canvas"] = Canvas(backend=NullBackend(rate), storage="array",
+                               cache=WaveformCache(cache_bytes) if cache_bytes else None)
+    _worker["render"] = render
+
+
+def _render_frame(item, slot: int):
+    """
+    Render one frame in a worker process, for internal use.
+    :param item: The item given to the render function.
+    :param slot: The index of the slot of the shared memory to write the frames to.
+    :return: The number of frames, and the frames as bytes if they didn't fit into the slot (None otherwise).
+    """
+    canvas = _worker["canvas"]
+    written = canvas.audio.frames_written
+    try:
+        _worker["render"](canvas, item)
+        if canvas.audio.frames_written != written:
+            raise RuntimeError(
+                "The render function of a RenderPool must not call canvas.write(), the frames are taken from the canvas after it returns"
+            )
+        canvas.flush_transforms()
+        left, right = canvas._storage.left, canvas._storage.right
+        out = _worker["slots"][slot]
+        if len(left) * 2 > len(out):
+            return len(left), canvas._comb_left_right(left, right).tobytes()
+        canvas._comb_left_right(left, right, out)
+        return len(left), None
+    finally:
+        canvas.clear()
+        del canvas._transforms[1:]  # Every item starts with an empty canvas, whichever process rendered the items before it
+        canvas._frame_carry = 0.0
+
+
+class RenderPool:
+    """
+    A pool of worker processes that render frames in parallel, each with its own headless Canvas.
+    The render function is called as render(canvas, item) for every item, and it draws one frame (or any number of frames) on the canvas,
+    like the body of a drawing loop, but without canvas.write(): the frames left on the canvas are written to the output by the pool
+    (calling canvas.write() raises RuntimeError). The items can be frame numbers, or the states of a scene (e.g. the positions of the objects).
+    Every item is drawn on an empty canvas (without the transforms of the item before it), since the items are rendered by different processes.
+    The frames of every item are written to the output in the order of the items.
+    Usage:
+        def draw(canvas, t):
+            canvas.draw_ellipse(Ellipse((t * 10, 0), 5000, 5000), 440, 10)
+
+        if __name__ == "__main__":
+            with RenderPool(draw) as pool, WaveFileBackend("animation.wav") as output:
+                pool.render(range(3600), output)
+    :param render: The function drawing on a canvas, render(canvas, item). It must be picklable.
+    :param rate: The sample rate of the canvases. Default is 192000. It must be the same as the output's.
+    :param processes: The number of worker processes. Default is None, the number of CPUs.
+    :param slot_frames: The maximum number of frames of an item that are sent back through the shared memory.
+                        The frames of a longer item are sent back the slower way (pickled). Default is None, 1 second.
+    :param slots: The number of items rendered or waiting to be written at once. Default is None, 4 per process.
+    :param cache_bytes: The size of the WaveformCache of every worker's canvas in bytes. Default is 64 MiB. 0 for no cache.
+    :var frames_written: The number of frames written to the outputs so far.
+    """
+    def __init__(self, render: Callable, rate: int = 192000, processes: int = None, slot_frames: int = None,
+                 slots: int = None, cache_bytes: int = 64 * 2**20):
+        self.rate = rate
+        self.processes = processes if processes else os.cpu_count() or 1
+        self.slot_frames = slot_frames if slot_frames else rate
+        self.slots = slots if slots else self.processes * 4
+        if self.slot_frames <= 0 or self.slots <= 0:
+            raise ValueError(
+                f"The number of slots and the size of a slot must be positive, not {self.slots} and {self.slot_frames}"
+            )
+        self._memory = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_frames * 4)
+        self._slots = np.ndarray((self.slots, self.slot_frames * 2), np.int16, self._memory.buf)
+        self._executor = ProcessPoolExecutor(self.processes, initializer=_init_worker,
+                                             initargs=(self._memory.name, self.slot_frames, rate, render, cache_bytes))
+        self.frames_written = 0
+
+    def render(self, items: Iterable, output: Backend | Canvas):
+        """
+        Render the frames of every item in the worker processes, and write them to the output in order.
+        Only a limited number of items (self.slots) are rendered ahead, so the items can be a long (or lazy) iterable.
+        :param items: The items given to the render function.
+        :param output: A backend (e.g. backends.WaveFileBackend) or a canvas, the frames are written to its backend.
+        :return: The number of frames written.
+        """
+        if isinstance(output, Canvas):
+            output = output.audio
+        if output.get_rate() != self.rate:
+            raise ValueError(
+                f"The sample rate of the output ({output.get_rate()}) is not the same as the pool's ({self.rate})"
+            )
+        items = iter(items)
+        free = deque(range(self.slots))
+        running, finished = {}, {}
+        submitted = written = frames_written = 0
+        exhausted = False
+        try:
+            while True:
+                while free and not exhausted:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    slot = free.popleft()
+                    running[self._executor.submit(_render_frame, item, slot)] = submitted, slot
+                    submitted += 1
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, slot = running.pop(future)
+                    finished[index] = slot, *future.result()
+                while written in finished:  # Write the finished items in order
+                    slot, length, frames = finished.pop(written)
+                    if frames is None:
+                        output.write(self._slots[slot, :length * 2])
+                    else:
+                        output.write(np.frombuffer(frames, np.int16))
+                    free.append(slot)
+                    frames_written += length
+                    written += 1
+        finally:
+            for future in running:
+                future.cancel()
+            wait(running)
+        self.frames_written += frames_written
+        return frames_written
+
+    def close(self):
+        """
+        Stop the worker processes and free the shared memory.
+        :return: None
+        """
+        if self._memory is not None:
+            self._executor.shutdown()
+            self._slots = None
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f"RenderPool({self.processes} processes; {self.slots} slots of {self.slot_frames} frames)"
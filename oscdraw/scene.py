@@ -0,0 +1,285 @@
+"""
+A retained-mode scene on top of draw.Canvas.
+Instead of drawing everything again in every frame, the objects are added to a Scene once, and only the changed ones are drawn again.
+"""
+from collections.abc import Collection
+from typing import Literal
+import numpy as np
+from .draw import Canvas, _IDENTITY, _shift_matrix, _rotation_matrix, _scale_matrix
+from .objects import Point
+
+
+class SceneNode:
+    """
+    An object in a Scene, with its drawing parameters and its own transform.
+    The node keeps the frames of its object, and only creates them again if the object or the drawing parameters change.
+    If only the transform changes, the kept frames are transformed again (that is one matrix multiplication).
+    Changing the object in place (e.g. node.obj.width = 10) can't be noticed, so call self.invalidate() after that,
+    or give the node the changed object with node.obj = ....
+    Create nodes with Scene.add().
+    :param obj: The object. A Point, PointArray, Line, Polygon, Polyline, Ellipse, ObjectCollection or CompiledObjectCollection.
+    :param frequency: The frequency passed to the object.
+    :param time: The time to draw the object in milliseconds.
+    :param line_mode: The line drawing mode. See Canvas.draw_line() for more. Default is "sawtooth".
+    :var visible: Whether the node is drawn. Default is True.
+    :var version: A number that changes every time the frames of the node change.
+    :var renders: The number of times the frames of the object were created.
+    """
+    def __init__(self, obj, frequency: int | float, time: int | float,
+                 line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        self._obj, self._frequency, self._time, self._line_mode = obj, frequency, time, line_mode
+        self._visible = True
+        self._matrix = _IDENTITY
+        self._samples = None
+        self._transformed = None
+        self.version = 0
+        self.renders = 0
+
+    def _changed(self, geometry: bool):
+        """
+        Drop the kept frames, for internal use.
+        :param geometry: Whether the frames of the object have to be created again, or only transformed again.
+        :return: None
+        """
+        if geometry:
+            self._samples = None
+        self._transformed = None
+        self.version += 1
+
+    def invalidate(self):
+        """
+        Create the frames again the next time the scene is drawn. Call this after changing the object in place.
+        :return: None
+        """
+        self._changed(True)
+
+    @property
+    def obj(self):
+        return self._obj
+
+    @obj.setter
+    def obj(self, obj):
+        self._obj = obj
+        self._changed(True)
+
+    @property
+    def frequency(self):
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, frequency: int | float):
+        if frequency != self._frequency:
+            self._frequency = frequency
+            self._changed(True)
+
+    @property
+    def time(self):
+        return self._time
+
+    @time.setter
+    def time(self, time: int | float):
+        if time != self._time:
+            self._time = time
+            self._changed(True)
+
+    @property
+    def line_mode(self):
+        return self._line_mode
+
+    @line_mode.setter
+    def line_mode(self, line_mode: Literal["square", "sawtooth", "triangle"]):
+        if line_mode != self._line_mode:
+            self._line_mode = line_mode
+            self._changed(True)
+
+    @property
+    def visible(self):
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible: bool):
+        if visible != self._visible:
+            self._visible = visible
+            self.version += 1
+
+    @property
+    def matrix(self):
+        """
+        The 3x3 affine matrix of the node's transform.
+        """
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, matrix: np.ndarray):
+        matrix = np.asarray(matrix, float)
+        if matrix.shape != (3, 3):
+            raise ValueError(
+                f"The transform matrix must have the shape (3, 3), not {matrix.shape}"
+            )
+        self._matrix = matrix
+        self._changed(False)
+
+    def reset_transform(self):
+        """
+        Remove every shift, rotation and scaling of the node.
+        :return: None
+        """
+        if self._matrix is not _IDENTITY:
+            self._matrix = _IDENTITY
+            self._changed(False)
+
+    def shift(self, x: int | float, y: int | float):
+        """
+        Shift the node, after its current transform.
+        :param x: Amount on the X-axis.
+        :param y: Amount on the Y-axis.
+        :return: None
+        """
+        self.matrix = _shift_matrix(x, y) @ self._matrix
+
+    def rotate(self, angle: int | float, centre: Point | Collection[int | float, int | float] = None):
+        """
+        Rotate the node in the same direction as Canvas.change_rotate(), after its current transform.
+        :param angle: The angle to rotate by in degrees.
+        :param centre: The centre of rotation as a Point object or other point representations, see the Point class for more details.
+        :return: None
+        """
+        if centre is None: centre = Point(0, 0)
+        elif not isinstance(centre, Point): centre = Point(centre)
+        self.matrix = _rotation_matrix(angle, centre) @ self._matrix
+
+    def scale(self, x: int | float, y: int | float, centre: Point | Collection[int | float, int | float] = None):
+        """
+        Scale the node, after its current transform.
+        :param x: The amount to scale by on the X-axis.
+        :param y: The amount to scale by on the Y-axis.
+        :param centre: The centre of scaling as a Point object or other point representations, see the Point class for more details.
+        :return: None
+        """
+        if centre is None: centre = Point(0, 0)
+        elif not isinstance(centre, Point): centre = Point(centre)
+        self.matrix = _scale_matrix(x, y, centre) @ self._matrix
+
+    def get_samples(self, canvas: Canvas):
+        """
+        Get the transformed frames of the node. They are only created if something changed since the last call.
+        :param canvas: The canvas creating the frames (its sample rate and cache are used).
+        :return: The frames as a read-only array with the shape (2, number of frames), the rows are the left and right channels.
+        """
+        if self._samples is None:
+            samples = canvas._object_samples(self._obj, self._frequency, self._time, self._line_mode)
+            if samples is None:
+                raise ValueError(
+                    f"Cannot draw {type(self._obj).__name__} in a scene"
+                )
+            self._samples = np.array(samples, float)
+            self._samples.flags.writeable = False
+            self.renders += 1
+        if self._transformed is None:
+            if self._matrix is _IDENTITY:
+                self._transformed = self._samples
+            else:
+                self._transformed = self._matrix[:2, :2] @ self._samples + self._matrix[:2, 2:]
+                self._transformed.flags.writeable = False
+        return self._transformed
+
+    def __repr__(self):
+        return f"SceneNode({self._obj}; {self._frequency} Hz, {self._time} ms, {self._line_mode})"
+
+
+class Scene:
+    """
+    A retained-mode scene: a list of nodes that are drawn in order.
+    The frames of every node are kept, so drawing the scene only creates the frames of the changed nodes,
+    and if nothing changed, the whole frame is reused.
+    Usage:
+        scene = Scene(canvas)
+        ground = scene.add(Line((-27500, -22500, 27500, -22500)), 440, 10)
+        ball = scene.add(Ellipse((0, 0), 5000, 5000), 440, 10)
+        while True:
+            ball.shift(0, -100)
+            scene.draw()
+            canvas.write()
+    :param canvas: The canvas to draw to. The frames are created with its sample rate and cache.
+    :var nodes: The nodes in drawing order. Use self.add(), self.remove() and self.move() to change it.
+    """
+    def __init__(self, canvas: Canvas):
+        self.canvas = canvas
+        self.nodes = []
+        self._frame = None
+        self._frame_versions = None
+
+    def add(self, obj, frequency: int | float = None, time: int | float = None,
+            line_mode: Literal["square", "sawtooth", "triangle"] = "sawtooth"):
+        """
+        Add an object (or a SceneNode) to the end of the scene.
+        :param obj: The object, see SceneNode for the supported objects, or a SceneNode.
+        :param frequency: The frequency passed to the object. Not needed for a SceneNode.
+        :param time: The time to draw the object in milliseconds. Not needed for a SceneNode.
+        :param line_mode: The line drawing mode. See Canvas.draw_line() for more. Default is "sawtooth".
+        :return: The SceneNode.
+        """
+        if isinstance(obj, SceneNode):
+            node = obj
+        elif frequency is None or time is None:
+            raise ValueError(
+                f"The frequency and the time are needed to add {type(obj).__name__} to a scene"
+            )
+        else:
+            node = SceneNode(obj, frequency, time, line_mode)
+        self.nodes.append(node)
+        return node
+
+    def remove(self, node: SceneNode):
+        """
+        Remove a node from the scene.
+        :param node: The node.
+        :return: None
+        """
+        self.nodes.remove(node)
+
+    def move(self, node: SceneNode, index: int):
+        """
+        Move a node to another position in the drawing order.
+        :param node: The node.
+        :param index: The new position.
+        :return: None
+        """
+        self.nodes.remove(node)
+        self.nodes.insert(index, node)
+
+    def clear(self):
+        """
+        Remove every node.
+        :return: None
+        """
+        self.nodes.clear()
+
+    def get_frame(self):
+        """
+        Get the frames of the whole scene. Only the changed nodes are drawn again, the rest are copied from their kept frames.
+        If no node changed since the last call, the same frames are returned.
+        :return: left, right as read-only NumPy arrays.
+        """
+        versions = [(node, node.version) for node in self.nodes if node.visible]
+        if self._frame is None or versions != self._frame_versions:
+            segments = [node.get_samples(self.canvas) for node in self.nodes if node.visible]
+            frame = np.concatenate(segments, axis=1) if segments else np.empty((2, 0))
+            frame.flags.writeable = False
+            self._frame, self._frame_versions = frame, versions
+        return self._frame[0], self._frame[1]
+
+    def draw(self):
+        """
+        Draw the scene to the canvas, as one action. See self.get_frame().
+        :return: None
+        """
+        left, right = self.get_frame()
+        if len(left):
+            self.canvas._store_left_right(left, right)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __repr__(self):
+        return f"Scene({len(self.nodes)} nodes)"
@@ -1,29 +1,198 @@
 """
 Construct objects.ObjectCollection objects from svg files.
-As of now, drawing Bézier curves is not possible.
-Instead, points are drawn one by one to approximate a Bézier curve.
-(Thanks to svg.path having the point() function on CubicBezier and QuadraticBezier objects too.)
+The lines, arcs and quadratic and cubic Bézier curves of the paths are flattened into polylines,
+with just enough points that the flattened curve is never further from the real curve than a tolerance.
+Every curve of the file is flattened at once with NumPy, and the result is kept on the Svg object, so it's only done once.
+Needs the optional dependency svgpathtools (for reading the file).
 """
+import importlib
+import math
+import numpy as np
+from .objects import Polyline, ObjectCollection
+from .diskcache import content_hash
 
-from svgpathtools import svg2paths2
+svgpathtools = None
+
+
+def _get_svgpathtools():
+    """
+    Import svgpathtools when it's first needed.
+    :return: The svgpathtools module.
+    """
+    global svgpathtools
+    if svgpathtools is None:
+        try:
+            svgpathtools = importlib.import_module("svgpathtools")
+        except ImportError:
+            raise ModuleNotFoundError(
+                f"svgpathtools could not be imported"
+            )
+    return svgpathtools
+
+
+def _bezier_points(controls: np.ndarray, tolerance: float):
+    """
+    Flatten Bézier curves of the same degree at once.
+    The number of points of every curve comes from Wang's formula, so the error is at most the tolerance.
+    :param controls: The control points of the curves as complex numbers, with the shape (number of curves, degree + 1).
+    :param tolerance: The maximum distance between the curve and the flattened curve.
+    :return: The points of every curve (without the start point) as complex arrays, in a list.
+    """
+    if not len(controls):
+        return []
+    degree = controls.shape[1] - 1
+    second_differences = np.abs(controls[:, :-2] - 2 * controls[:, 1:-1] + controls[:, 2:]).max(axis=1)
+    counts = np.maximum(np.ceil(np.sqrt(degree * (degree - 1) / 8 * second_differences / tolerance)), 1).astype(int)
+    owner = np.repeat(np.arange(len(controls)), counts)
+    t = (np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts) + 1) / counts[owner]
+    points = np.zeros(len(owner), complex)
+    for k in range(degree + 1):
+        points += math.comb(degree, k) * (1 - t)**(degree - k) * t**k * controls[owner, k]
+    return np.split(points, np.cumsum(counts)[:-1])
+
+
+def _arc_points(arcs: np.ndarray, tolerance: float):
+    """
+    Flatten elliptical arcs at once.
+    The number of points of every arc is chosen so the sagitta of every part (with the larger radius) is at most the tolerance.
+    :param arcs: The arcs with the shape (number of arcs, 5), the columns are the centre, the radii (rx + ry*1j),
+                 the rotation (as a unit complex number), the start angle and the sweep angle (in degrees).
+    :param tolerance: The maximum distance between the arc and the flattened arc.
+    :return: The points of every arc (without the start point) as complex arrays, in a list.
+    """
+    if not len(arcs):
+        return []
+    centre, radius, rotation = arcs[:, 0], arcs[:, 1], arcs[:, 2]
+    theta, delta = np.radians(arcs[:, 3].real), np.radians(arcs[:, 4].real)
+    largest = np.maximum(np.abs(radius.real), np.abs(radius.imag))
+    step = 2 * np.arccos(np.clip(1 - tolerance / np.maximum(largest, 1e-12), -1, 1))
+    counts = np.maximum(np.ceil(np.abs(delta) / np.maximum(step, 1e-12)), 1).astype(int)
+    owner = np.repeat(np.arange(len(arcs)), counts)
+    u = (np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts) + 1) / counts[owner]
+    angles = theta[owner] + delta[owner] * u
+    points = centre[owner] + rotation[owner] * (radius[owner].real * np.cos(angles) + 1j * radius[owner].imag * np.sin(angles))
+    return np.split(points, np.cumsum(counts)[:-1])
+
+
+def flatten_paths(paths, tolerance: float = 0.5):
+    """
+    Flatten svgpathtools paths into polylines. Every continuous part (subpath) of a path becomes one polyline.
+    :param paths: The svgpathtools.Path objects.
+    :param tolerance: The maximum distance between the curves and the flattened curves, in the units of the svg file. Default is 0.5.
+    :return: A list of (points, closed) pairs, the points are complex arrays in the coordinates of the svg file.
+             The last point of a closed subpath is the same as the first.
+    """
+    tools = _get_svgpathtools()
+    segments, quadratics, cubics, arcs = [], [], [], []
+    for path in paths:
+        for segment in path:
+            if isinstance(segment, tools.CubicBezier):
+                segments.append((segment, 2, len(cubics)))
+                cubics.append((segment.start, segment.control1, segment.control2, segment.end))
+            elif isinstance(segment, tools.QuadraticBezier):
+                segments.append((segment, 1, len(quadratics)))
+                quadratics.append((segment.start, segment.control, segment.end))
+            elif isinstance(segment, tools.Arc):
+                segments.append((segment, 3, len(arcs)))
+                arcs.append((segment.center, segment.radius, segment.rot_matrix, segment.theta, segment.delta))
+            else:
+                segments.append((segment, 0, None))
+        segments.append((None, None, None))  # The end of the path
+    flattened = {
+        1: _bezier_points(np.array(quadratics, complex).reshape(-1, 3), tolerance),
+        2: _bezier_points(np.array(cubics, complex).reshape(-1, 4), tolerance),
+        3: _arc_points(np.array(arcs, complex).reshape(-1, 5), tolerance)
+    }
+    polylines, parts, end = [], [], None
+    for segment, kind, index in segments:
+        if segment is None or (end is not None and abs(segment.start - end) > 1e-9):
+            if parts:
+                points = np.concatenate(parts)
+                closed = len(points) > 2 and abs(points[0] - points[-1]) <= 1e-9
+                polylines.append((points, closed))
+            parts, end = [], None
+            if segment is None:
+                continue
+        if not parts:
+            parts.append(np.array([segment.start], complex))
+        parts.append(np.array([segment.end], complex) if kind == 0 else flattened[kind][index])
+        end = segment.end
+    return polylines
 
-from ._disabled_module import disable_module
-disable_module(True)
 
 class Svg:
-    def __init__(self, filepath: str):
-        """
-        Construct objects.ObjectCollection objects from svg files.
-        As of now, drawing Bézier curves is not possible.
-        Instead, points are drawn one by one to approximate a Bézier curve. (Wait a minute... isn't that the same thing?)
-        (Thanks to svg.path having the point() function on CubicBezier and QuadraticBezier objects too.)
-        :param filepath: The path to a file
-        """
+    """
+    Construct objects.ObjectCollection objects from svg files.
+    Every path of the file (and every line, polyline, polygon, rect, circle and ellipse, with the transforms of their groups)
+    is flattened into Polyline objects, which are drawn as continuous paths (a closed subpath ends at its first point, so it's drawn without a jump).
+    The Y-axis is flipped, so the top left corner of the svg file is at 0, 0 and the picture is in the negative Y half, like the characters of font.Font.
+    With a diskcache.DiskCache, the compiled collection is kept on the disk (by the content of the file and the tolerance),
+    so a file that was already loaded once is neither read with svgpathtools nor flattened again.
+    :param filepath: The path to a file
+    :param tolerance: The maximum distance between the curves and the flattened curves, in the units of the svg file. Default is 0.5.
+    :param disk_cache: A diskcache.DiskCache for the compiled collection. Default is None, not used.
+    :var paths: The svgpathtools.Path objects of the file. The file is only read with svgpathtools when they are first needed.
+    :var obj_cache: The ObjectCollection, after it's first created.
+    :var compiled_cache: The CompiledObjectCollection, after it's first created.
+    """
+    def __init__(self, filepath: str, tolerance: float = 0.5, disk_cache=None):
+        if disk_cache is None:
+            _get_svgpathtools()
         self.file = filepath
-        self.paths = svg2paths2(self.file)
+        self.tolerance = tolerance
+        self.disk_cache = disk_cache
+        self._paths = None
         self.obj_cache = None
+        self.compiled_cache = None
+
+    @property
+    def paths(self):
+        if self._paths is None:
+            self._paths = _get_svgpathtools().Document(self.file).paths()
+        return self._paths
+
+    def _disk_key(self):
+        """
+        Get the key of the file in the disk cache, for internal use.
+        :return: The key.
+        """
+        with open(self.file, "rb") as file:
+            return "svg", content_hash(file.read()), self.tolerance
 
     def get_object_collection(self):
+        """
+        Get the ObjectCollection of the file. It's only created at the first call.
+        If the compiled collection was loaded from the disk cache, the polylines are created from it.
+        :return: The ObjectCollection.
+        """
         if self.obj_cache is None:
-            #  for
-            pass
\ No newline at end of file
+            objects = []
+            if self.disk_cache is not None:
+                compiled = self.get_compiled()
+                offsets = compiled.polyline_offsets.tolist()
+                for start, end in zip(offsets[:-1], offsets[1:]):
+                    objects.append(Polyline(np.array(compiled.polyline_points[start:end])))
+            else:
+                for points, _ in flatten_paths(self.paths, self.tolerance):
+                    objects.append(Polyline(np.column_stack((points.real, -points.imag))))
+            self.obj_cache = ObjectCollection(*objects)
+        return self.obj_cache
+
+    def get_compiled(self):
+        """
+        Get the CompiledObjectCollection of the file (see objects.CompiledObjectCollection). It's only created at the first call,
+        or loaded from the disk cache.
+        :return: The CompiledObjectCollection.
+        """
+        if self.compiled_cache is None:
+            if self.disk_cache is not None:
+                key = self._disk_key()
+                self.compiled_cache = self.disk_cache.get_compiled(key)
+                if self.compiled_cache is None:
+                    polylines = [Polyline(np.column_stack((points.real, -points.imag)))
+                                 for points, _ in flatten_paths(self.paths, self.tolerance)]
+                    self.compiled_cache = ObjectCollection(*polylines).compile()
+                    self.disk_cache.put_compiled(key, self.compiled_cache)
+            else:
+                self.compiled_cache = self.get_object_collection().compile()
+        return self.compiled_cache